@@ -1,4 +1,19 @@
 """API package for Company Accounts Dashboard."""
 from .companies_house import CompaniesHouseAPI
+from .jobs import JobManager, get_job_manager
+from .company_numbers import (
+    normalize_company_number,
+    normalize_company_numbers,
+    partition_company_numbers,
+    valid_company_numbers,
+)
 
-__all__ = ['CompaniesHouseAPI']
+__all__ = [
+    'CompaniesHouseAPI',
+    'JobManager',
+    'get_job_manager',
+    'normalize_company_number',
+    'normalize_company_numbers',
+    'partition_company_numbers',
+    'valid_company_numbers',
+]
@@ -3,10 +3,13 @@ Companies House API integration.
 Handles checking company filing statuses via the Companies House API.
 """
 import os
+import threading
 import requests
-from typing import Optional, Dict
+from typing import Callable, Optional, Dict
 from datetime import datetime
 
+from .company_numbers import partition_company_numbers
+
 
 class CompaniesHouseAPI:
     """Interface for Companies House API operations."""
@@ -191,16 +194,23 @@ class CompaniesHouseAPI:
     def bulk_check_filing_status(self, company_numbers: list) -> Dict[str, bool]:
         """Check filing status for multiple companies.
 
+        Numbers are normalized and validated up front; malformed or repeated
+        numbers are not sent to the API.
+
         Args:
             company_numbers: List of company numbers to check
 
         Returns:
             Dictionary mapping company numbers to filing status (True/False/None)
         """
-        results = {}
-        for company_number in company_numbers:
+        valid, invalid = partition_company_numbers(company_numbers)
+        results = {company_number: None for company_number in invalid}
+        for company_number in invalid:
+            print(f"  Skipping invalid company number: {company_number}")
+
+        for company_number, normalized in valid:
             try:
-                filed = self.check_accounts_filed(company_number)
+                filed = self.check_accounts_filed(normalized)
                 results[company_number] = filed
             except Exception as e:
                 print(f"Error checking {company_number}: {e}")
@@ -208,25 +218,43 @@ class CompaniesHouseAPI:
 
         return results
 
-    def bulk_get_filing_deadlines(self, company_numbers: list, verbose: bool = False) -> Dict[str, Optional[str]]:
+    def bulk_get_filing_deadlines(self, company_numbers: list, verbose: bool = False,
+                                  progress_callback: Optional[Callable[[int, int], None]] = None,
+                                  cancel_event: Optional[threading.Event] = None) -> Dict[str, Optional[str]]:
         """Get filing deadlines for multiple companies.
 
+        Numbers are normalized and validated up front; malformed or repeated
+        numbers are not sent to the API.
+
         Args:
             company_numbers: List of company numbers to check
             verbose: If True, print detailed debugging information
+            progress_callback: Called as progress_callback(done, total) after
+                               each valid company is checked
+            cancel_event: When set, stops before the next request; companies
+                          not yet checked are left out of the result
 
         Returns:
             Dictionary mapping company numbers to filing deadlines (YYYY-MM-DD format)
         """
-        results = {}
-        total = len(company_numbers)
-
-        for idx, company_number in enumerate(company_numbers, 1):
+        valid, invalid = partition_company_numbers(company_numbers)
+        results = {company_number: None for company_number in invalid}
+        for company_number in invalid:
+            print(f"  Skipping invalid company number: {company_number}")
+
+        total = len(valid)
+        if progress_callback:
+            progress_callback(0, total)
+
+        for idx, (company_number, normalized) in enumerate(valid, 1):
+            if cancel_event is not None and cancel_event.is_set():
+                print(f"  Cancelled after {idx - 1}/{total} companies")
+                break
             try:
                 if verbose:
                     print(f"[{idx}/{total}] Checking {company_number}...")
 
-                deadline = self.get_filing_deadline(company_number, verbose=verbose)
+                deadline = self.get_filing_deadline(normalized, verbose=verbose)
                 results[company_number] = deadline
 
                 if not verbose and not deadline:
@@ -237,4 +265,7 @@ class CompaniesHouseAPI:
                 print(f"  Error fetching deadline for {company_number}: {e}")
                 results[company_number] = None
 
+            if progress_callback:
+                progress_callback(idx, total)
+
         return results
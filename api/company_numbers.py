@@ -0,0 +1,94 @@
+"""
+Company number normalization and validation.
+Cleans Companies House registration numbers in bulk before they are stored
+or sent to the API.
+"""
+import pandas as pd
+from typing import Iterable, List, Optional, Tuple
+
+# 8 digits (England & Wales), a two-letter prefix and 6 digits (SC, NI, OC, ...)
+# or the older single-letter-and-7-digit Northern Ireland style (R0000123)
+COMPANY_NUMBER_PATTERN = r'(?:\d{8}|[A-Z]{2}\d{6}|[A-Z]\d{7})'
+
+INVALID_NUMBER_REASON = 'Invalid company number format'
+
+
+def normalize_company_numbers(values: pd.Series) -> pd.Series:
+    """Normalize a column of company numbers in one vectorized pass.
+
+    Numeric Excel cells (12345.0), stray whitespace and lower case prefixes are
+    cleaned up, purely numeric numbers are zero-padded to 8 digits and
+    prefixed numbers keep their prefix with the digits padded to 6.
+
+    Args:
+        values: Raw company numbers (any dtype)
+
+    Returns:
+        String Series of normalized numbers (blank values as NA). Numbers
+        that still do not look valid are returned cleaned but unpadded.
+    """
+    numbers = (
+        values.astype('string')
+        .str.upper()
+        .str.replace(r'\s+', '', regex=True)
+        .str.replace(r'^(\d+)\.0*$', r'\1', regex=True)
+    )
+
+    numeric = numbers.str.fullmatch(r'\d{1,7}').fillna(False)
+    numbers = numbers.mask(numeric, numbers.str.zfill(8))
+
+    parts = numbers.str.extract(r'^([A-Z]{2})(\d{1,5})$')
+    prefixed = parts[0].notna()
+    numbers = numbers.mask(prefixed, parts[0] + parts[1].str.zfill(6))
+
+    return numbers.replace('', pd.NA)
+
+
+def valid_company_numbers(numbers: pd.Series) -> pd.Series:
+    """Check normalized company numbers against the Companies House format.
+
+    Args:
+        numbers: Output of normalize_company_numbers
+
+    Returns:
+        Boolean Series, False for missing or malformed numbers
+    """
+    return numbers.str.fullmatch(COMPANY_NUMBER_PATTERN).fillna(False).astype(bool)
+
+
+def normalize_company_number(value) -> Optional[str]:
+    """Normalize a single company number.
+
+    Args:
+        value: Raw company number
+
+    Returns:
+        Normalized number, or None if it is not a valid company number
+    """
+    numbers = normalize_company_numbers(pd.Series([value], dtype=object))
+    if not valid_company_numbers(numbers).iloc[0]:
+        return None
+    return str(numbers.iloc[0])
+
+
+def partition_company_numbers(company_numbers: Iterable) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """Split company numbers into API-ready and invalid ones.
+
+    Duplicates (after normalization) are dropped so each company is requested
+    once.
+
+    Args:
+        company_numbers: Company numbers as stored or supplied by the caller
+
+    Returns:
+        Tuple of (list of (original, normalized) pairs for valid numbers,
+        list of original values that failed validation)
+    """
+    originals = pd.Series(list(company_numbers), dtype=object)
+    normalized = normalize_company_numbers(originals)
+    valid = valid_company_numbers(normalized)
+
+    unique = valid & ~normalized.duplicated()
+    pairs = list(zip(originals[unique], normalized[unique]))
+    invalid = list(originals[~valid])
+    return pairs, invalid
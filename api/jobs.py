@@ -0,0 +1,185 @@
+"""
+Background jobs for Company Accounts Dashboard.
+Long Companies House sweeps run on a small thread pool shared by every
+Streamlit session in the process, so the session that starts one stays
+interactive. Identical jobs are de-duplicated by key: a second click (from
+any session) while one is running attaches to the running job instead of
+starting another. Sessions poll a job for progress and may cancel it.
+"""
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# Job states; the last three are final
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINAL_STATES = (DONE, FAILED, CANCELLED)
+
+_job_ids = itertools.count(1)
+
+
+class Job:
+    """One unit of background work and its progress."""
+
+    def __init__(self, key: str, description: str):
+        self.id = next(_job_ids)
+        self.key = key
+        self.description = description
+        self.status = QUEUED
+        self.done = 0
+        self.total = 0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def report_progress(self, done: int, total: int):
+        """Progress callback handed to the job function."""
+        with self._lock:
+            self.done, self.total = done, total
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a consistent copy of the job's state.
+
+        Returns:
+            Dictionary with id, key, description, status, done, total,
+            result, error, submitted_at and finished_at
+        """
+        with self._lock:
+            return {
+                'id': self.id,
+                'key': self.key,
+                'description': self.description,
+                'status': self.status,
+                'done': self.done,
+                'total': self.total,
+                'result': self.result,
+                'error': self.error,
+                'submitted_at': self.submitted_at,
+                'finished_at': self.finished_at
+            }
+
+    def _set_state(self, status: str, result: Any = None, error: Optional[str] = None):
+        with self._lock:
+            self.status = status
+            self.result = result
+            self.error = error
+            if status in FINAL_STATES:
+                self.finished_at = time.time()
+
+
+class JobManager:
+    """Thread pool running de-duplicated, cancellable background jobs."""
+
+    def __init__(self, max_workers: int = 2, keep_finished: int = 50):
+        """Initialize the manager.
+
+        Args:
+            max_workers: Jobs run at the same time; others wait in the queue
+            keep_finished: Finished jobs remembered for sessions still polling them
+        """
+        self.keep_finished = keep_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: Dict[int, Job] = {}
+        self._active: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, description: str,
+               func: Callable[[Callable[[int, int], None], threading.Event], Any]) -> Job:
+        """Start a job, or return the unfinished job already running under key.
+
+        Args:
+            key: Identifies identical work, e.g. the operation and its inputs
+            description: Shown to users following the job
+            func: Called as func(progress_callback, cancel_event) on a worker
+                  thread; should call progress_callback(done, total) as it
+                  goes and stop early once cancel_event is set
+
+        Returns:
+            The new or already running Job
+        """
+        with self._lock:
+            existing = self._active.get(key)
+            if existing is not None:
+                return existing
+            job = Job(key, description)
+            self._jobs[job.id] = job
+            self._active[key] = job
+            self._prune()
+
+        self._executor.submit(self._run, job, func)
+        return job
+
+    def _run(self, job: Job, func):
+        try:
+            if job.cancel_event.is_set():
+                job._set_state(CANCELLED)
+                return
+            job._set_state(RUNNING)
+            result = func(job.report_progress, job.cancel_event)
+            job._set_state(CANCELLED if job.cancel_event.is_set() else DONE, result=result)
+        except Exception as e:
+            print(f"[ERROR] Job {job.id} ({job.description}) failed: {e}")
+            job._set_state(FAILED, error=f"{type(e).__name__}: {e}")
+        finally:
+            with self._lock:
+                if self._active.get(job.key) is job:
+                    del self._active[job.key]
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond keep_finished (caller holds the lock)."""
+        finished = [job for job in self._jobs.values() if job.status in FINAL_STATES]
+        for job in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id: int) -> Optional[Job]:
+        """Get a job by id, or None if unknown or forgotten."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: int) -> bool:
+        """Ask a job to stop; it finishes as 'cancelled' once it notices.
+
+        Returns:
+            True if the job was still unfinished
+        """
+        job = self.get(job_id)
+        if job is None or job.status in FINAL_STATES:
+            return False
+        job.cancel_event.set()
+        return True
+
+    def list_jobs(self, active_only: bool = False) -> List[Dict[str, Any]]:
+        """Get snapshots of known jobs, oldest first."""
+        with self._lock:
+            jobs = list(self._active.values() if active_only else self._jobs.values())
+        return [job.snapshot() for job in sorted(jobs, key=lambda job: job.id)]
+
+    def shutdown(self, cancel: bool = True):
+        """Stop accepting jobs, optionally cancelling the unfinished ones."""
+        if cancel:
+            with self._lock:
+                for job in self._active.values():
+                    job.cancel_event.set()
+        self._executor.shutdown(wait=False)
+
+
+# One manager per process, shared by every session
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Get the process-wide JobManager, creating it on first use."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+        return _manager
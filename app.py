@@ -4,7 +4,7 @@ A Streamlit-based web application for managing company accounts filing statuses.
 """
 import streamlit as st
 from pathlib import Path
-from database import DatabaseManager
+from database import get_database, get_shard_router
 import os
 from dotenv import load_dotenv
 from auth import check_password
@@ -112,7 +112,7 @@ st.markdown("""
 @st.cache_resource
 def get_db():
     """Get database manager instance and initialize if needed."""
-    db = DatabaseManager()
+    db = get_database()
     return db
 
 db = get_db()
@@ -173,11 +173,13 @@ if stats['total_companies'] == 0:
             try:
                 if use_api_import:
                     with st.spinner("Importing data and fetching deadlines from API..."):
-                        count = db.import_from_excel(str(excel_file), use_api_for_deadlines=True)
+                        report = db.import_from_excel(str(excel_file), use_api_for_deadlines=True)
                 else:
                     with st.spinner("Importing data..."):
-                        count = db.import_from_excel(str(excel_file), use_api_for_deadlines=False)
-                st.success(f"✅ Successfully imported {count} companies!")
+                        report = db.import_from_excel(str(excel_file), use_api_for_deadlines=False)
+                st.success(f"✅ Successfully imported {report['inserted']} companies!")
+                if report['invalid']:
+                    st.warning(f"⚠️ {report['invalid']} rows were invalid and skipped")
                 st.balloons()
                 st.rerun()
             except Exception as e:
@@ -244,6 +246,12 @@ else:
     with col_stat3:
         st.metric("Accounts Not Filed", stats['unfiled_count'])
 
+    # Per-practice totals when running one shard per practice
+    if os.getenv("PRACTICE_ID"):
+        with st.expander("🏛️ All Practices"):
+            router = get_shard_router(os.getenv("SHARD_DIR", "practices"))
+            st.dataframe(router.get_practice_summary(), hide_index=True, width='stretch')
+
     # Navigation guide
     st.markdown("---")
     st.markdown("## 🧭 Navigation")
@@ -318,6 +326,12 @@ with st.expander("📂 Database Information"):
     st.write(f"**Database Path:** {Path('client_data.db').absolute()}")
     st.write(f"**Total Companies:** {stats['total_companies']}")
     st.write(f"**Database Size:** {Path('client_data.db').stat().st_size / 1024:.2f} KB" if Path('client_data.db').exists() else "N/A")
+    cache_stats = db.get_cache_stats()
+    st.write(f"**Query Cache:** {cache_stats['entries']} entries, {cache_stats['hit_rate']:.0%} hit rate")
+    replica_stats = db.get_replica_stats()
+    if replica_stats:
+        st.write(f"**Read Replica:** refreshed {replica_stats['age_seconds']:.0f}s ago "
+                 f"({replica_stats['refreshes']} refreshes, max lag {replica_stats['refresh_interval']:.0f}s)")
 
 with st.expander("🔑 API Configuration"):
     api_key = os.getenv("COMPANIES_HOUSE_API_KEY")
@@ -0,0 +1,78 @@
+"""
+Benchmark the memory and filter speed of the companies DataFrame.
+Compares the string frame from get_all_companies() with the typed frame
+from get_all_companies(typed=True) on a generated database.
+
+Usage:
+    python benchmark_frame_memory.py [rows]
+"""
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from database import DatabaseManager, STATUSES
+
+
+def populate(db: DatabaseManager, rows: int) -> None:
+    """Import generated companies and spread them across every status."""
+    base = date(2025, 1, 1)
+    db.import_dataframe(pd.DataFrame({
+        'Company_Name': [f"Benchmark Company {i} Ltd" for i in range(rows)],
+        'Company_Number': [f"{i:08d}" for i in range(1, rows + 1)],
+        'Filing_Deadline': [(base + timedelta(days=i % 700)).isoformat() for i in range(rows)],
+    }))
+    numbers = db.get_company_numbers()
+    for idx, status in enumerate(STATUSES[1:], start=1):
+        db.update_statuses_bulk({number: status for number in numbers[idx::len(STATUSES)]})
+
+
+def time_filters(df: pd.DataFrame, cutoff, repeats: int = 20) -> float:
+    """Average milliseconds for the dashboard's deadline and status filters."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        (df['Filing_Deadline'] <= cutoff).sum()
+        df['Internal_Status'].value_counts()
+        df[df['Accounts_Filed_CH'] == 0].shape[0]
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / 'bench.db'))
+        print(f"[INFO] Generating {rows:,} rows...")
+        populate(db, rows)
+
+        start = time.perf_counter()
+        strings = db.get_all_companies()
+        strings_load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        typed = db.get_all_companies(typed=True)
+        typed_load = time.perf_counter() - start
+
+        frames = [
+            ('object dtype', strings.astype(object), '2026-07-31', None),
+            ('strings', strings, '2026-07-31', strings_load),
+            ('typed', typed, pd.Timestamp('2026-07-31'), typed_load),
+        ]
+
+        print(f"\n{'Frame':<16}{'Memory (MB)':>14}{'Load (s)':>10}{'Filters (ms)':>14}")
+        print("-" * 54)
+        for name, df, cutoff, load in frames:
+            memory_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+            load_text = f"{load:>10.2f}" if load is not None else f"{'-':>10}"
+            print(f"{name:<16}{memory_mb:>14.1f}{load_text}{time_filters(df, cutoff):>14.2f}")
+
+        print("\nTyped columns:")
+        for column, dtype in typed.dtypes.items():
+            print(f"  {column:<20}{dtype}")
+
+
+if __name__ == "__main__":
+    main()
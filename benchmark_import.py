@@ -0,0 +1,123 @@
+"""
+Benchmark the import engines on a generated client file.
+Compares full-load Excel import against the streaming Excel, CSV and
+Parquet importers for speed and peak memory.
+
+Usage:
+    python benchmark_import.py [rows]
+"""
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from database import DatabaseManager
+from database.importer import calamine_available
+
+
+def generate_files(directory: Path, rows: int) -> dict:
+    """Write the same generated client list as xlsx, csv and (if possible) parquet."""
+    from openpyxl import Workbook
+    import pandas as pd
+
+    base = date(2025, 1, 1)
+    numbers = [f"{i:08d}" for i in range(1, rows + 1)]
+    names = [f"Benchmark Company {i} Ltd" for i in range(1, rows + 1)]
+    deadlines = [(base + timedelta(days=i % 700)).isoformat() for i in range(rows)]
+
+    files = {}
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(['Company_Name', 'Company_Number', 'Filing_Deadline'])
+    for row in zip(names, numbers, deadlines):
+        sheet.append(row)
+    files['xlsx'] = directory / 'clients.xlsx'
+    workbook.save(files['xlsx'])
+
+    df = pd.DataFrame({'Company_Name': names, 'Company_Number': numbers, 'Filing_Deadline': deadlines})
+    files['csv'] = directory / 'clients.csv'
+    df.to_csv(files['csv'], index=False)
+
+    try:
+        df.to_parquet(directory / 'clients.parquet', index=False, row_group_size=20000)
+        files['parquet'] = directory / 'clients.parquet'
+    except ImportError:
+        pass
+
+    return files
+
+
+def peak_memory_mb() -> float:
+    """Peak resident memory of this process in MB."""
+    # VmHWM is reset on exec, unlike ru_maxrss which is inherited from the parent
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_engine(engine: str, source: str, db_path: str, queue) -> None:
+    """Import one file into a fresh database and report time and peak memory."""
+    db = DatabaseManager(db_path)
+    start = time.perf_counter()
+
+    if engine == 'pandas.read_excel':
+        report = db.import_from_excel(source)
+    elif engine == 'csv':
+        report = db.import_from_csv(source)
+    elif engine == 'parquet':
+        report = db.import_from_parquet(source)
+    else:
+        report = db.import_from_excel_streaming(source, engine=engine)
+
+    elapsed = time.perf_counter() - start
+    peak_mb = peak_memory_mb()
+    queue.put((elapsed, peak_mb, report['inserted']))
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        print(f"[INFO] Generating {rows:,} rows...")
+        files = generate_files(directory, rows)
+
+        engines = [('pandas.read_excel', files['xlsx']), ('openpyxl', files['xlsx'])]
+        if calamine_available():
+            engines.append(('calamine', files['xlsx']))
+        else:
+            print("[INFO] python-calamine not installed - skipping calamine engine")
+        engines.append(('csv', files['csv']))
+        if 'parquet' in files:
+            engines.append(('parquet', files['parquet']))
+        else:
+            print("[INFO] pyarrow not installed - skipping parquet engine")
+
+        print(f"\n{'Engine':<20}{'Seconds':>10}{'Peak RSS (MB)':>16}{'Inserted':>12}")
+        print("-" * 58)
+
+        # Each engine runs in its own process so peak memory is measured in isolation
+        ctx = multiprocessing.get_context('spawn')
+        for idx, (engine, source) in enumerate(engines):
+            queue = ctx.Queue()
+            process = ctx.Process(
+                target=run_engine,
+                args=(engine, str(source), str(directory / f'bench_{idx}.db'), queue)
+            )
+            process.start()
+            elapsed, peak_mb, inserted = queue.get()
+            process.join()
+            print(f"{engine:<20}{elapsed:>10.2f}{peak_mb:>16.1f}{inserted:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark the HTML payload of the Client Management card list.
+Compares the old markup, which sent a <style> block with two :has()
+rules for every company row, with the shared status stylesheet and
+per-row status classes. Sizes are those of the serialized Streamlit
+Markdown elements the rows send to the browser; the status selectbox
+and column layout are the same in both and are left out.
+
+Usage:
+    python benchmark_page_payload.py [rows ...]
+"""
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pandas as pd
+from streamlit.proto.Markdown_pb2 import Markdown
+
+from database import DatabaseManager, STATUSES
+from presentation import (
+    STATUS_STYLES,
+    build_presentation_frame,
+    build_status_stylesheet,
+    capture_today,
+)
+
+
+def populate(db: DatabaseManager, rows: int) -> None:
+    """Import generated companies and spread them across every status."""
+    base = date(2025, 1, 1)
+    db.import_dataframe(pd.DataFrame({
+        'Company_Name': [f"Benchmark Company {i} Ltd" for i in range(rows)],
+        'Company_Number': [f"{i:08d}" for i in range(1, rows + 1)],
+        'Filing_Deadline': [(base + timedelta(days=i % 700)).isoformat() for i in range(rows)],
+    }))
+    numbers = db.get_company_numbers()
+    for idx, status in enumerate(STATUSES[1:], start=1):
+        db.update_statuses_bulk({number: status for number in numbers[idx::len(STATUSES)]})
+
+
+def element_size(body: str) -> int:
+    """Bytes of one HTML markdown element on the wire."""
+    return Markdown(body=body, allow_html=True).ByteSize()
+
+
+def deadline_markup(row) -> list:
+    """Deadline and days-left elements, identical in both versions."""
+    if row.Is_Overdue:
+        deadline = f"<span class='overdue-text'>🔴 {row.Deadline_Display}</span>"
+    else:
+        deadline = f"<span style='color: #262730;'>{row.Deadline_Display}</span>"
+    return [deadline, f"<span style='font-size: 12px; color: #666;'>{row.Days_Left_Display}</span>"]
+
+
+def legacy_row_markup(row) -> list:
+    """Elements for one row with its own <style> block keyed by company number."""
+    background, border = STATUS_STYLES.get(row.Internal_Status, STATUS_STYLES['Not Started'])
+    style = f"""
+                <style>
+                div[data-testid="column"]:has(span.company-id-{row.Company_Number}) {{
+                    background-color: {background} !important;
+                }}
+                div[data-testid="stHorizontalBlock"]:has(span.company-id-{row.Company_Number}) {{
+                    background-color: {background} !important;
+                    border-left: 4px solid {border} !important;
+                    padding: 8px !important;
+                    margin: 4px 0 !important;
+                    border-radius: 6px !important;
+                }}
+                </style>
+            """
+    label = (f'<span class="company-id-{row.Company_Number} company-name-text">{row.Company_Name}</span>'
+             f'<span class="company-number-text">#{row.Company_Number}</span>')
+    return [style, label, *deadline_markup(row)]
+
+
+def status_class_row_markup(row) -> list:
+    """Elements for one row tagged only with its status class."""
+    label = (f'<span class="{row.Status_Class} company-name-text">{row.Company_Name}</span>'
+             f'<span class="company-number-text">#{row.Company_Number}</span>')
+    return [label, *deadline_markup(row)]
+
+
+def measure(frame: pd.DataFrame, row_markup, shared: str = "") -> dict:
+    """Total elements, bytes and :has() selectors for one version of the list."""
+    bodies = [shared] if shared else []
+    for row in frame.itertuples(index=False):
+        bodies.extend(row_markup(row))
+    return {
+        'elements': len(bodies),
+        'bytes': sum(element_size(body) for body in bodies),
+        'selectors': sum(body.count(':has(') for body in bodies),
+    }
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / 'bench.db'))
+        print(f"[INFO] Generating {max(sizes):,} rows...")
+        populate(db, max(sizes))
+        today = capture_today()
+
+        print(f"\n{'Rows':>8}  {'Markup':<14}{'Elements':>10}{'Payload (KB)':>14}{':has() rules':>14}")
+        print("-" * 62)
+        for rows in sizes:
+            start = time.perf_counter()
+            frame = build_presentation_frame(db.get_companies_page(0, rows)['rows'], today)
+            build_ms = (time.perf_counter() - start) * 1000
+
+            legacy = measure(frame, legacy_row_markup)
+            shared = measure(frame, status_class_row_markup, build_status_stylesheet())
+            for name, result in (('per-row style', legacy), ('status classes', shared)):
+                print(f"{rows:>8,}  {name:<14}{result['elements']:>10,}"
+                      f"{result['bytes'] / 1024:>14.1f}{result['selectors']:>14,}")
+            print(f"{'':>8}  payload {shared['bytes'] / legacy['bytes']:.0%} of before, "
+                  f"page read and presented in {build_ms:.1f} ms\n")
+
+
+if __name__ == "__main__":
+    main()
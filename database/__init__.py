@@ -1,4 +1,10 @@
 """Database package for Company Accounts Dashboard."""
 from .db_manager import DatabaseManager
+from .export import EXPORT_FORMATS, ExportCache, available_export_formats, write_export
+from .records import Company
+from .schema import STATUSES
+from .sharding import ShardRouter, get_database, get_shard_router
+from .sync import SyncCoordinator, sync_filing_deadlines
+from .watcher import ImportWatcher, start_import_watcher
 
-__all__ = ['DatabaseManager']
+__all__ = ['DatabaseManager', 'EXPORT_FORMATS', 'ExportCache', 'available_export_formats', 'write_export', 'Company', 'STATUSES', 'ShardRouter', 'get_database', 'get_shard_router', 'SyncCoordinator', 'sync_filing_deadlines', 'ImportWatcher', 'start_import_watcher']
@@ -0,0 +1,91 @@
+"""
+Query result cache for Company Accounts Dashboard.
+Shares read results across Streamlit sessions until the database changes.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+class QueryCache:
+    """Size-bounded LRU cache of query results keyed on a database version.
+
+    Every entry belongs to the version it was loaded at. As soon as a
+    different version is seen the whole cache is dropped, so results are
+    never served across a write.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of results kept; least recently used
+                         entries are evicted first
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key: Hashable, version: Any, loader: Callable[[], Any]) -> Any:
+        """Return the cached result for key, loading it on a miss.
+
+        Args:
+            key: Query name plus parameters
+            version: Current database version
+            loader: Called with no arguments to run the query on a miss
+
+        Returns:
+            The cached or freshly loaded result
+        """
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self._version = version
+            elif key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Run the query outside the lock so slow loads don't serialize readers
+        value = loader()
+
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self):
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, entries, evictions and invalidations
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
@@ -2,24 +2,81 @@
 Database Manager for Company Accounts Dashboard.
 Handles all SQLite database operations.
 """
+import json
 import sqlite3
+import threading
+import time
 import pandas as pd
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Any, Iterable, Iterator, Tuple
+
+from api.company_numbers import INVALID_NUMBER_REASON, partition_company_numbers
+
+from .cache import QueryCache
+from .schema import (
+    COMPANY_SELECT,
+    COMPANY_SORT_COLUMNS,
+    STATUSES,
+    STATUS_CODES,
+    STORED_COMPANY_SELECT,
+    deadline_to_day,
+    deadlines_to_days,
+    decode_companies_frame,
+    status_code,
+)
+from .migrations import get_schema_version, run_migrations
+from .replica import ReadReplica
+from .search import LIKE_ESCAPE, CompanySearch, like_pattern
+from .snapshot import CompanySnapshot, snapshot_available
+from .records import COMPANY_FIELDS, Company, company_row_factory, records_to_columns
+from .importer import (
+    IMPORT_BATCH_SIZE,
+    expand_import_sources,
+    file_content_hash,
+    iter_csv_chunks,
+    iter_excel_chunks,
+    iter_file_chunks,
+    iter_parquet_chunks,
+    normalize_columns,
+    normalize_import_frame,
+    parse_import_source,
+    validate_import_frame,
+)
+
+# Change-log entries kept by prune_changes, which bulk writes call afterwards
+CHANGE_LOG_RETENTION = 100000
+
+# Searches with more matches than this filter the paginated list with LIKE
+SEARCH_IN_LIST_LIMIT = 2000
 
 
 class DatabaseManager:
     """Manages all database operations for the company accounts system."""
 
-    def __init__(self, db_path: str = "client_data.db"):
+    def __init__(self, db_path: str = "client_data.db", cache_size: int = 128,
+                 read_replica: bool = False, replica_refresh_interval: float = 5.0):
         """Initialize the database manager.
 
         Args:
             db_path: Path to the SQLite database file
+            cache_size: Maximum number of query results kept in the read cache
+            read_replica: If True, serve read-only queries from an in-memory
+                          copy of the database (see ReadReplica)
+            replica_refresh_interval: Maximum seconds the replica may lag
+                                      behind writes from other processes
         """
         self.db_path = db_path
+        self._cache = QueryCache(max_entries=cache_size)
+        self._search = CompanySearch()
+        self._version_conn = None
+        self._version_lock = threading.Lock()
+        self._snapshot = CompanySnapshot(self) if snapshot_available() else None
         self.initialize_database()
+        self._replica = ReadReplica(db_path, replica_refresh_interval) if read_replica else None
 
     def get_connection(self) -> sqlite3.Connection:
         """Get a database connection.
@@ -31,27 +88,132 @@ class DatabaseManager:
         conn.row_factory = sqlite3.Row  # Enable column access by name
         return conn
 
-    def initialize_database(self):
-        """Create the database schema if it doesn't exist."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def get_data_version(self) -> int:
+        """Get a number that changes whenever any connection commits a write.
 
-        # Create companies table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS companies (
-                Company_Number TEXT PRIMARY KEY,
-                Company_Name TEXT NOT NULL,
-                Filing_Deadline DATE NOT NULL,
-                Internal_Status TEXT DEFAULT 'Not Started',
-                Accounts_Filed_CH BOOLEAN DEFAULT 0,
-                Last_Updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        Reads PRAGMA data_version on a long-lived connection that never
+        writes, so writes from this process and from other processes are
+        both seen. This costs no table access and is cheap enough to check
+        on every render.
 
-        conn.commit()
+        Returns:
+            Current data version
+        """
+        with self._version_lock:
+            if self._version_conn is None:
+                self._version_conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            return self._version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get read cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, entries, evictions and invalidations
+        """
+        return self._cache.stats()
+
+    def get_search_stats(self) -> Dict[str, Any]:
+        """Get search cache statistics.
+
+        Returns:
+            Dictionary with hits, narrowed (answered from a shorter term's
+            result), misses and the number of cached terms
+        """
+        return self._search.stats()
+
+    def _cached(self, key: tuple, loader):
+        """Serve a query result from the read cache, loading it on a miss.
+
+        Args:
+            key: Query name plus parameters
+            loader: Function running the query
+
+        Returns:
+            Cached or freshly loaded result
+        """
+        return self._cache.get_or_load(key, self._read_version(), loader)
+
+    def get_read_version(self) -> int:
+        """Get the data version that reads currently reflect.
+
+        Suitable as a validator for results handed to clients (e.g. an HTTP
+        ETag): it only changes when the data read back may have changed.
+
+        Returns:
+            Current read version
+        """
+        return self._read_version()
+
+    def _read_version(self) -> int:
+        """Data version that read-only queries currently see.
+
+        With a read replica this is the version the replica was copied at,
+        so cached results are never keyed on newer data than they contain.
+        """
+        data_version = self.get_data_version()
+        if self._replica is not None:
+            return self._replica.sync(data_version)
+        return data_version
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Connection for read-only queries.
+
+        Yields the in-memory replica (refreshed first if it is due) when
+        read replicas are enabled, otherwise a connection to the database
+        file. The connection is closed on exit.
+        """
+        if self._replica is None:
+            conn = self.get_connection()
+            try:
+                yield conn
+            finally:
+                conn.close()
+        else:
+            self._replica.sync(self.get_data_version())
+            with self._replica.connection() as conn:
+                yield conn
+
+    def _after_write(self):
+        """Called after every write through this manager.
+
+        Marks the read replica dirty so the next read sees the write
+        without waiting for the refresh interval.
+        """
+        if self._replica is not None:
+            self._replica.mark_dirty()
+
+    def get_replica_stats(self) -> Optional[Dict[str, Any]]:
+        """Get read replica statistics.
+
+        Returns:
+            Dictionary with refreshes, seconds since the last refresh and the
+            refresh interval, or None if read replicas are disabled
+        """
+        if self._replica is None:
+            return None
+        return {
+            'refreshes': self._replica.refreshes,
+            'age_seconds': time.monotonic() - self._replica.refreshed_at,
+            'refresh_interval': self._replica.refresh_interval
+        }
+
+    def initialize_database(self):
+        """Bring the database schema up to date by applying pending migrations."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            run_migrations(conn)
+        finally:
+            conn.close()
+
+    def get_schema_version(self) -> int:
+        """Get the last schema migration applied to the database."""
+        conn = self.get_connection()
+        version = get_schema_version(conn)
         conn.close()
+        return version
 
-    def import_from_excel(self, excel_path: str, use_api_for_deadlines: bool = False) -> int:
+    def import_from_excel(self, excel_path: str, use_api_for_deadlines: bool = False) -> Dict[str, Any]:
         """Import company data from Excel file.
 
         Args:
@@ -59,103 +221,700 @@ class DatabaseManager:
             use_api_for_deadlines: If True, fetch filing deadlines from Companies House API
 
         Returns:
-            Number of companies imported
+            Import report (see import_dataframe)
         """
         # Read Excel file
-        df = pd.read_excel(excel_path)
+        df = normalize_columns(pd.read_excel(excel_path))
+        return self.import_dataframe(df, use_api_for_deadlines=use_api_for_deadlines)
+
+    def import_dataframe(self, df: pd.DataFrame, use_api_for_deadlines: bool = False) -> Dict[str, Any]:
+        """Import company data from a DataFrame in a single transaction.
+
+        Columns and deadlines are normalized for the whole frame at once,
+        invalid rows are collected rather than raised, and the remaining rows
+        are written with one executemany call.
 
+        Args:
+            df: DataFrame with Company_Name, Company_Number and Filing_Deadline columns
+            use_api_for_deadlines: If True, fetch filing deadlines from Companies House API
+
+        Returns:
+            Dictionary with 'total', 'inserted', 'skipped' (already in the
+            database or repeated in the file), 'invalid' counts and
+            'invalid_rows' (list of {'row', 'Company_Number', 'Company_Name', 'reason'}).
+            Rows with malformed company numbers are also quarantined.
+        """
+        return self._import_chunks([df], use_api_for_deadlines=use_api_for_deadlines)
+
+    def import_from_csv(self, csv_path: str, chunk_size: int = IMPORT_BATCH_SIZE) -> Dict[str, Any]:
+        """Import company data from a CSV file in fixed-size batches.
+
+        Args:
+            csv_path: Path to the CSV file
+            chunk_size: Rows read and written per batch
+
+        Returns:
+            Import report (see import_dataframe)
+        """
+        return self._import_chunks(iter_csv_chunks(csv_path, chunk_size))
+
+    def import_from_parquet(self, parquet_path: str, chunk_size: int = IMPORT_BATCH_SIZE) -> Dict[str, Any]:
+        """Import company data from a Parquet file, one row group at a time.
+
+        Args:
+            parquet_path: Path to the Parquet file
+            chunk_size: Maximum rows written per batch
+
+        Returns:
+            Import report (see import_dataframe)
+        """
+        return self._import_chunks(iter_parquet_chunks(parquet_path, chunk_size))
+
+    def import_from_excel_streaming(self, excel_path: str, chunk_size: int = IMPORT_BATCH_SIZE,
+                                    engine: str = 'auto') -> Dict[str, Any]:
+        """Import a large Excel workbook without loading it into memory.
+
+        Args:
+            excel_path: Path to the .xlsx file
+            chunk_size: Rows read and written per batch
+            engine: 'auto', 'calamine' or 'openpyxl' (see iter_excel_chunks)
+
+        Returns:
+            Import report (see import_dataframe)
+        """
+        return self._import_chunks(iter_excel_chunks(excel_path, chunk_size, engine=engine))
+
+    def import_from_file(self, file_path: str, chunk_size: int = IMPORT_BATCH_SIZE) -> Dict[str, Any]:
+        """Import a CSV, Parquet or Excel file using the streaming importers.
+
+        Args:
+            file_path: Path to a .csv, .parquet or .xlsx file
+            chunk_size: Rows read and written per batch
+
+        Returns:
+            Import report (see import_dataframe)
+        """
+        return self._import_chunks(iter_file_chunks(file_path, chunk_size))
+
+    def import_many(self, sources: List, max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """Import several files and/or sheets, parsing them in parallel.
+
+        Each sheet or file is read and validated in a worker process; the
+        results are then merged and written through this process's single
+        connection, de-duplicated on Company_Number (first occurrence wins).
+
+        Args:
+            sources: File paths or (path, sheet_name) tuples. A bare workbook
+                     path imports every sheet in it.
+            max_workers: Worker processes to use (defaults to CPU count)
+
+        Returns:
+            Import report (see import_dataframe) plus 'sources', a list of
+            per-source {'source', 'total', 'valid', 'invalid'} counts
+        """
+        report, merged, duplicates = self._parse_sources(sources, max_workers=max_workers)
+
+        conn = self.get_connection()
+        try:
+            with conn:
+                self._quarantine_invalid_rows(conn, report['invalid_rows'])
+                report['inserted'] = self._insert_new_companies(conn, merged)
+        finally:
+            conn.close()
+            self._after_write()
+
+        self.prune_changes()
+        report['skipped'] = len(merged) - report['inserted'] + duplicates
+        return report
+
+    def incremental_import(self, file_path: str, use_api_for_deadlines: bool = False,
+                           remove_missing: bool = False, force: bool = False) -> Dict[str, Any]:
+        """Re-import a client file, writing only new and changed companies.
+
+        The file's content hash is compared with the one recorded at the last
+        import and, if it is unchanged, neither the file nor the companies
+        table is read. Otherwise every sheet is diffed against the companies
+        table and new rows are inserted and renamed companies or corrected
+        deadlines are updated in one transaction. Internal statuses are never
+        touched.
+
+        Args:
+            file_path: Path to the client file (every sheet of a workbook is read)
+            use_api_for_deadlines: If True, new companies get their deadline
+                from Companies House and existing deadlines are left to the API sync
+            remove_missing: If True, delete companies no longer in the file
+                (a row that is in the file but invalid keeps its company)
+            force: If True, diff the file even if its hash is unchanged
+
+        Returns:
+            Dictionary with 'unchanged' flag, 'added', 'updated', 'removed'
+            (companies in the table but not in the file, deleted only if
+            remove_missing), 'invalid' count and 'invalid_rows'
+        """
+        source_path = str(Path(file_path).resolve())
+        content_hash = file_content_hash(file_path)
+
+        report = {'unchanged': False, 'added': 0, 'updated': 0, 'removed': 0, 'invalid': 0, 'invalid_rows': []}
+
+        conn = self.get_connection()
+        try:
+            row = conn.execute(
+                "SELECT Content_Hash FROM import_history WHERE Source_Path = ?", (source_path,)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        if row and row['Content_Hash'] == content_hash and not force:
+            report['unchanged'] = True
+            return report
+
+        # Runs inside the Streamlit server and the import watcher thread, where
+        # forking worker processes is unsafe, so sheets are parsed in-process
+        parsed, sheet, _ = self._parse_sources([file_path], max_workers=1,
+                                               require_deadline=not use_api_for_deadlines)
+        report['invalid'] = parsed['invalid']
+        report['invalid_rows'] = parsed['invalid_rows']
+
+        conn = self.get_connection()
+        try:
+            existing = pd.read_sql_query(
+                "SELECT Company_Number, Company_Name, Filing_Deadline FROM companies", conn
+            )
+        finally:
+            conn.close()
+
+        # Compare deadlines as stored day numbers
+        sheet = sheet.assign(Filing_Deadline=deadlines_to_days(sheet['Filing_Deadline']))
+
+        diff = sheet.merge(existing, on='Company_Number', how='left', suffixes=('', '_db'), indicator=True)
+        is_new = diff['_merge'] == 'left_only'
+        name_changed = (diff['Company_Name'] != diff['Company_Name_db']).fillna(False)
+        deadline_changed = (diff['Filing_Deadline'].notna()
+                            & (diff['Filing_Deadline'] != diff['Filing_Deadline_db'])).fillna(False)
+
+        added = diff.loc[is_new, ['Company_Number', 'Company_Name', 'Filing_Deadline']]
+        if use_api_for_deadlines:
+            changed = diff.loc[~is_new & name_changed, ['Company_Name', 'Company_Number']]
+            changed.insert(1, 'Filing_Deadline', None)
+        else:
+            changed = diff.loc[~is_new & (name_changed | deadline_changed),
+                               ['Company_Name', 'Filing_Deadline', 'Company_Number']]
+
+        if use_api_for_deadlines and not added.empty:
+            api = self._get_import_api()
+            if api:
+                api_deadlines = self._fetch_api_deadlines(api, added['Company_Number'].tolist())
+                from_api = deadlines_to_days(added['Company_Number'].map(api_deadlines))
+                added = added.assign(Filing_Deadline=from_api.fillna(added['Filing_Deadline']))
+
+            no_deadline = added['Filing_Deadline'].isna()
+            for number in added.loc[no_deadline, 'Company_Number']:
+                report['invalid_rows'].append({
+                    'row': None, 'Company_Number': number, 'Company_Name': None, 'reason': 'No deadline available'
+                })
+            report['invalid'] += int(no_deadline.sum())
+            added = added[~no_deadline]
+
+        # A row that fails validation is still listed in the file, so its company is not "missing"
+        listed = set(sheet['Company_Number']) | {row['Company_Number'] for row in report['invalid_rows']}
+        removed = existing.loc[~existing['Company_Number'].isin(listed), 'Company_Number']
+        # Never empty the table because a file came through listing no companies
+        if not listed:
+            removed = removed.iloc[:0]
+
+        conn = self.get_connection()
+        try:
+            with conn:
+                self._quarantine_invalid_rows(conn, report['invalid_rows'], source=Path(file_path).name)
+                conn.executemany("""
+                    INSERT INTO companies
+                    (Company_Number, Company_Name, Filing_Deadline, Internal_Status, Accounts_Filed_CH)
+                    VALUES (?, ?, ?, 0, 0)
+                """, zip(
+                    added['Company_Number'].tolist(),
+                    added['Company_Name'].tolist(),
+                    [int(day) for day in added['Filing_Deadline']]
+                ))
+                conn.executemany("""
+                    UPDATE companies
+                    SET Company_Name = ?, Filing_Deadline = COALESCE(?, Filing_Deadline),
+                        Last_Updated = CURRENT_TIMESTAMP
+                    WHERE Company_Number = ?
+                """, zip(
+                    changed['Company_Name'].tolist(),
+                    [None if pd.isna(day) else int(day) for day in changed['Filing_Deadline']],
+                    changed['Company_Number'].tolist()
+                ))
+                if remove_missing:
+                    conn.executemany(
+                        "DELETE FROM companies WHERE Company_Number = ?",
+                        ((number,) for number in removed)
+                    )
+                conn.execute("""
+                    INSERT INTO import_history (Source_Path, Content_Hash, Imported_At)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(Source_Path) DO UPDATE SET
+                        Content_Hash = excluded.Content_Hash,
+                        Imported_At = excluded.Imported_At
+                """, (source_path, content_hash))
+        finally:
+            conn.close()
+            self._after_write()
+
+        self.prune_changes()
+        report['added'] = len(added)
+        report['updated'] = len(changed)
+        report['removed'] = len(removed)
+        return report
+
+    def _parse_sources(self, sources: List, max_workers: Optional[int] = None,
+                       require_deadline: bool = True):
+        """Parse import sources (in parallel when there are several) and merge them.
+
+        Args:
+            sources: File paths or (path, sheet_name) tuples
+            max_workers: Worker processes to use (defaults to CPU count)
+            require_deadline: If False, rows without a deadline are kept
+
+        Returns:
+            Tuple of (partial import report, merged valid rows de-duplicated
+            on Company_Number, number of duplicates dropped)
+        """
+        expanded = expand_import_sources(sources)
+        parse = partial(parse_import_source, require_deadline=require_deadline)
+
+        if len(expanded) > 1 and max_workers != 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                parsed = list(executor.map(parse, expanded))
+        else:
+            parsed = [parse(source) for source in expanded]
+
+        report = {'total': 0, 'inserted': 0, 'skipped': 0, 'invalid': 0, 'invalid_rows': [], 'sources': []}
+        for result in parsed:
+            report['total'] += result['total']
+            report['invalid'] += len(result['invalid_rows'])
+            report['invalid_rows'].extend(result['invalid_rows'])
+            report['sources'].append({
+                'source': result['source'],
+                'total': result['total'],
+                'valid': len(result['valid']),
+                'invalid': len(result['invalid_rows'])
+            })
+
+        frames = [result['valid'] for result in parsed if not result['valid'].empty]
+        if not frames:
+            return report, pd.DataFrame(columns=['Company_Number', 'Company_Name', 'Filing_Deadline']), 0
+
+        merged = pd.concat(frames, ignore_index=True)
+        duplicates = merged['Company_Number'].duplicated()
+        return report, merged[~duplicates], int(duplicates.sum())
+
+    def _import_chunks(self, chunks: Iterable[pd.DataFrame], use_api_for_deadlines: bool = False) -> Dict[str, Any]:
+        """Validate and insert DataFrame chunks through one connection and transaction.
+
+        Only one chunk is held in memory at a time, so peak memory depends on
+        the chunk size rather than the file size.
+
+        Args:
+            chunks: Iterable of raw DataFrames
+            use_api_for_deadlines: If True, fetch filing deadlines from Companies House API
+
+        Returns:
+            Import report (see import_dataframe)
+        """
         # Validate required columns (Filing_Deadline optional if using API)
         if use_api_for_deadlines:
             required_columns = ['Company_Name', 'Company_Number']
         else:
             required_columns = ['Company_Name', 'Company_Number', 'Filing_Deadline']
 
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise ValueError(f"Missing required columns: {missing_columns}")
+        api = self._get_import_api() if use_api_for_deadlines else None
 
-        # Try to import Companies House API if using it for deadlines
-        api = None
-        if use_api_for_deadlines:
-            try:
-                from api import CompaniesHouseAPI
-                import os
-                if os.getenv("COMPANIES_HOUSE_API_KEY"):
-                    api = CompaniesHouseAPI()
-                    print("Using Companies House API for filing deadlines")
-                else:
-                    print("Warning: API key not set, falling back to Excel deadlines")
-                    use_api_for_deadlines = False
-            except Exception as e:
-                print(f"Warning: Could not initialize API: {e}")
-                use_api_for_deadlines = False
+        report = {'total': 0, 'inserted': 0, 'skipped': 0, 'invalid': 0, 'invalid_rows': []}
 
         conn = self.get_connection()
-        cursor = conn.cursor()
+        try:
+            with conn:
+                for df in chunks:
+                    missing_columns = [col for col in required_columns if col not in df.columns]
+                    if missing_columns:
+                        raise ValueError(f"Missing required columns: {missing_columns}")
 
-        imported_count = 0
-        for _, row in df.iterrows():
-            try:
-                # Get company details
-                company_number = str(row['Company_Number'])
-                company_name = str(row['Company_Name'])
-
-                # Get filing deadline - try API first, fall back to Excel
-                filing_deadline = None
-
-                if use_api_for_deadlines and api:
-                    try:
-                        api_deadline = api.get_filing_deadline(company_number)
-                        if api_deadline:
-                            filing_deadline = api_deadline
-                            print(f"  Fetched deadline from API for {company_number}: {api_deadline}")
-                    except Exception as e:
-                        print(f"  API error for {company_number}, using Excel deadline: {e}")
-
-                # Fall back to Excel deadline if API didn't work
-                if not filing_deadline and 'Filing_Deadline' in df.columns:
-                    excel_deadline = row['Filing_Deadline']
-                    if pd.notna(excel_deadline):
-                        if isinstance(excel_deadline, pd.Timestamp):
-                            filing_deadline = excel_deadline.strftime('%Y-%m-%d')
-                        else:
-                            filing_deadline = str(excel_deadline).split()[0]
-
-                # Skip if no deadline found
-                if not filing_deadline:
-                    print(f"  Skipping {company_number}: No deadline available")
-                    continue
-
-                cursor.execute("""
-                    INSERT OR IGNORE INTO companies
-                    (Company_Number, Company_Name, Filing_Deadline, Internal_Status, Accounts_Filed_CH)
-                    VALUES (?, ?, ?, 'Not Started', 0)
-                """, (
-                    company_number,
-                    company_name,
-                    filing_deadline
-                ))
-                if cursor.rowcount > 0:
-                    imported_count += 1
-            except Exception as e:
-                print(f"Error importing {row['Company_Number']}: {e}")
+                    frame = normalize_import_frame(df)
 
-        conn.commit()
-        conn.close()
+                    # Prefer Companies House deadlines, falling back to the Excel column
+                    if api:
+                        api_deadlines = self._fetch_api_deadlines(api, frame['Company_Number'].dropna().unique().tolist())
+                        if api_deadlines:
+                            from_api = frame['Company_Number'].map(api_deadlines).astype('string')
+                            frame['Filing_Deadline'] = from_api.fillna(frame['Filing_Deadline'])
+
+                    valid, invalid_rows = validate_import_frame(frame, row_offset=2 + report['total'])
+                    duplicates = valid['Company_Number'].duplicated()
+                    valid = valid[~duplicates]
+
+                    inserted = self._insert_new_companies(conn, valid)
+
+                    report['total'] += len(frame)
+                    report['inserted'] += inserted
+                    report['skipped'] += len(valid) - inserted + int(duplicates.sum())
+                    report['invalid'] += len(invalid_rows)
+                    report['invalid_rows'].extend(invalid_rows)
+
+                self._quarantine_invalid_rows(conn, report['invalid_rows'])
+        finally:
+            conn.close()
+            self._after_write()
+
+        self.prune_changes()
+
+        for invalid in report['invalid_rows']:
+            print(f"  Skipping row {invalid['row']} ({invalid['Company_Number']}): {invalid['reason']}")
 
-        return imported_count
+        return report
 
-    def get_all_companies(self) -> pd.DataFrame:
+    def _insert_new_companies(self, conn: sqlite3.Connection, frame: pd.DataFrame) -> int:
+        """Insert validated import rows, ignoring companies that already exist.
+
+        Args:
+            conn: Open connection (the caller commits)
+            frame: Valid rows with Company_Number, Company_Name and
+                   Filing_Deadline (YYYY-MM-DD) columns
+
+        Returns:
+            Number of companies inserted
+        """
+        rows = zip(
+            frame['Company_Number'].tolist(),
+            frame['Company_Name'].tolist(),
+            deadlines_to_days(frame['Filing_Deadline']).tolist()
+        )
+        # rowcount, unlike total_changes, excludes the change-log rows written by triggers
+        cursor = conn.executemany("""
+            INSERT OR IGNORE INTO companies
+            (Company_Number, Company_Name, Filing_Deadline, Internal_Status, Accounts_Filed_CH)
+            VALUES (?, ?, ?, 0, 0)
+        """, rows)
+        return cursor.rowcount
+
+    def _get_import_api(self):
+        """Create a Companies House client for imports.
+
+        Returns:
+            CompaniesHouseAPI instance, or None if the API is unavailable
+        """
+        try:
+            from api import CompaniesHouseAPI
+            import os
+            if not os.getenv("COMPANIES_HOUSE_API_KEY"):
+                print("Warning: API key not set, falling back to Excel deadlines")
+                return None
+            print("Using Companies House API for filing deadlines")
+            return CompaniesHouseAPI()
+        except Exception as e:
+            print(f"Warning: Could not initialize API: {e}")
+            return None
+
+    def _fetch_api_deadlines(self, api, company_numbers: List[str]) -> Dict[str, str]:
+        """Fetch filing deadlines from Companies House for an import.
+
+        Args:
+            api: CompaniesHouseAPI instance
+            company_numbers: Company numbers to look up
+
+        Returns:
+            Dictionary of company number to deadline for companies that have one
+        """
+        results = api.bulk_get_filing_deadlines(company_numbers)
+        return {number: deadline for number, deadline in results.items() if deadline}
+
+    def _quarantine_invalid_rows(self, conn: sqlite3.Connection, invalid_rows: List[Dict],
+                                 source: Optional[str] = None):
+        """Record import rows with malformed company numbers in the quarantine table.
+
+        Args:
+            conn: Open connection (the caller commits)
+            invalid_rows: Invalid row dicts from an import report
+            source: Source label for rows that don't carry their own
+        """
+        conn.executemany("""
+            INSERT INTO company_quarantine (Company_Number, Company_Name, Reason, Source, Detected_At)
+            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(Company_Number) DO UPDATE SET
+                Company_Name = excluded.Company_Name,
+                Source = excluded.Source,
+                Detected_At = excluded.Detected_At
+        """, [
+            (row['Company_Number'], row.get('Company_Name'), row['reason'], row.get('source', source))
+            for row in invalid_rows
+            if row['reason'] == INVALID_NUMBER_REASON
+        ])
+
+    def get_quarantine(self) -> pd.DataFrame:
+        """Get company numbers quarantined for having an invalid format.
+
+        Returns:
+            DataFrame of quarantined numbers, most recent first
+        """
+        with self._reader() as conn:
+            return pd.read_sql_query("SELECT * FROM company_quarantine ORDER BY Detected_At DESC", conn)
+
+    def get_sync_company_numbers(self, company_numbers: Optional[List[str]] = None) -> List[str]:
+        """Get the company numbers that are safe to send to Companies House.
+
+        Numbers are validated in bulk; malformed ones are quarantined rather
+        than spending an API request on every sync.
+
+        Args:
+            company_numbers: Numbers to check (defaults to every company)
+
+        Returns:
+            Stored company numbers whose normalized form is valid, without duplicates
+        """
+        if company_numbers is None:
+            company_numbers = self.get_company_numbers()
+
+        valid, invalid = partition_company_numbers(company_numbers)
+
+        if invalid:
+            conn = self.get_connection()
+            try:
+                with conn:
+                    conn.executemany("""
+                        INSERT INTO company_quarantine (Company_Number, Company_Name, Reason, Source)
+                        SELECT Company_Number, Company_Name, ?, 'companies' FROM companies
+                        WHERE Company_Number = ?
+                        ON CONFLICT(Company_Number) DO NOTHING
+                    """, [(INVALID_NUMBER_REASON, number) for number in invalid])
+            finally:
+                conn.close()
+                self._after_write()
+
+        return [company_number for company_number, _ in valid]
+
+    def get_all_companies(self, typed: bool = False) -> pd.DataFrame:
         """Get all companies as a pandas DataFrame.
 
+        Results are cached until the database changes and shared between
+        callers, so treat the returned DataFrame as read-only.
+
+        Args:
+            typed: If True, return compact typed columns (see
+                   decode_companies_frame) instead of strings
+
         Returns:
             DataFrame containing all company data
         """
+        def load():
+            with self._reader() as conn:
+                return self._read_companies(conn, typed)
+
+        return self._cached(('get_all_companies', typed), load)
+
+    def _read_companies(self, conn: sqlite3.Connection, typed: bool) -> pd.DataFrame:
+        if typed:
+            stored = pd.read_sql_query(f"{STORED_COMPANY_SELECT} ORDER BY c.Filing_Deadline", conn)
+            return decode_companies_frame(stored)
+        return pd.read_sql_query(f"{COMPANY_SELECT} ORDER BY c.Filing_Deadline", conn)
+
+    def _company_query(self, search_term: Optional[str] = None) -> Tuple[str, tuple]:
+        """Build the companies query, optionally filtered by a search term.
+
+        Args:
+            search_term: Matched anywhere in the company name or number
+
+        Returns:
+            Tuple of (SQL ordered by deadline, parameters)
+        """
+        if not search_term:
+            return f"{COMPANY_SELECT} ORDER BY c.Filing_Deadline", ()
+        search_pattern = like_pattern(search_term)
+        return f"""
+            {COMPANY_SELECT}
+            WHERE c.Company_Name LIKE ? {LIKE_ESCAPE} OR c.Company_Number LIKE ? {LIKE_ESCAPE}
+            ORDER BY c.Filing_Deadline
+        """, (search_pattern, search_pattern)
+
+    def iter_companies(self, search_term: Optional[str] = None) -> Iterator[Company]:
+        """Stream companies from the cursor without building a DataFrame.
+
+        The connection stays open until the iterator is exhausted or closed.
+
+        Args:
+            search_term: Optional name or number filter, as in search_companies
+
+        Yields:
+            Company records ordered by filing deadline
+        """
+        query, params = self._company_query(search_term)
+        with self._reader() as conn:
+            conn.row_factory = company_row_factory
+            yield from conn.execute(query, params)
+
+    def get_company_records(self, search_term: Optional[str] = None) -> Tuple[Company, ...]:
+        """Get companies as immutable Company records.
+
+        Results are cached until the database changes, like get_all_companies.
+
+        Args:
+            search_term: Optional name or number filter, as in search_companies
+
+        Returns:
+            Tuple of Company records ordered by filing deadline
+        """
+        return self._cached(('get_company_records', search_term or None),
+                            lambda: tuple(self.iter_companies(search_term)))
+
+    def get_company_numbers(self, search_term: Optional[str] = None) -> List[str]:
+        """Get company numbers straight from the cursor.
+
+        Args:
+            search_term: Optional name or number filter, as in search_companies
+
+        Returns:
+            Company numbers ordered by filing deadline
+        """
+        if not search_term:
+            with self._reader() as conn:
+                return [row[0] for row in conn.execute("SELECT Company_Number FROM companies ORDER BY Filing_Deadline")]
+        return list(self.search_company_numbers(search_term))
+
+    def search_company_numbers(self, search_term: str) -> Tuple[str, ...]:
+        """Get the numbers of companies matching a search term, for search-as-you-type.
+
+        Results are cached per term until the database changes. A term that
+        extends an earlier one (the next keystroke) is answered by filtering
+        the earlier result in memory rather than scanning the table.
+
+        Args:
+            search_term: Matched case-insensitively anywhere in the name or
+                         number; '%' and '_' match literally
+
+        Returns:
+            Matching company numbers ordered by filing deadline
+        """
+        def load(term):
+            pattern = like_pattern(term)
+            # The unary + keeps SQLite from walking the deadline index, which
+            # costs a table lookup per row; scanning and sorting the matches is faster
+            with self._reader() as conn:
+                return [tuple(row) for row in conn.execute(f"""
+                    SELECT Company_Number, Company_Name FROM companies
+                    WHERE Company_Name LIKE ? {LIKE_ESCAPE} OR Company_Number LIKE ? {LIKE_ESCAPE}
+                    ORDER BY +Filing_Deadline, Company_Number
+                """, (pattern, pattern))]
+
+        return self._search.find(search_term, self._read_version(), load)
+
+    def get_company_columns(self, fields: Optional[List[str]] = None,
+                            search_term: Optional[str] = None) -> Dict[str, List]:
+        """Get companies as plain column lists.
+
+        Args:
+            fields: Company fields to return (defaults to all)
+            search_term: Optional name or number filter, as in search_companies
+
+        Returns:
+            Dictionary mapping each field to its list of values
+
+        Raises:
+            ValueError: If a field is not a company column
+        """
+        fields = list(fields or COMPANY_FIELDS)
+        unknown = [field for field in fields if field not in COMPANY_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown company fields: {unknown}. Must be from: {list(COMPANY_FIELDS)}")
+        return records_to_columns(self.get_company_records(search_term), fields)
+
+    def get_current_version(self) -> int:
+        """Get the latest change version of the companies table.
+
+        Returns:
+            Version of the most recent change (0 if nothing has changed yet)
+        """
         conn = self.get_connection()
-        df = pd.read_sql_query("SELECT * FROM companies ORDER BY Filing_Deadline", conn)
+        version = self._current_version(conn)
         conn.close()
+        return version
+
+    def _current_version(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'company_changes'").fetchone()
+        return row[0] if row else 0
+
+    def get_changes_since(self, version: int, typed: bool = False) -> Optional[pd.DataFrame]:
+        """Get the companies that changed after a given version.
+
+        Several changes to one company are collapsed into its latest state.
+
+        Args:
+            version: Version the caller's data reflects
+            typed: If True, return compact typed columns (see get_all_companies)
+
+        Returns:
+            DataFrame with the current companies columns plus Operation
+            ('insert', 'update' or 'delete'; deleted companies only have
+            Company_Number set) and Version, ordered by Version. None if
+            the log has been pruned past version or version is newer than
+            the log (it was reset), in which case the caller must reload
+            everything.
+        """
+        conn = self.get_connection()
+        try:
+            oldest = conn.execute("SELECT MIN(Version) FROM company_changes").fetchone()[0]
+            current = self._current_version(conn)
+            # Pruned past the caller's version, or the log restarted (e.g. after
+            # reset_database.py) below it: a diff would silently miss changes
+            if version > current or (version < current and (oldest is None or oldest > version + 1)):
+                return None
+
+            df = pd.read_sql_query(f"""
+                SELECT ch.Company_Number,
+                       c.Company_Name, c.Filing_Deadline, c.Internal_Status,
+                       c.Accounts_Filed_CH, c.Last_Updated,
+                       CASE WHEN c.Company_Number IS NULL THEN 'delete' ELSE ch.Operation END AS Operation,
+                       ch.Version
+                FROM (
+                    SELECT Company_Number, MAX(Version) AS Version
+                    FROM company_changes
+                    WHERE Version > ?
+                    GROUP BY Company_Number
+                ) latest
+                JOIN company_changes ch ON ch.Version = latest.Version
+                LEFT JOIN {'companies' if typed else 'company_details'} c ON c.Company_Number = ch.Company_Number
+                ORDER BY ch.Version
+            """, conn, params=(version,))
+        finally:
+            conn.close()
+
+        if typed:
+            df = pd.concat([decode_companies_frame(df), df[['Operation', 'Version']]], axis=1)
         return df
 
+    def prune_changes(self, keep_versions: int = CHANGE_LOG_RETENTION) -> int:
+        """Delete old entries from the change log.
+
+        Called after every import and bulk update, so the log stays bounded.
+        Readers holding a version older than the retained window get None
+        from get_changes_since and reload in full.
+
+        Args:
+            keep_versions: Number of most recent versions to keep
+
+        Returns:
+            Number of log entries deleted
+        """
+        conn = self.get_connection()
+        try:
+            with conn:
+                cursor = conn.execute(
+                    "DELETE FROM company_changes WHERE Version <= ?",
+                    (self._current_version(conn) - keep_versions,)
+                )
+                deleted = cursor.rowcount
+        finally:
+            conn.close()
+        return deleted
+
     def get_company(self, company_number: str) -> Optional[Dict]:
         """Get a single company by number.
 
@@ -165,11 +924,8 @@ class DatabaseManager:
         Returns:
             Dictionary containing company data or None if not found
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM companies WHERE Company_Number = ?", (company_number,))
-        row = cursor.fetchone()
-        conn.close()
+        with self._reader() as conn:
+            row = conn.execute(f"{COMPANY_SELECT} WHERE c.Company_Number = ?", (company_number,)).fetchone()
 
         if row:
             return dict(row)
@@ -185,16 +941,9 @@ class DatabaseManager:
         Returns:
             True if successful, False otherwise
         """
-        valid_statuses = [
-            'Not Started',
-            'Started',
-            'Sent to Client',
-            'Missing Information',
-            'Ready to Submit'
-        ]
-
-        if new_status not in valid_statuses:
-            raise ValueError(f"Invalid status. Must be one of: {valid_statuses}")
+        code = status_code(new_status)
+        if code is None:
+            raise ValueError(f"Invalid status. Must be one of: {STATUSES}")
 
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -202,14 +951,56 @@ class DatabaseManager:
             UPDATE companies
             SET Internal_Status = ?, Last_Updated = CURRENT_TIMESTAMP
             WHERE Company_Number = ?
-        """, (new_status, company_number))
+        """, (code, company_number))
 
         success = cursor.rowcount > 0
         conn.commit()
         conn.close()
+        self._after_write()
 
         return success
 
+    def update_statuses_bulk(self, status_updates: Dict[str, str]) -> int:
+        """Update the internal status of many companies in one transaction.
+
+        Every status is validated before anything is written, so an invalid
+        entry leaves the database untouched. Companies already at the
+        requested status are not rewritten.
+
+        Args:
+            status_updates: Mapping of company number to new status
+
+        Returns:
+            Number of companies whose status changed
+
+        Raises:
+            ValueError: If any status is not a valid status
+        """
+        invalid = sorted({status for status in status_updates.values() if status not in STATUS_CODES})
+        if invalid:
+            raise ValueError(f"Invalid status {', '.join(map(repr, invalid))}. Must be one of: {STATUSES}")
+        if not status_updates:
+            return 0
+
+        conn = self.get_connection()
+        try:
+            with conn:
+                cursor = conn.executemany("""
+                    UPDATE companies
+                    SET Internal_Status = ?, Last_Updated = CURRENT_TIMESTAMP
+                    WHERE Company_Number = ? AND Internal_Status != ?
+                """, [
+                    (STATUS_CODES[status], company_number, STATUS_CODES[status])
+                    for company_number, status in status_updates.items()
+                ])
+                updated = cursor.rowcount
+        finally:
+            conn.close()
+            self._after_write()
+
+        self.prune_changes()
+        return updated
+
     def update_filing_status(self, company_number: str, filed: bool) -> bool:
         """Update the Companies House filing status.
 
@@ -231,6 +1022,7 @@ class DatabaseManager:
         success = cursor.rowcount > 0
         conn.commit()
         conn.close()
+        self._after_write()
 
         return success
 
@@ -243,68 +1035,98 @@ class DatabaseManager:
 
         Returns:
             True if successful, False otherwise
+
+        Raises:
+            ValueError: If the deadline is not a valid date
         """
+        day = deadline_to_day(deadline)
+
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute("""
             UPDATE companies
             SET Filing_Deadline = ?, Last_Updated = CURRENT_TIMESTAMP
             WHERE Company_Number = ?
-        """, (deadline, company_number))
+        """, (day, company_number))
 
         success = cursor.rowcount > 0
         conn.commit()
         conn.close()
+        self._after_write()
 
         return success
 
-    def get_kpi_counts(self, deadline_cutoff: str = "2026-07-31") -> Dict[str, int]:
-        """Get KPI counts for the dashboard.
+    def update_filing_deadlines_bulk(self, deadlines: Dict[str, str]) -> int:
+        """Update the filing deadline of many companies in one transaction.
+
+        Every deadline is validated before anything is written. Companies
+        whose deadline is unchanged are not rewritten, so an API sweep that
+        finds nothing new leaves the change log and the caches alone.
 
         Args:
-            deadline_cutoff: The deadline cutoff date (YYYY-MM-DD)
+            deadlines: Mapping of company number to deadline (YYYY-MM-DD)
 
         Returns:
-            Dictionary with KPI counts
+            Number of companies whose deadline changed
+
+        Raises:
+            ValueError: If any deadline is not a valid date
         """
+        days = {company_number: deadline_to_day(deadline) for company_number, deadline in deadlines.items()}
+        if not days:
+            return 0
+
         conn = self.get_connection()
-        cursor = conn.cursor()
+        try:
+            with conn:
+                cursor = conn.executemany("""
+                    UPDATE companies
+                    SET Filing_Deadline = ?, Last_Updated = CURRENT_TIMESTAMP
+                    WHERE Company_Number = ? AND Filing_Deadline IS NOT ?
+                """, [(day, company_number, day) for company_number, day in days.items()])
+                updated = cursor.rowcount
+        finally:
+            conn.close()
+            self._after_write()
+
+        self.prune_changes()
+        return updated
 
-        # Accounts Outstanding (Deadline <= cutoff and not filed)
-        cursor.execute("""
-            SELECT COUNT(*) FROM companies
-            WHERE Filing_Deadline <= ? AND Accounts_Filed_CH = 0
-        """, (deadline_cutoff,))
-        outstanding = cursor.fetchone()[0]
+    def get_kpi_counts(self, deadline_cutoff: str = "2026-07-31") -> Dict[str, int]:
+        """Get KPI counts for the dashboard.
 
-        # Ready to Submit
-        cursor.execute("""
-            SELECT COUNT(*) FROM companies
-            WHERE Internal_Status = 'Ready to Submit'
-        """)
-        ready = cursor.fetchone()[0]
+        Args:
+            deadline_cutoff: The deadline cutoff date (YYYY-MM-DD)
 
-        # Sent to Client
-        cursor.execute("""
-            SELECT COUNT(*) FROM companies
-            WHERE Internal_Status = 'Sent to Client'
-        """)
-        sent = cursor.fetchone()[0]
+        Returns:
+            Dictionary with outstanding (due by the cutoff and not filed),
+            due_by_cutoff, started, ready, sent and missing counts
+        """
+        return dict(self._cached(('get_kpi_counts', deadline_cutoff),
+                                 lambda: self._load_kpi_counts(deadline_cutoff)))
 
-        # Missing Information
-        cursor.execute("""
-            SELECT COUNT(*) FROM companies
-            WHERE Internal_Status = 'Missing Information'
-        """)
-        missing = cursor.fetchone()[0]
+    def _load_kpi_counts(self, deadline_cutoff: str) -> Dict[str, int]:
+        with self._reader() as conn:
+            cursor = conn.cursor()
 
-        conn.close()
+            # Accounts due by the cutoff, and those of them not yet filed (outstanding)
+            cursor.execute("""
+                SELECT COALESCE(SUM(Accounts_Filed_CH = 0), 0), COUNT(*) FROM companies
+                WHERE Filing_Deadline <= ?
+            """, (deadline_to_day(deadline_cutoff),))
+            outstanding, due_by_cutoff = cursor.fetchone()
+
+            # Status counts in one pass over the integer codes
+            cursor.execute("SELECT Internal_Status, COUNT(*) FROM companies GROUP BY Internal_Status")
+            status_counts = dict(cursor.fetchall())
 
         return {
             'outstanding': outstanding,
-            'ready': ready,
-            'sent': sent,
-            'missing': missing
+            'due_by_cutoff': due_by_cutoff,
+            'started': status_counts.get(STATUS_CODES['Started'], 0),
+            'ready': status_counts.get(STATUS_CODES['Ready to Submit'], 0),
+            'sent': status_counts.get(STATUS_CODES['Sent to Client'], 0),
+            'missing': status_counts.get(STATUS_CODES['Missing Information'], 0)
         }
 
     def search_companies(self, search_term: str) -> pd.DataFrame:
@@ -314,18 +1136,192 @@ class DatabaseManager:
             search_term: The search term
 
         Returns:
-            DataFrame containing matching companies
+            DataFrame containing matching companies (cached and shared; treat as read-only)
         """
-        conn = self.get_connection()
-        query = """
-            SELECT * FROM companies
-            WHERE Company_Name LIKE ? OR Company_Number LIKE ?
-            ORDER BY Filing_Deadline
+        def load():
+            query, params = self._company_query(search_term)
+            with self._reader() as conn:
+                return pd.read_sql_query(query, conn, params=params)
+
+        return self._cached(('search_companies', search_term), load)
+
+    def _list_filter(self, search_term: Optional[str]) -> Tuple[str, tuple]:
+        """WHERE clause restricting the company list to a search term's matches.
+
+        A short list of matches is looked up by primary key; a long one is
+        cheaper to re-filter with LIKE while walking the sort index, since a
+        page is usually filled long before the scan ends.
         """
-        search_pattern = f"%{search_term}%"
-        df = pd.read_sql_query(query, conn, params=(search_pattern, search_pattern))
-        conn.close()
-        return df
+        if not search_term:
+            return "", ()
+        numbers = self.search_company_numbers(search_term)
+        if len(numbers) <= SEARCH_IN_LIST_LIMIT:
+            return "WHERE c.Company_Number IN (SELECT value FROM json_each(?))", (json.dumps(numbers),)
+        pattern = like_pattern(search_term)
+        return (f"WHERE (c.Company_Name LIKE ? {LIKE_ESCAPE} OR c.Company_Number LIKE ? {LIKE_ESCAPE})",
+                (pattern, pattern))
+
+    def _list_order(self, sort_by: str, ascending: bool) -> str:
+        """ORDER BY clause for a whitelisted sort column, tie-broken by number."""
+        if sort_by not in COMPANY_SORT_COLUMNS:
+            raise ValueError(f"Invalid sort column. Must be one of: {list(COMPANY_SORT_COLUMNS)}")
+        direction = "ASC" if ascending else "DESC"
+        return f"ORDER BY {COMPANY_SORT_COLUMNS[sort_by]} {direction}, c.Company_Number {direction}"
+
+    def get_companies_page(self, page: int = 0, page_size: int = 50, sort_by: str = 'Filing_Deadline',
+                           ascending: bool = True, search_term: Optional[str] = None) -> Dict[str, Any]:
+        """Get one page of the company list, sorted and filtered in SQL.
+
+        Args:
+            page: Zero-based page number; clamped to the available pages
+            page_size: Companies per page
+            sort_by: 'Filing_Deadline', 'Company_Name' or 'Internal_Status'
+            ascending: Sort direction
+            search_term: Optional name or number filter, as in search_companies
+
+        Returns:
+            Dictionary with 'rows' (typed DataFrame, see get_all_companies),
+            'total' matching companies, 'page', 'pages' and 'page_size'
+
+        Raises:
+            ValueError: If sort_by is not a sortable column or page_size is not positive
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        order = self._list_order(sort_by, ascending)
+
+        def load():
+            # Built here so a cached page costs no search query or JSON encoding
+            where, params = self._list_filter(search_term)
+            with self._reader() as conn:
+                if search_term:
+                    total = len(self.search_company_numbers(search_term))
+                else:
+                    total = conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+                pages = max(1, -(-total // page_size))
+                current = min(max(page, 0), pages - 1)
+                stored = pd.read_sql_query(
+                    f"{STORED_COMPANY_SELECT} {where} {order} LIMIT ? OFFSET ?", conn,
+                    params=(*params, page_size, current * page_size)
+                )
+            return {
+                'rows': decode_companies_frame(stored),
+                'total': total,
+                'page': current,
+                'pages': pages,
+                'page_size': page_size
+            }
+
+        return dict(self._cached(('get_companies_page', page, page_size, sort_by, ascending, search_term or None), load))
+
+    def iter_companies_chunks(self, chunk_size: int = IMPORT_BATCH_SIZE, sort_by: str = 'Filing_Deadline',
+                              ascending: bool = True, search_term: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """Stream the whole company list in fixed-size chunks.
+
+        Rows come in the same order and with the same filter as
+        get_companies_page, one chunk in memory at a time. With pyarrow
+        installed they are read from the memory-mapped CompanySnapshot,
+        which is shared by every export until the data changes; otherwise
+        from one query whose connection stays open until the iterator is
+        exhausted or closed.
+
+        Args:
+            chunk_size: Companies per chunk
+            sort_by: 'Filing_Deadline', 'Company_Name' or 'Internal_Status'
+            ascending: Sort direction
+            search_term: Optional name or number filter, as in search_companies
+
+        Yields:
+            Typed DataFrames (see get_all_companies)
+
+        Raises:
+            ValueError: If sort_by is not a sortable column
+        """
+        order = self._list_order(sort_by, ascending)
+        if self._snapshot is not None:
+            numbers = self.search_company_numbers(search_term) if search_term else None
+            yield from self._snapshot.iter_chunks(chunk_size, sort_by, ascending, numbers)
+            return
+
+        where, params = self._list_filter(search_term)
+        with self._reader() as conn:
+            for stored in pd.read_sql_query(f"{STORED_COMPANY_SELECT} {where} {order}", conn,
+                                            params=params, chunksize=chunk_size):
+                yield decode_companies_frame(stored)
+
+    def get_company_position(self, value: str, sort_by: str = 'Company_Name',
+                             search_term: Optional[str] = None) -> int:
+        """Count the listed companies that sort before a value, in ascending order.
+
+        Used to jump the paginated list to a letter or a deadline month:
+        the page to show is position // page_size.
+
+        Args:
+            value: Name prefix, YYYY-MM-DD deadline or status label, matching sort_by
+            sort_by: Column the list is sorted on
+            search_term: Optional name or number filter, as in search_companies
+
+        Returns:
+            Zero-based position of the first company at or after value
+
+        Raises:
+            ValueError: If sort_by is not sortable or value does not fit it
+        """
+        if sort_by not in COMPANY_SORT_COLUMNS:
+            raise ValueError(f"Invalid sort column. Must be one of: {list(COMPANY_SORT_COLUMNS)}")
+        if sort_by == 'Filing_Deadline':
+            key = deadline_to_day(value)
+        elif sort_by == 'Internal_Status':
+            key = status_code(value)
+            if key is None:
+                raise ValueError(f"Invalid status. Must be one of: {STATUSES}")
+        else:
+            key = value
+
+        where, params = self._list_filter(search_term)
+        # Missing deadlines sort first, like NULLs in the list's ORDER BY
+        column = COMPANY_SORT_COLUMNS[sort_by]
+        condition = f"({column} < ? OR {column} IS NULL)"
+        clause = f"{where} AND {condition}" if where else f"WHERE {condition}"
+
+        with self._reader() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM companies c {clause}", (*params, key)).fetchone()[0]
+
+    def get_deadline_months(self) -> List[str]:
+        """Get the months (YYYY-MM) that have at least one filing deadline, in order."""
+        def load():
+            with self._reader() as conn:
+                return [row[0] for row in conn.execute("""
+                    SELECT DISTINCT strftime('%Y-%m', Filing_Deadline * 86400, 'unixepoch')
+                    FROM companies WHERE Filing_Deadline IS NOT NULL ORDER BY 1
+                """)]
+
+        return list(self._cached(('get_deadline_months',), load))
+
+    def get_deadline_counts(self, deadline_cutoff: str = "2026-07-31",
+                            today: Optional[str] = None) -> Dict[str, int]:
+        """Count companies for the list metrics in one query.
+
+        Args:
+            deadline_cutoff: The deadline cutoff date (YYYY-MM-DD)
+            today: Date deadlines become overdue after (defaults to today)
+
+        Returns:
+            Dictionary with 'total', 'due_by_cutoff' and 'overdue' counts
+        """
+        today = today or datetime.now().strftime("%Y-%m-%d")
+
+        def load():
+            with self._reader() as conn:
+                total, due, overdue = conn.execute("""
+                    SELECT COUNT(*),
+                           COALESCE(SUM(Filing_Deadline <= ?), 0),
+                           COALESCE(SUM(Filing_Deadline < ?), 0)
+                    FROM companies
+                """, (deadline_to_day(deadline_cutoff), deadline_to_day(today))).fetchone()
+            return {'total': total, 'due_by_cutoff': due, 'overdue': overdue}
+
+        return dict(self._cached(('get_deadline_counts', deadline_cutoff, today), load))
 
     def get_database_stats(self) -> Dict[str, any]:
         """Get general database statistics.
@@ -333,16 +1329,17 @@ class DatabaseManager:
         Returns:
             Dictionary containing database stats
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        return dict(self._cached(('get_database_stats',), self._load_database_stats))
 
-        cursor.execute("SELECT COUNT(*) FROM companies")
-        total_companies = cursor.fetchone()[0]
+    def _load_database_stats(self) -> Dict[str, Any]:
+        with self._reader() as conn:
+            cursor = conn.cursor()
 
-        cursor.execute("SELECT COUNT(*) FROM companies WHERE Accounts_Filed_CH = 1")
-        filed_count = cursor.fetchone()[0]
+            cursor.execute("SELECT COUNT(*) FROM companies")
+            total_companies = cursor.fetchone()[0]
 
-        conn.close()
+            cursor.execute("SELECT COUNT(*) FROM companies WHERE Accounts_Filed_CH = 1")
+            filed_count = cursor.fetchone()[0]
 
         return {
             'total_companies': total_companies,
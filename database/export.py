@@ -0,0 +1,286 @@
+"""
+Export helpers for Company Accounts Dashboard.
+Streams the company list out of the database in chunks into an Excel
+(write-only workbook), CSV or Parquet file, so memory use does not grow
+with the number of companies. Each chunk is turned into export columns by
+a frame builder the caller supplies (the app passes
+presentation.build_export_frame). Finished files are kept in a temporary
+directory keyed by data version, format, sort and search, so repeating an
+export of unchanged data is served straight from disk.
+"""
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+# Rows read from the database per chunk
+EXPORT_CHUNK_SIZE = 5000
+
+EXPORT_COLUMNS = ['Company_Name', 'Company_Number', 'Filing_Deadline', 'Internal_Status', 'Days_Left', 'Overdue']
+
+# Turns a chunk of typed companies and the day to measure deadlines against into EXPORT_COLUMNS
+FrameBuilder = Callable[[pd.DataFrame, pd.Timestamp], pd.DataFrame]
+
+
+def _today() -> pd.Timestamp:
+    return pd.Timestamp.now().normalize()
+
+
+def parquet_available() -> bool:
+    """Check whether the optional pyarrow writer is installed."""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _write_xlsx(frames: Iterator[pd.DataFrame], path: Path):
+    from openpyxl import Workbook
+
+    # Write-only workbooks stream rows to disk instead of keeping cell objects
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Companies')
+    sheet.append(EXPORT_COLUMNS)
+    for frame in frames:
+        # Unknown deadlines become empty cells
+        frame = frame.astype(object).where(frame.notna(), None)
+        for row in frame.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(path)
+
+
+def _write_csv(frames: Iterator[pd.DataFrame], path: Path):
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        handle.write(','.join(EXPORT_COLUMNS) + '\n')
+        for frame in frames:
+            frame.to_csv(handle, header=False, index=False)
+
+
+def _write_parquet(frames: Iterator[pd.DataFrame], path: Path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for frame in frames:
+            if writer is None:
+                table = pa.Table.from_pandas(frame, preserve_index=False)
+                writer = pq.ParquetWriter(path, table.schema)
+            else:
+                table = pa.Table.from_pandas(frame, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+# Format name -> (file extension, MIME type, writer)
+EXPORT_FORMATS: Dict[str, tuple] = {
+    'Excel': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', _write_xlsx),
+    'CSV': ('csv', 'text/csv', _write_csv),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet', _write_parquet),
+}
+
+
+def available_export_formats() -> List[str]:
+    """Get the export formats usable with the installed packages."""
+    return [name for name in EXPORT_FORMATS if name != 'Parquet' or parquet_available()]
+
+
+def iter_export_frames(db, build_frame: FrameBuilder, sort_by: str = 'Filing_Deadline', ascending: bool = True,
+                       search_term: Optional[str] = None, today: Optional[pd.Timestamp] = None,
+                       chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Stream the company list as export frames.
+
+    Args:
+        db: DatabaseManager to export from
+        build_frame: Builds EXPORT_COLUMNS from a chunk of typed companies
+        sort_by: List sort column, as for get_companies_page
+        ascending: Sort direction
+        search_term: Optional name or number filter
+        today: Midnight of the day deadlines are measured against; today if omitted
+        chunk_size: Companies per frame
+
+    Yields:
+        Frames with EXPORT_COLUMNS, in list order
+    """
+    today = _today() if today is None else today
+    for companies in db.iter_companies_chunks(chunk_size, sort_by, ascending, search_term):
+        yield build_frame(companies, today)
+
+
+def write_export(db, export_format: str, path, build_frame: FrameBuilder, sort_by: str = 'Filing_Deadline',
+                 ascending: bool = True, search_term: Optional[str] = None,
+                 today: Optional[pd.Timestamp] = None, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """Write the company list to a file one chunk at a time.
+
+    Args:
+        db: DatabaseManager to export from
+        export_format: 'Excel', 'CSV' or 'Parquet'
+        path: File to write
+        build_frame, sort_by, ascending, search_term, today, chunk_size: As for iter_export_frames
+
+    Raises:
+        ValueError: If the format is unknown or its writer is not installed
+    """
+    if export_format not in available_export_formats():
+        raise ValueError(f"Invalid export format. Must be one of: {available_export_formats()}")
+    writer = EXPORT_FORMATS[export_format][2]
+    writer(iter_export_frames(db, build_frame, sort_by, ascending, search_term, today, chunk_size), Path(path))
+
+
+class ExportCache:
+    """Finished export files, reused until the data or the request changes.
+
+    Files live in a private temporary directory that is removed with the
+    cache. Different exports are generated concurrently; sessions asking
+    for an export that is already being written wait for it instead of
+    writing it again.
+    """
+
+    def __init__(self, build_frame: FrameBuilder, max_entries: int = 8):
+        """Initialize the cache.
+
+        Args:
+            build_frame: Builds each export chunk, as for iter_export_frames
+            max_entries: Export files kept; the least recently used is deleted
+        """
+        self.build_frame = build_frame
+        self.max_entries = max_entries
+        self._dir = tempfile.TemporaryDirectory(prefix="bytedashboard-export-")
+        self._entries: "OrderedDict[tuple, Path]" = OrderedDict()
+        # Exports being generated; the event is set once the file is in _entries (or failed)
+        self._building: Dict[tuple, threading.Event] = {}
+        # Guards the two dicts only; files are generated and read without it
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_export(self, db, export_format: str, sort_by: str = 'Filing_Deadline', ascending: bool = True,
+                   search_term: Optional[str] = None, today: Optional[pd.Timestamp] = None) -> Path:
+        """Get the export file for the current data, generating it on a miss.
+
+        Args:
+            db: DatabaseManager to export from
+            export_format: 'Excel', 'CSV' or 'Parquet'
+            sort_by, ascending, search_term, today: As for iter_export_frames
+
+        Returns:
+            Path of the export file; valid until it is evicted
+
+        Raises:
+            ValueError: If the format or sort column is invalid
+        """
+        return self._get_export(db, export_format, sort_by, ascending, search_term, today)[0]
+
+    def read_export(self, db, export_format: str, sort_by: str = 'Filing_Deadline', ascending: bool = True,
+                    search_term: Optional[str] = None, today: Optional[pd.Timestamp] = None) -> bytes:
+        """Get the contents of an export, as for get_export.
+
+        The file is opened before another session can evict it.
+        """
+        _, handle = self._get_export(db, export_format, sort_by, ascending, search_term, today, open_file=True)
+        with handle:
+            return handle.read()
+
+    def _get_export(self, db, export_format, sort_by, ascending, search_term, today,
+                    open_file: bool = False) -> Tuple[Path, Optional[BinaryIO]]:
+        """Look up or generate an export.
+
+        Returns:
+            Tuple of (path, the file opened for reading if open_file, else None)
+        """
+        today = _today() if today is None else today
+        # Days left depend on today, so an export does not outlive its day
+        key = (str(db.db_path), db.get_read_version(), export_format, sort_by, ascending, search_term or None, today)
+
+        while True:
+            with self._lock:
+                path = self._entries.get(key)
+                if path is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return path, open(path, 'rb') if open_file else None
+                building = self._building.get(key)
+                if building is None:
+                    building = self._building[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # Another session is writing this export; look again once it is done (or has failed)
+            building.wait()
+
+        try:
+            path = self._generate(db, export_format, sort_by, ascending, search_term, today)
+        except BaseException:
+            with self._lock:
+                del self._building[key]
+            building.set()
+            raise
+
+        with self._lock:
+            self._entries[key] = path
+            del self._building[key]
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                evicted.unlink(missing_ok=True)
+            handle = open(path, 'rb') if open_file else None
+        building.set()
+        return path, handle
+
+    def _generate(self, db, export_format, sort_by, ascending, search_term, today) -> Path:
+        """Write an export to a new file in the cache directory."""
+        extension = EXPORT_FORMATS.get(export_format, ('bin',))[0]
+        fd, partial = tempfile.mkstemp(suffix=f".{extension}.partial", dir=self._dir.name)
+        os.close(fd)
+        try:
+            write_export(db, export_format, partial, self.build_frame, sort_by, ascending, search_term, today)
+        except BaseException:
+            os.unlink(partial)
+            raise
+        # Only complete files ever carry the final name
+        path = Path(partial[:-len('.partial')])
+        os.replace(partial, path)
+        return path
+
+    def export_loader(self, db, export_format: str, sort_by: str = 'Filing_Deadline', ascending: bool = True,
+                      search_term: Optional[str] = None,
+                      today: Optional[pd.Timestamp] = None) -> Callable[[], bytes]:
+        """Get a function producing the export's bytes when called.
+
+        Suited to st.download_button(data=...), which only calls it when
+        the button is clicked, so page reruns never generate exports.
+        """
+        def load() -> bytes:
+            try:
+                return self.read_export(db, export_format, sort_by, ascending, search_term, today)
+            except Exception as e:
+                print(f"[ERROR] {export_format} export failed: {e}")
+                raise
+
+        return load
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with hits, misses, entries and total bytes on disk
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': sum(path.stat().st_size for path in self._entries.values() if path.exists())
+            }
+
+    def clear(self):
+        """Delete every cached export."""
+        with self._lock:
+            for path in self._entries.values():
+                path.unlink(missing_ok=True)
+            self._entries.clear()
@@ -0,0 +1,351 @@
+"""
+Import helpers for Company Accounts Dashboard.
+Normalizes and validates client spreadsheets as whole DataFrames.
+"""
+import hashlib
+import pandas as pd
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Dict, Optional, Tuple, Union
+
+from api.company_numbers import INVALID_NUMBER_REASON, normalize_company_numbers, valid_company_numbers
+
+IMPORT_COLUMNS = ['Company_Number', 'Company_Name', 'Filing_Deadline']
+
+# Rows written per executemany batch by the streaming importers
+IMPORT_BATCH_SIZE = 5000
+
+EXCEL_ENGINES = ['auto', 'calamine', 'openpyxl']
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Strip stray whitespace from column headers.
+
+    Args:
+        df: Raw DataFrame as read from the source file
+
+    Returns:
+        DataFrame with cleaned column names
+    """
+    return df.rename(columns=lambda col: str(col).strip())
+
+
+def parse_deadlines(values: pd.Series) -> pd.Series:
+    """Convert a column of deadlines to ISO date strings in one pass.
+
+    ISO dates, Excel dates and timestamps are parsed first. Anything left
+    over is retried as a UK day-first date (e.g. 31/07/2026).
+
+    Args:
+        values: Raw Filing_Deadline values
+
+    Returns:
+        Series of YYYY-MM-DD strings, with missing/unparseable values as NA
+    """
+    parsed = pd.to_datetime(values, errors='coerce', format='ISO8601')
+
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        parsed.loc[retry] = pd.to_datetime(
+            values[retry].astype(str), errors='coerce', format='mixed', dayfirst=True
+        )
+
+    return parsed.dt.strftime('%Y-%m-%d')
+
+
+def normalize_import_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize the import columns of a whole frame at once.
+
+    Args:
+        df: DataFrame with Company_Number, Company_Name and (optionally)
+            Filing_Deadline columns
+
+    Returns:
+        DataFrame with IMPORT_COLUMNS as trimmed strings (blank values as NA),
+        normalized company numbers and deadlines as YYYY-MM-DD strings
+    """
+    df = df.reset_index(drop=True)
+    frame = pd.DataFrame({
+        'Company_Number': normalize_company_numbers(df['Company_Number']),
+        'Company_Name': df['Company_Name'].astype('string').str.strip(),
+    })
+
+    if 'Filing_Deadline' in df.columns:
+        frame['Filing_Deadline'] = parse_deadlines(df['Filing_Deadline']).astype('string')
+    else:
+        frame['Filing_Deadline'] = pd.Series(pd.NA, index=frame.index, dtype='string')
+
+    return frame.replace('', pd.NA)
+
+
+def validate_import_frame(frame: pd.DataFrame, row_offset: int = 2,
+                          require_deadline: bool = True) -> Tuple[pd.DataFrame, List[Dict]]:
+    """Split a normalized frame into valid rows and invalid row reports.
+
+    Args:
+        frame: Output of normalize_import_frame
+        row_offset: Added to the positional index to give the spreadsheet
+                    row number used in the report (2 = header on row 1)
+        require_deadline: If False, rows without a deadline are kept (the
+                          caller fills them in, e.g. from the API)
+
+    Returns:
+        Tuple of (valid rows, list of {'row', 'Company_Number', 'Company_Name',
+        'reason'} dicts)
+    """
+    reasons = pd.Series(pd.NA, index=frame.index, dtype='string')
+    if require_deadline:
+        reasons = reasons.mask(frame['Filing_Deadline'].isna(), 'No deadline available')
+    reasons = reasons.mask(frame['Company_Name'].isna(), 'Missing company name')
+    reasons = reasons.mask(~valid_company_numbers(frame['Company_Number']), INVALID_NUMBER_REASON)
+    reasons = reasons.mask(frame['Company_Number'].isna(), 'Missing company number')
+
+    invalid_mask = reasons.notna()
+    invalid_rows = [
+        {
+            'row': int(idx) + row_offset,
+            'Company_Number': None if pd.isna(number) else str(number),
+            'Company_Name': None if pd.isna(name) else str(name),
+            'reason': str(reason),
+        }
+        for idx, number, name, reason in zip(
+            frame.index[invalid_mask],
+            frame.loc[invalid_mask, 'Company_Number'],
+            frame.loc[invalid_mask, 'Company_Name'],
+            reasons[invalid_mask],
+        )
+    ]
+
+    return frame.loc[~invalid_mask, IMPORT_COLUMNS], invalid_rows
+
+
+def calamine_available() -> bool:
+    """Check whether the optional python-calamine reader is installed."""
+    try:
+        import python_calamine  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _batch_rows(header: List, rows: Iterator, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Group an iterator of row tuples into DataFrames of chunk_size rows."""
+    columns = [str(col).strip() if col is not None else '' for col in header]
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            return
+        yield pd.DataFrame(batch, columns=columns, dtype=object)
+
+
+def iter_csv_chunks(csv_path: Union[str, Path], chunk_size: int = IMPORT_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+    """Read a CSV file in fixed-size chunks.
+
+    All columns are read as text so company numbers keep their leading zeros.
+
+    Args:
+        csv_path: Path to the CSV file
+        chunk_size: Rows per chunk
+
+    Yields:
+        DataFrame chunks with normalized column names
+    """
+    with pd.read_csv(csv_path, chunksize=chunk_size, dtype=str, keep_default_na=False) as reader:
+        for chunk in reader:
+            yield normalize_columns(chunk)
+
+
+def iter_parquet_chunks(parquet_path: Union[str, Path], chunk_size: int = IMPORT_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+    """Read a Parquet file one row group at a time.
+
+    Requires pyarrow. Row groups larger than chunk_size are split further.
+
+    Args:
+        parquet_path: Path to the Parquet file
+        chunk_size: Maximum rows per chunk
+
+    Yields:
+        DataFrame chunks with normalized column names
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet import requires pyarrow. Install it with: pip install pyarrow")
+
+    parquet_file = pq.ParquetFile(parquet_path)
+    for group in range(parquet_file.num_row_groups):
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, row_groups=[group]):
+            yield normalize_columns(batch.to_pandas())
+
+
+def iter_excel_chunks(excel_path: Union[str, Path], chunk_size: int = IMPORT_BATCH_SIZE,
+                      engine: str = 'auto', sheet_name: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """Stream an Excel sheet in fixed-size chunks without loading the workbook.
+
+    Args:
+        excel_path: Path to the .xlsx file
+        chunk_size: Rows per chunk
+        engine: 'calamine' (python-calamine), 'openpyxl' (read-only mode)
+                or 'auto' to use calamine when it is installed
+        sheet_name: Sheet to read; defaults to the first sheet
+
+    Yields:
+        DataFrame chunks with normalized column names
+    """
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"Invalid engine. Must be one of: {EXCEL_ENGINES}")
+    if engine == 'auto':
+        engine = 'calamine' if calamine_available() else 'openpyxl'
+
+    if engine == 'calamine':
+        from python_calamine import CalamineWorkbook
+
+        workbook = CalamineWorkbook.from_path(str(excel_path))
+        try:
+            if sheet_name is None:
+                sheet = workbook.get_sheet_by_index(0)
+            else:
+                sheet = workbook.get_sheet_by_name(sheet_name)
+            rows = iter(sheet.iter_rows())
+            header = next(rows, None)
+            if header is None:
+                return
+            yield from _batch_rows(header, rows, chunk_size)
+        finally:
+            workbook.close()
+    else:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(excel_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook.worksheets[0] if sheet_name is None else workbook[sheet_name]
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            yield from _batch_rows(header, rows, chunk_size)
+        finally:
+            workbook.close()
+
+
+def iter_file_chunks(file_path: Union[str, Path], chunk_size: int = IMPORT_BATCH_SIZE,
+                     sheet_name: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """Stream a CSV, Parquet or Excel file in fixed-size chunks.
+
+    Args:
+        file_path: Path to a .csv, .parquet or .xlsx file
+        chunk_size: Rows per chunk
+        sheet_name: Excel sheet to read; defaults to the first sheet
+
+    Yields:
+        DataFrame chunks with normalized column names
+    """
+    suffix = Path(file_path).suffix.lower()
+    if suffix == '.csv':
+        return iter_csv_chunks(file_path, chunk_size)
+    if suffix in ('.parquet', '.pq'):
+        return iter_parquet_chunks(file_path, chunk_size)
+    if suffix in ('.xlsx', '.xlsm'):
+        return iter_excel_chunks(file_path, chunk_size, sheet_name=sheet_name)
+    raise ValueError(f"Unsupported import file type: {suffix}")
+
+
+def list_sheet_names(excel_path: Union[str, Path]) -> List[str]:
+    """List the sheets of a workbook without reading their contents.
+
+    Args:
+        excel_path: Path to the .xlsx file
+
+    Returns:
+        Sheet names in workbook order
+    """
+    if calamine_available():
+        from python_calamine import CalamineWorkbook
+
+        workbook = CalamineWorkbook.from_path(str(excel_path))
+        try:
+            return list(workbook.sheet_names)
+        finally:
+            workbook.close()
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(excel_path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def expand_import_sources(sources: List[Union[str, Path, Tuple]]) -> List[Tuple[str, Optional[str]]]:
+    """Expand import sources into one (path, sheet) entry per sheet or file.
+
+    Args:
+        sources: File paths, or (path, sheet_name) tuples. A bare workbook
+                 path expands to every sheet in the workbook.
+
+    Returns:
+        List of (path, sheet_name) tuples; sheet_name is None for CSV/Parquet
+    """
+    expanded = []
+    for source in sources:
+        if isinstance(source, tuple):
+            path, sheet_name = source
+            expanded.append((str(path), sheet_name))
+        elif Path(source).suffix.lower() in ('.xlsx', '.xlsm'):
+            expanded.extend((str(source), sheet) for sheet in list_sheet_names(source))
+        else:
+            expanded.append((str(source), None))
+    return expanded
+
+
+def parse_import_source(source: Tuple[str, Optional[str]], require_deadline: bool = True) -> Dict:
+    """Read, normalize and validate one file or sheet.
+
+    Runs in a worker process during parallel imports, so it takes and returns
+    only picklable values and never touches the database.
+
+    Args:
+        source: (path, sheet_name) tuple from expand_import_sources
+        require_deadline: If False, the Filing_Deadline column and values are optional
+
+    Returns:
+        Dictionary with 'source' label, 'total' rows, 'valid' DataFrame and
+        'invalid_rows' list
+    """
+    path, sheet_name = source
+    label = f"{Path(path).name}:{sheet_name}" if sheet_name else Path(path).name
+
+    chunks = list(iter_file_chunks(path, sheet_name=sheet_name))
+    if not chunks:
+        return {'source': label, 'total': 0, 'valid': pd.DataFrame(columns=IMPORT_COLUMNS), 'invalid_rows': []}
+    df = pd.concat(chunks, ignore_index=True)
+
+    required_columns = IMPORT_COLUMNS if require_deadline else ['Company_Number', 'Company_Name']
+    missing_columns = [col for col in required_columns if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"{label}: Missing required columns: {missing_columns}")
+
+    frame = normalize_import_frame(df)
+    valid, invalid_rows = validate_import_frame(frame, require_deadline=require_deadline)
+    for invalid in invalid_rows:
+        invalid['source'] = label
+
+    return {'source': label, 'total': len(frame), 'valid': valid, 'invalid_rows': invalid_rows}
+
+
+def file_content_hash(file_path: Union[str, Path], block_size: int = 1 << 20) -> str:
+    """Compute the SHA-256 of a file without reading it into memory at once.
+
+    Args:
+        file_path: Path to the file
+        block_size: Bytes read per block
+
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as handle:
+        for block in iter(lambda: handle.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,469 @@
+"""
+Schema migrations for Company Accounts Dashboard.
+Each migration has a version number and the database records the last one
+applied in PRAGMA user_version, so start-up only runs the migrations it has
+not seen yet. Schema changes roll out in place instead of deleting
+client_data.db and re-importing.
+
+Several processes (the Streamlit server, the KPI endpoint, the import
+watcher) may open the same database at once, so pending migrations run
+while holding an exclusive lock on a sidecar "<database>.migrate-lock"
+file, and each one re-checks the version inside its own write transaction.
+Ordinary migrations run in
+one transaction together with the version bump. Migrations that rebuild a
+large table also get a prepare step that copies rows in small committed
+batches first, so readers (and in WAL mode, the dashboard) are not blocked
+while the copy runs; only the final catch-up and table swap hold the write
+lock.
+"""
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, NamedTuple, Optional
+
+import pandas as pd
+
+from api.company_numbers import normalize_company_numbers, valid_company_numbers
+
+from .schema import (
+    COMPANIES_COLUMNS_SQL,
+    COMPANY_SELECT,
+    STATUSES,
+    create_change_triggers,
+    create_schema,
+    create_status_table,
+)
+
+MIGRATION_BATCH_SIZE = 5000
+
+# Seconds a process waits for another one to finish migrating the same database
+MIGRATION_LOCK_TIMEOUT = 600
+
+
+class Migration(NamedTuple):
+    """A numbered schema change.
+
+    apply(conn, prepared) runs inside a write transaction that also records
+    the new version. The optional prepare(conn) runs beforehand in autocommit
+    mode for slow batched work; its return value is passed to apply.
+    """
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection, Any], None]
+    prepare: Optional[Callable[[sqlite3.Connection], Any]] = None
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Get the last migration version applied to a database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def copy_in_batches(conn: sqlite3.Connection, source: str, copy_sql: str,
+                    batch_size: int = MIGRATION_BATCH_SIZE) -> int:
+    """Copy a table in rowid order, committing after every batch.
+
+    Each batch is its own short write transaction, so other connections can
+    keep reading and writing between batches. Rows added to the source while
+    the copy runs are picked up as long as they get a higher rowid; changes to
+    rows already copied must be caught up by the caller.
+
+    Args:
+        conn: Connection in autocommit mode (isolation_level None)
+        source: Table being copied (must be a rowid table)
+        copy_sql: INSERT ... SELECT statement reading from source, restricted
+                  to "rowid > ? AND rowid <= ?"
+        batch_size: Rows copied per transaction
+
+    Returns:
+        Number of rows copied
+    """
+    copied = 0
+    last_rowid = 0
+    while True:
+        upper = conn.execute(
+            f"SELECT MAX(rowid) FROM (SELECT rowid FROM {source} WHERE rowid > ? ORDER BY rowid LIMIT ?)",
+            (last_rowid, batch_size)
+        ).fetchone()[0]
+        if upper is None:
+            return copied
+        copied += conn.execute(copy_sql, (last_rowid, upper)).rowcount
+        last_rowid = upper
+
+
+@contextmanager
+def migration_lock(conn: sqlite3.Connection, timeout: float = MIGRATION_LOCK_TIMEOUT) -> Iterator[None]:
+    """Hold the cross-process lock for migrating conn's database.
+
+    The lock is an exclusive transaction on a sidecar database next to the
+    main one, so it works across processes and is released by the operating
+    system if the holder dies. In-memory databases need no lock.
+
+    Raises:
+        sqlite3.OperationalError: If another process holds the lock for longer than timeout
+    """
+    path = next((row[2] for row in conn.execute("PRAGMA database_list") if row[1] == 'main'), '')
+    if not path:
+        yield
+        return
+
+    lock = sqlite3.connect(f"{path}.migrate-lock", timeout=timeout, isolation_level=None)
+    try:
+        lock.execute("BEGIN EXCLUSIVE")
+        yield
+    finally:
+        lock.close()
+
+
+def _companies_is_legacy(conn: sqlite3.Connection) -> bool:
+    """Check for a companies table from before compact typed storage."""
+    columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(companies)")}
+    return bool(columns) and columns.get('Filing_Deadline', '').upper() != 'INTEGER'
+
+
+def _current_change_version(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'company_changes'").fetchone()
+    return row[0] if row else 0
+
+
+def _create_base_tables(conn: sqlite3.Connection, prepared: Any):
+    """Migration 1: bookkeeping tables, the change log and the companies schema.
+
+    Every statement is idempotent so databases created before migrations
+    were tracked pass through unchanged.
+    """
+    # Content hash of the last import from each source file
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS import_history (
+            Source_Path TEXT PRIMARY KEY,
+            Content_Hash TEXT NOT NULL,
+            Imported_At TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Malformed company numbers kept out of the table and away from the API
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS company_quarantine (
+            Company_Number TEXT PRIMARY KEY,
+            Company_Name TEXT,
+            Reason TEXT NOT NULL,
+            Source TEXT,
+            Detected_At TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Change-data-capture log; Version increases with every change
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS company_changes (
+            Version INTEGER PRIMARY KEY AUTOINCREMENT,
+            Company_Number TEXT NOT NULL,
+            Operation TEXT NOT NULL CHECK (Operation IN ('insert', 'update', 'delete')),
+            Changed_At TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # A text-typed companies table is left for migration 2 to convert
+    if _companies_is_legacy(conn):
+        create_status_table(conn)
+    else:
+        create_schema(conn)
+    # Triggers also go on a legacy table so migration 2 can catch up on writes made during its copy
+    create_change_triggers(conn)
+
+
+# Converts a text-typed companies row: ISO date to day number (NULL if it is not
+# a real date; julianday() rolls 2026-02-30 over to March) and label to status code (matched ignoring case and stray spaces)
+LEGACY_COMPANIES_COPY_SQL = """
+    INSERT INTO companies_new
+    (Company_Number, Company_Name, Filing_Deadline, Internal_Status, Accounts_Filed_CH, Last_Updated)
+    SELECT l.Company_Number,
+           l.Company_Name,
+           CASE WHEN date(julianday(l.Filing_Deadline)) = substr(l.Filing_Deadline, 1, 10)
+                THEN CAST(julianday(date(l.Filing_Deadline)) - 2440587.5 AS INTEGER) END,
+           CASE WHEN l.Internal_Status IS NULL THEN 0 ELSE s.Code END,
+           CASE WHEN l.Accounts_Filed_CH THEN 1 ELSE 0 END,
+           l.Last_Updated
+    FROM companies l
+    LEFT JOIN statuses s ON s.Label = TRIM(l.Internal_Status) COLLATE NOCASE
+    WHERE {condition}
+"""
+
+# Plain copy of a typed companies table, for rebuilds that only change constraints
+TYPED_COMPANIES_COPY_SQL = """
+    INSERT INTO companies_new
+    (Company_Number, Company_Name, Filing_Deadline, Internal_Status, Accounts_Filed_CH, Last_Updated)
+    SELECT l.Company_Number, l.Company_Name, l.Filing_Deadline, l.Internal_Status,
+           l.Accounts_Filed_CH, l.Last_Updated
+    FROM companies l
+    WHERE {condition}
+"""
+
+
+def _check_legacy_statuses(conn: sqlite3.Connection):
+    """Refuse to convert statuses that have no code.
+
+    Raises:
+        sqlite3.IntegrityError: Listing each unknown status and how many companies have it
+    """
+    unknown = conn.execute("""
+        SELECT l.Internal_Status, COUNT(*)
+        FROM companies l
+        LEFT JOIN statuses s ON s.Label = TRIM(l.Internal_Status) COLLATE NOCASE
+        WHERE l.Internal_Status IS NOT NULL AND s.Code IS NULL
+        GROUP BY l.Internal_Status
+        ORDER BY l.Internal_Status
+    """).fetchall()
+    if unknown:
+        found = ", ".join(f"{status!r} ({count} companies)" for status, count in unknown)
+        raise sqlite3.IntegrityError(
+            f"Cannot convert companies: unknown Internal_Status values {found}. "
+            f"Change them to one of {STATUSES} and restart; nothing has been modified"
+        )
+
+
+def _copy_companies(conn: sqlite3.Connection, copy_sql: str) -> int:
+    """Copy companies into a fresh companies_new in batches.
+
+    Returns:
+        Change-log version at the start of the copy, for _swap_companies
+    """
+    # Leftover from an interrupted run; the copy simply starts again
+    conn.execute("DROP TABLE IF EXISTS companies_new")
+    conn.execute(f"CREATE TABLE companies_new ({COMPANIES_COLUMNS_SQL})")
+
+    start_version = _current_change_version(conn)
+    copied = copy_in_batches(conn, 'companies', copy_sql.format(condition="l.rowid > ? AND l.rowid <= ?"))
+    print(f"[INFO] Copied {copied} companies to the new table")
+    return start_version
+
+
+def _swap_companies(conn: sqlite3.Connection, copy_sql: str, start_version: int):
+    """Catch up on rows changed during the copy, then replace companies with companies_new.
+
+    Runs inside the migration's write transaction. Dropping the old table
+    also drops its indexes and triggers; the triggers and view are
+    recreated here, indexes are left to the caller.
+
+    Raises:
+        sqlite3.IntegrityError: If companies_new does not hold every company,
+                                e.g. because the copy was cut short
+    """
+    changed = "SELECT Company_Number FROM company_changes WHERE Version > ?"
+    conn.execute(f"DELETE FROM companies_new WHERE Company_Number IN ({changed})", (start_version,))
+    conn.execute(copy_sql.format(condition=f"l.Company_Number IN ({changed})"), (start_version,))
+
+    # Never swap in a partial copy, e.g. one another process was still rebuilding
+    expected = conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+    copied = conn.execute("SELECT COUNT(*) FROM companies_new").fetchone()[0]
+    if copied != expected:
+        raise sqlite3.IntegrityError(
+            f"companies_new has {copied} rows but there are {expected} companies; "
+            "the old table is left in place"
+        )
+
+    conn.execute("DROP VIEW IF EXISTS company_details")
+    conn.execute("DROP TABLE companies")
+    conn.execute("ALTER TABLE companies_new RENAME TO companies")
+    conn.execute(f"CREATE VIEW company_details AS {COMPANY_SELECT}")
+    create_change_triggers(conn)
+
+
+def _prepare_typed_companies(conn: sqlite3.Connection) -> Optional[int]:
+    """Copy a legacy companies table into companies_new in batches.
+
+    Returns:
+        Change-log version at the start of the copy, or None if there is
+        nothing to convert
+
+    Raises:
+        sqlite3.IntegrityError: If a status has no code (see _check_legacy_statuses)
+    """
+    if not _companies_is_legacy(conn):
+        return None
+    _check_legacy_statuses(conn)
+    return _copy_companies(conn, LEGACY_COMPANIES_COPY_SQL)
+
+
+def _swap_typed_companies(conn: sqlite3.Connection, start_version: Optional[int]):
+    """Migration 2: replace a text-typed companies table with the compact one.
+
+    Every company is kept with its status. Deadlines that cannot be parsed
+    become NULL for the next API sync to fill in; a status with no code
+    aborts the migration instead of being guessed.
+    """
+    # Another process may have converted the table since prepare ran
+    if start_version is None or not _companies_is_legacy(conn):
+        return
+    # Statuses written while the copy ran are checked again under the write lock
+    _check_legacy_statuses(conn)
+    _swap_companies(conn, LEGACY_COMPANIES_COPY_SQL, start_version)
+
+
+def _index_filing_deadline(conn: sqlite3.Connection, prepared: Any):
+    """Migration 3: index the column every company listing is ordered by."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_companies_deadline ON companies (Filing_Deadline)")
+
+
+def _index_list_sorts(conn: sqlite3.Connection, prepared: Any):
+    """Migration 4: index the other columns the paginated list sorts on."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_companies_name ON companies (Company_Name COLLATE NOCASE)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_companies_status ON companies (Internal_Status, Filing_Deadline)")
+
+
+def _create_sync_state(conn: sqlite3.Connection, prepared: Any):
+    """Migration 5: shared state for background syncs (see SyncCoordinator)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sync_state (
+            Name TEXT PRIMARY KEY,
+            Lease_Owner TEXT,
+            Lease_Expires TIMESTAMP,
+            Last_Started TIMESTAMP,
+            Last_Finished TIMESTAMP,
+            Last_Status TEXT CHECK (Last_Status IN ('success', 'failed')),
+            Last_Error TEXT,
+            Companies_Checked INTEGER,
+            Companies_Updated INTEGER
+        )
+    """)
+
+
+def _deadline_required(conn: sqlite3.Connection) -> bool:
+    """Check for a companies table whose Filing_Deadline is still NOT NULL."""
+    return any(row[1] == 'Filing_Deadline' and row[3] for row in conn.execute("PRAGMA table_info(companies)"))
+
+
+def _prepare_optional_deadline(conn: sqlite3.Connection) -> Optional[int]:
+    """Copy a companies table that requires deadlines into companies_new in batches."""
+    if not _deadline_required(conn):
+        return None
+    return _copy_companies(conn, TYPED_COMPANIES_COPY_SQL)
+
+
+def _allow_missing_deadlines(conn: sqlite3.Connection, start_version: Optional[int]):
+    """Migration 6: let Filing_Deadline be NULL, as migration 2 now leaves unparseable ones.
+
+    SQLite cannot drop a NOT NULL constraint in place, so the table is
+    rebuilt and its indexes recreated.
+    """
+    if start_version is None or not _deadline_required(conn):
+        return
+    _swap_companies(conn, TYPED_COMPANIES_COPY_SQL, start_version)
+    _index_filing_deadline(conn, None)
+    _index_list_sorts(conn, None)
+
+
+def _normalize_stored_numbers(conn: sqlite3.Connection, prepared: Any):
+    """Migration 7: store company numbers in the form imports now produce.
+
+    Numbers imported before normalization (1234567 from a numeric Excel
+    cell) are rewritten to their normalized form (01234567). Where a later
+    import already added the normalized number, the two rows are merged:
+    the workflow status kept on the old row wins, the name and deadline
+    come from the newer row, and the old row is deleted. Numbers that are
+    invalid even once normalized are left for the deadline sync to
+    quarantine.
+    """
+    stored = pd.read_sql_query("SELECT Company_Number FROM companies ORDER BY Last_Updated, rowid", conn)
+    normalized = normalize_company_numbers(stored['Company_Number'])
+    changed = valid_company_numbers(normalized) & (normalized != stored['Company_Number']).fillna(False)
+
+    renamed = merged = 0
+    # Oldest first, so when several old numbers share a normalized one the most recently updated status wins
+    for old, new in zip(stored.loc[changed, 'Company_Number'], normalized[changed]):
+        if conn.execute("SELECT 1 FROM companies WHERE Company_Number = ?", (new,)).fetchone() is None:
+            conn.execute("UPDATE companies SET Company_Number = ? WHERE Company_Number = ?", (new, old))
+            renamed += 1
+            continue
+
+        conn.execute("""
+            UPDATE companies SET
+                Internal_Status = (SELECT Internal_Status FROM companies WHERE Company_Number = :old),
+                Accounts_Filed_CH = MAX(Accounts_Filed_CH,
+                                        (SELECT Accounts_Filed_CH FROM companies WHERE Company_Number = :old)),
+                Filing_Deadline = COALESCE(Filing_Deadline,
+                                           (SELECT Filing_Deadline FROM companies WHERE Company_Number = :old))
+            WHERE Company_Number = :new
+        """, {'old': old, 'new': new})
+        conn.execute("DELETE FROM companies WHERE Company_Number = ?", (old,))
+        merged += 1
+
+    if renamed or merged:
+        print(f"[INFO] Normalized {renamed} company numbers and merged {merged} duplicates")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Create base tables and change log", _create_base_tables),
+    Migration(2, "Convert companies to compact typed storage", _swap_typed_companies,
+              prepare=_prepare_typed_companies),
+    Migration(3, "Index companies by filing deadline", _index_filing_deadline),
+    Migration(4, "Index companies by name and status", _index_list_sorts),
+    Migration(5, "Create sync state table", _create_sync_state),
+    Migration(6, "Allow companies without a filing deadline", _allow_missing_deadlines,
+              prepare=_prepare_optional_deadline),
+    Migration(7, "Normalize stored company numbers", _normalize_stored_numbers),
+]
+
+
+def run_migrations(conn: sqlite3.Connection, migrations: Optional[List[Migration]] = None) -> List[int]:
+    """Apply every migration newer than the database's user_version.
+
+    Also switches the database to WAL journaling so readers are not blocked
+    by the batched copies (or by imports later on). If migrations are
+    pending, waits for any other process migrating the same database to
+    finish (see migration_lock) and skips whatever it already applied.
+
+    Args:
+        conn: Connection to migrate; it is left in autocommit mode
+        migrations: Migrations to apply (defaults to MIGRATIONS)
+
+    Returns:
+        Versions applied, in order
+
+    Raises:
+        sqlite3.Error: If a migration fails; its transaction is rolled back
+                       and later migrations are not attempted
+    """
+    conn.isolation_level = None
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            Version INTEGER PRIMARY KEY,
+            Description TEXT NOT NULL,
+            Applied_At TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    pending = [
+        migration for migration in sorted(migrations or MIGRATIONS, key=lambda m: m.version)
+        if migration.version > get_schema_version(conn)
+    ]
+    if not pending:
+        return []
+
+    applied = []
+    with migration_lock(conn):
+        for migration in pending:
+            # Another process may have applied it while this one waited for the lock
+            if get_schema_version(conn) >= migration.version:
+                continue
+
+            print(f"[INFO] Applying migration {migration.version}: {migration.description}")
+            prepared = migration.prepare(conn) if migration.prepare else None
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-read under the write lock in case a process without the lock got here first
+                if get_schema_version(conn) >= migration.version:
+                    conn.execute("ROLLBACK")
+                    continue
+                migration.apply(conn, prepared)
+                conn.execute(
+                    "INSERT OR REPLACE INTO schema_migrations (Version, Description) VALUES (?, ?)",
+                    (migration.version, migration.description)
+                )
+                conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            applied.append(migration.version)
+
+    return applied
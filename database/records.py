@@ -0,0 +1,43 @@
+"""
+Lightweight company records for Company Accounts Dashboard.
+Rows are returned as named tuples built straight from the cursor, for
+callers that only iterate companies or need a column of values and have no
+use for a DataFrame.
+"""
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+
+class Company(NamedTuple):
+    """One company in the public column format (decoded deadline and status label).
+
+    Tuple-backed, so records are immutable, cheap to build and safe to share
+    between callers through the read cache.
+    """
+    Company_Number: str
+    Company_Name: str
+    Filing_Deadline: str
+    Internal_Status: str
+    Accounts_Filed_CH: int
+    Last_Updated: Optional[str]
+
+
+COMPANY_FIELDS = Company._fields
+
+
+def company_row_factory(cursor, row: tuple) -> Company:
+    """sqlite3 row factory building Company records from COMPANY_SELECT rows."""
+    return Company._make(row)
+
+
+def records_to_columns(records: Sequence[Company], fields: Sequence[str] = COMPANY_FIELDS) -> Dict[str, List]:
+    """Transpose records into one list per field.
+
+    Args:
+        records: Company records
+        fields: Fields to extract (defaults to all)
+
+    Returns:
+        Dictionary mapping each field name to its list of values
+    """
+    indexes = [COMPANY_FIELDS.index(field) for field in fields]
+    return {field: [record[idx] for record in records] for field, idx in zip(fields, indexes)}
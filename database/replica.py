@@ -0,0 +1,111 @@
+"""
+In-memory read replica for Company Accounts Dashboard.
+Keeps a copy of the database in memory, refreshed with SQLite's backup
+API, so dashboard reads do not touch the disk or wait on sync and import
+writers. Staleness is bounded: writes made through the same
+DatabaseManager are visible on the next read, writes from other processes
+within the refresh interval.
+"""
+import itertools
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+_replica_ids = itertools.count(1)
+
+
+class ReadReplica:
+    """A shared-cache in-memory copy of a database file.
+
+    Every refresh backs the file up into a brand new in-memory database
+    and then switches new readers over to it. Readers still using the
+    previous copy are never blocked or interrupted; it is freed when the
+    last of them closes.
+    """
+
+    def __init__(self, db_path: str, refresh_interval: float = 5.0):
+        """Initialize the replica.
+
+        Args:
+            db_path: Database file to copy
+            refresh_interval: Maximum seconds the replica may lag behind
+                              writes made by other connections
+        """
+        self.db_path = db_path
+        self.refresh_interval = refresh_interval
+        self.source_version = None
+        self.refreshed_at = 0.0
+        self.refreshes = 0
+        self._uri = None
+        self._anchor: Optional[sqlite3.Connection] = None
+        self._dirty = True
+        self._lock = threading.Lock()
+
+    def mark_dirty(self):
+        """Note a write made through the owning manager; the next read refreshes."""
+        self._dirty = True
+
+    def sync(self, data_version: int) -> int:
+        """Refresh the replica if the database has changed and a refresh is due.
+
+        Args:
+            data_version: Current data version of the database file
+
+        Returns:
+            Data version the replica now reflects
+        """
+        with self._lock:
+            if self._anchor is None or (
+                data_version != self.source_version
+                and (self._dirty or time.monotonic() - self.refreshed_at >= self.refresh_interval)
+            ):
+                self._refresh(data_version)
+            return self.source_version
+
+    def _refresh(self, data_version: int):
+        """Copy the database file into a new in-memory database and switch to it."""
+        uri = f"file:company_replica_{next(_replica_ids)}?mode=memory&cache=shared"
+        anchor = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        # Cleared before the copy so a write landing during it triggers another refresh
+        self._dirty = False
+        source = sqlite3.connect(self.db_path)
+        try:
+            source.backup(anchor)
+        finally:
+            source.close()
+
+        previous = self._anchor
+        self._uri, self._anchor = uri, anchor
+        self.source_version = data_version
+        self.refreshed_at = time.monotonic()
+        self.refreshes += 1
+        if previous is not None:
+            previous.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Open a read-only connection to the current copy.
+
+        Yields:
+            Connection with sqlite3.Row rows, closed on exit
+        """
+        # Connect under the lock so a concurrent refresh cannot free this copy first
+        with self._lock:
+            conn = sqlite3.connect(self._uri, uri=True)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = ON")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def close(self):
+        """Release the in-memory copy."""
+        with self._lock:
+            if self._anchor is not None:
+                self._anchor.close()
+            self._anchor = None
+            self._uri = None
+            self.source_version = None
@@ -0,0 +1,201 @@
+"""
+Storage schema for Company Accounts Dashboard.
+Filing deadlines are stored as integer day numbers (days since 1970-01-01)
+and internal statuses as small integer codes. These helpers convert between
+the stored values and the YYYY-MM-DD strings and status labels used by the
+rest of the application.
+"""
+import pandas as pd
+from datetime import date
+from typing import Optional
+
+# Internal statuses in workflow order; the list index is the stored code
+STATUSES = [
+    'Not Started',
+    'Started',
+    'Sent to Client',
+    'Missing Information',
+    'Ready to Submit'
+]
+
+STATUS_CODES = {label: code for code, label in enumerate(STATUSES)}
+
+EPOCH = date(1970, 1, 1)
+
+# Column definitions shared by the companies table and migration copies of it.
+# Filing_Deadline is NULL only for rows carried over without a usable deadline;
+# the next API sync fills it in.
+COMPANIES_COLUMNS_SQL = f"""
+        Company_Number TEXT PRIMARY KEY,
+        Company_Name TEXT NOT NULL,
+        Filing_Deadline INTEGER CHECK (Filing_Deadline IS NULL OR typeof(Filing_Deadline) = 'integer'),
+        Internal_Status INTEGER NOT NULL DEFAULT 0 REFERENCES statuses(Code)
+            CHECK (Internal_Status BETWEEN 0 AND {len(STATUSES) - 1}),
+        Accounts_Filed_CH INTEGER NOT NULL DEFAULT 0 CHECK (Accounts_Filed_CH IN (0, 1)),
+        Last_Updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+"""
+
+COMPANIES_TABLE_SQL = f"CREATE TABLE IF NOT EXISTS companies ({COMPANIES_COLUMNS_SQL})"
+
+# Decodes stored values back to the public column formats
+COMPANY_SELECT = """
+    SELECT c.Company_Number,
+           c.Company_Name,
+           date(c.Filing_Deadline * 86400, 'unixepoch') AS Filing_Deadline,
+           s.Label AS Internal_Status,
+           c.Accounts_Filed_CH,
+           c.Last_Updated
+    FROM companies c
+    JOIN statuses s ON s.Code = c.Internal_Status
+"""
+
+# Stored values as they are, for decode_companies_frame
+STORED_COMPANY_SELECT = """
+    SELECT c.Company_Number,
+           c.Company_Name,
+           c.Filing_Deadline,
+           c.Internal_Status,
+           c.Accounts_Filed_CH,
+           c.Last_Updated
+    FROM companies c
+"""
+
+# Sortable columns of the paginated company list and their ORDER BY expressions
+COMPANY_SORT_COLUMNS = {
+    'Filing_Deadline': 'c.Filing_Deadline',
+    'Company_Name': 'c.Company_Name COLLATE NOCASE',
+    'Internal_Status': 'c.Internal_Status',
+}
+
+
+def _string_dtype():
+    """Arrow-backed strings when pyarrow is installed, pandas' own strings otherwise."""
+    try:
+        import pyarrow  # noqa: F401
+        return pd.StringDtype('pyarrow')
+    except ImportError:
+        return pd.StringDtype('python')
+
+
+def decode_companies_frame(stored: pd.DataFrame) -> pd.DataFrame:
+    """Convert stored company columns to compact, typed pandas columns.
+
+    Filing_Deadline becomes datetime64, Internal_Status a categorical over
+    STATUSES (in workflow order), Accounts_Filed_CH bool, Last_Updated
+    datetime64 and the text columns Arrow-backed strings.
+
+    Args:
+        stored: Rows from STORED_COMPANY_SELECT (day numbers and status codes)
+
+    Returns:
+        Typed DataFrame with the public company columns
+    """
+    strings = _string_dtype()
+    days = pd.to_numeric(stored['Filing_Deadline'], errors='coerce')
+    codes = pd.to_numeric(stored['Internal_Status'], errors='coerce').fillna(-1).astype('int8')
+    return pd.DataFrame({
+        'Company_Number': stored['Company_Number'].astype(strings),
+        'Company_Name': stored['Company_Name'].astype(strings),
+        'Filing_Deadline': pd.Timestamp(EPOCH) + pd.to_timedelta(days, unit='D'),
+        'Internal_Status': pd.Categorical.from_codes(codes, categories=STATUSES),
+        'Accounts_Filed_CH': stored['Accounts_Filed_CH'].fillna(0).astype(bool),
+        'Last_Updated': pd.to_datetime(stored['Last_Updated'], errors='coerce'),
+    }, index=stored.index)
+
+
+def deadline_to_day(deadline: str) -> int:
+    """Convert a YYYY-MM-DD deadline to its stored day number.
+
+    Args:
+        deadline: Deadline as an ISO date string
+
+    Returns:
+        Days since 1970-01-01
+
+    Raises:
+        ValueError: If the deadline is not a valid ISO date
+    """
+    return date.fromisoformat(str(deadline)[:10]).toordinal() - EPOCH.toordinal()
+
+
+def deadlines_to_days(deadlines: pd.Series) -> pd.Series:
+    """Convert a column of YYYY-MM-DD deadlines to day numbers in one pass.
+
+    Args:
+        deadlines: ISO date strings (NA allowed)
+
+    Returns:
+        Nullable Int64 Series of days since 1970-01-01
+    """
+    parsed = pd.to_datetime(deadlines, format='%Y-%m-%d', errors='coerce')
+    return ((parsed - pd.Timestamp(EPOCH)).dt.days).astype('Int64')
+
+
+def status_code(label: str) -> Optional[int]:
+    """Get the stored code for a status label, or None if it is not valid."""
+    return STATUS_CODES.get(label)
+
+
+def create_status_table(cursor):
+    """Create and seed the status lookup table.
+
+    Args:
+        cursor: Cursor on the connection creating the schema
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS statuses (
+            Code INTEGER PRIMARY KEY,
+            Label TEXT NOT NULL UNIQUE
+        )
+    """)
+    cursor.executemany(
+        "INSERT OR IGNORE INTO statuses (Code, Label) VALUES (?, ?)",
+        list(enumerate(STATUSES))
+    )
+
+
+def create_schema(cursor):
+    """Create the status lookup table, companies table and decoding view.
+
+    Args:
+        cursor: Cursor on the connection creating the schema
+    """
+    create_status_table(cursor)
+    cursor.execute(COMPANIES_TABLE_SQL)
+    cursor.execute(f"CREATE VIEW IF NOT EXISTS company_details AS {COMPANY_SELECT}")
+
+
+def create_change_triggers(cursor):
+    """Create the triggers that fill company_changes from the companies table.
+
+    Updates are only logged when a company's data actually changes, so
+    rewriting an unchanged deadline does not invalidate readers.
+
+    Args:
+        cursor: Cursor on the connection creating the schema
+    """
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS companies_log_insert AFTER INSERT ON companies
+        BEGIN
+            INSERT INTO company_changes (Company_Number, Operation) VALUES (NEW.Company_Number, 'insert');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS companies_log_update AFTER UPDATE ON companies
+        WHEN OLD.Company_Number IS NOT NEW.Company_Number
+            OR OLD.Company_Name IS NOT NEW.Company_Name
+            OR OLD.Filing_Deadline IS NOT NEW.Filing_Deadline
+            OR OLD.Internal_Status IS NOT NEW.Internal_Status
+            OR OLD.Accounts_Filed_CH IS NOT NEW.Accounts_Filed_CH
+        BEGIN
+            INSERT INTO company_changes (Company_Number, Operation)
+            SELECT OLD.Company_Number, 'delete' WHERE OLD.Company_Number IS NOT NEW.Company_Number;
+            INSERT INTO company_changes (Company_Number, Operation) VALUES (NEW.Company_Number, 'update');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS companies_log_delete AFTER DELETE ON companies
+        BEGIN
+            INSERT INTO company_changes (Company_Number, Operation) VALUES (OLD.Company_Number, 'delete');
+        END
+    """)
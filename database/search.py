@@ -0,0 +1,114 @@
+"""
+Incremental company search for Company Accounts Dashboard.
+Search-as-you-type sends a new query for every keystroke, and each one
+usually extends the last. Results are cached per search term and database
+version, and a term that contains an already cached term is answered by
+filtering that term's (smaller) result in memory instead of scanning the
+companies table again.
+"""
+import string
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+# SQLite's built-in LIKE only folds the case of ASCII letters; match it exactly
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Appended to LIKE so '%' and '_' typed by the user match literally
+LIKE_ESCAPE = "ESCAPE '\\'"
+
+
+def fold_case(text: str) -> str:
+    """Lower-case ASCII letters only, as SQLite's LIKE compares them."""
+    return text.lower() if text.isascii() else text.translate(_ASCII_LOWER)
+
+
+def like_pattern(search_term: str) -> str:
+    """Build a '%term%' LIKE pattern matching the term literally (use with LIKE_ESCAPE)."""
+    escaped = search_term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
+
+class CompanySearch:
+    """Cache of name/number search results for one database version.
+
+    Each entry keeps the matching numbers in deadline order next to their
+    case-folded name and number, so narrowing a cached result keeps its
+    order and does no per-row case folding. Entries are dropped as
+    soon as a different version is seen, like QueryCache.
+    """
+
+    def __init__(self, max_terms: int = 256):
+        """Initialize the search cache.
+
+        Args:
+            max_terms: Maximum number of search terms kept; least recently
+                       used terms are evicted first
+        """
+        self.max_terms = max_terms
+        self._results: OrderedDict = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.narrowed = 0
+        self.misses = 0
+
+    def _narrowest_cached(self, key: str) -> Optional[Tuple[Tuple[str, str], ...]]:
+        """Smallest cached result for a term contained in key (caller holds the lock)."""
+        candidates = [matches for term, matches in self._results.items() if term in key]
+        return min(candidates, key=len) if candidates else None
+
+    def find(self, search_term: str, version: Any,
+             load: Callable[[str], Iterable[Tuple[str, str]]]) -> Tuple[str, ...]:
+        """Get the company numbers matching a search term.
+
+        Args:
+            search_term: Matched case-insensitively anywhere in the name or number
+            version: Current database version
+            load: Called with the term on a miss; returns matching
+                  (Company_Number, Company_Name) pairs in list order
+
+        Returns:
+            Matching company numbers, in the order load returned them
+        """
+        key = fold_case(search_term.replace('\0', ''))
+        with self._lock:
+            if version != self._version:
+                self._results.clear()
+                self._version = version
+            matches = self._results.get(key)
+            if matches is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return tuple(number for number, _ in matches)
+            base = self._narrowest_cached(key)
+
+        if base is not None:
+            matches = tuple((number, text) for number, text in base if key in text)
+            counter = 'narrowed'
+        else:
+            # Name and number joined by NUL, which a search term never contains
+            matches = tuple(
+                (number, f"{fold_case(name)}\0{fold_case(number)}")
+                for number, name in load(search_term)
+            )
+            counter = 'misses'
+
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+            if version == self._version:
+                self._results[key] = matches
+                self._results.move_to_end(key)
+                while len(self._results) > self.max_terms:
+                    self._results.popitem(last=False)
+        return tuple(number for number, _ in matches)
+
+    def stats(self) -> dict:
+        """Get search statistics: hits, narrowed, misses and cached terms."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'narrowed': self.narrowed,
+                'misses': self.misses,
+                'terms': len(self._results)
+            }
@@ -0,0 +1,242 @@
+"""
+Per-practice database shards for Company Accounts Dashboard.
+Each practice gets its own SQLite file (practice_<id>.db), so per-practice
+queries only scan that practice's companies and writers in different
+practices never share a lock. Cross-practice reporting attaches the shard
+files read-only to a scratch connection and aggregates them in SQL.
+"""
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .db_manager import DatabaseManager
+from .schema import STATUS_CODES, deadline_to_day
+from .search import LIKE_ESCAPE, like_pattern
+
+DEFAULT_SHARD_DIR = "practices"
+
+# Database of one-practice deployments
+DEFAULT_DB_PATH = "client_data.db"
+
+# SQLite's default SQLITE_MAX_ATTACHED; larger deployments are read in batches
+MAX_ATTACHED_SHARDS = 10
+
+PRACTICE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+# One router per shard directory, shared by every page and session
+_routers: Dict[str, 'ShardRouter'] = {}
+_routers_lock = threading.Lock()
+
+# Likewise one DatabaseManager per unsharded database file
+_databases: Dict[str, DatabaseManager] = {}
+_databases_lock = threading.Lock()
+
+
+class ShardRouter:
+    """Routes each practice to its own DatabaseManager and shard file."""
+
+    def __init__(self, shard_dir: str = DEFAULT_SHARD_DIR, cache_size: int = 128,
+                 read_replica: bool = False):
+        """Initialize the router.
+
+        Args:
+            shard_dir: Directory holding the practice_<id>.db files
+            cache_size: Read cache size for each practice's DatabaseManager
+            read_replica: Serve each practice's reads from an in-memory replica
+        """
+        self.shard_dir = Path(shard_dir)
+        self.cache_size = cache_size
+        self.read_replica = read_replica
+        self._managers: Dict[str, DatabaseManager] = {}
+        self._lock = threading.Lock()
+
+    def shard_path(self, practice_id: str) -> Path:
+        """Get the database file for a practice.
+
+        Args:
+            practice_id: Practice identifier (letters, digits, '-' and '_')
+
+        Returns:
+            Path of the practice's shard
+
+        Raises:
+            ValueError: If the practice id contains other characters
+        """
+        if not PRACTICE_ID_PATTERN.match(str(practice_id)):
+            raise ValueError(f"Invalid practice id: {practice_id!r}")
+        return self.shard_dir / f"practice_{practice_id}.db"
+
+    def get_manager(self, practice_id: str) -> DatabaseManager:
+        """Get the DatabaseManager for a practice, creating its shard if needed.
+
+        Args:
+            practice_id: Practice identifier
+
+        Returns:
+            The practice's DatabaseManager (one per practice per router)
+        """
+        path = self.shard_path(practice_id)
+        with self._lock:
+            manager = self._managers.get(practice_id)
+            if manager is None:
+                self.shard_dir.mkdir(parents=True, exist_ok=True)
+                manager = DatabaseManager(str(path), cache_size=self.cache_size,
+                                          read_replica=self.read_replica)
+                self._managers[practice_id] = manager
+            return manager
+
+    def list_practices(self) -> List[str]:
+        """Get the ids of every practice with a shard file, sorted."""
+        if not self.shard_dir.exists():
+            return []
+        return sorted(path.stem[len("practice_"):] for path in self.shard_dir.glob("practice_*.db"))
+
+    def _query_shards(self, select_sql: str, params: tuple = (),
+                      practice_ids: Optional[List[str]] = None) -> pd.DataFrame:
+        """Run one SELECT against every shard and stack the results.
+
+        Shards are attached read-only in groups of MAX_ATTACHED_SHARDS and
+        each group is read with a single UNION ALL query.
+
+        Args:
+            select_sql: SELECT using {schema} as the placeholder for the
+                        attached schema name; a Practice column is added
+            params: Parameters for one copy of select_sql
+            practice_ids: Practices to include (defaults to all)
+
+        Returns:
+            Combined DataFrame with a leading Practice column
+        """
+        practice_ids = self.list_practices() if practice_ids is None else practice_ids
+        frames = []
+
+        for start in range(0, len(practice_ids), MAX_ATTACHED_SHARDS):
+            group = practice_ids[start:start + MAX_ATTACHED_SHARDS]
+            conn = sqlite3.connect(":memory:", uri=True)
+            try:
+                parts = []
+                query_params = []
+                for idx, practice_id in enumerate(group):
+                    uri = self.shard_path(practice_id).resolve().as_uri() + "?mode=ro"
+                    conn.execute(f"ATTACH DATABASE ? AS shard{idx}", (uri,))
+                    parts.append(f"SELECT ? AS Practice, * FROM ({select_sql.format(schema=f'shard{idx}')})")
+                    query_params.extend((practice_id, *params))
+                frames.append(pd.read_sql_query(" UNION ALL ".join(parts), conn, params=query_params))
+            finally:
+                conn.close()
+
+        if not frames:
+            return pd.DataFrame(columns=['Practice'])
+        return pd.concat(frames, ignore_index=True)
+
+    def get_practice_summary(self, deadline_cutoff: str = "2026-07-31") -> pd.DataFrame:
+        """Get KPI counts and totals for every practice.
+
+        Args:
+            deadline_cutoff: The deadline cutoff date (YYYY-MM-DD)
+
+        Returns:
+            DataFrame with one row per practice: Practice, outstanding,
+            due_by_cutoff, started, ready, sent, missing, total_companies
+            and filed_count
+        """
+        summary = self._query_shards(f"""
+            SELECT COALESCE(SUM(Filing_Deadline <= ? AND Accounts_Filed_CH = 0), 0) AS outstanding,
+                   COALESCE(SUM(Filing_Deadline <= ?), 0) AS due_by_cutoff,
+                   COALESCE(SUM(Internal_Status = {STATUS_CODES['Started']}), 0) AS started,
+                   COALESCE(SUM(Internal_Status = {STATUS_CODES['Ready to Submit']}), 0) AS ready,
+                   COALESCE(SUM(Internal_Status = {STATUS_CODES['Sent to Client']}), 0) AS sent,
+                   COALESCE(SUM(Internal_Status = {STATUS_CODES['Missing Information']}), 0) AS missing,
+                   COUNT(*) AS total_companies,
+                   COALESCE(SUM(Accounts_Filed_CH), 0) AS filed_count
+            FROM {{schema}}.companies
+        """, (deadline_to_day(deadline_cutoff),) * 2)
+        if summary.empty:
+            return pd.DataFrame(columns=['Practice', 'outstanding', 'due_by_cutoff', 'started', 'ready',
+                                         'sent', 'missing', 'total_companies', 'filed_count'])
+        return summary
+
+    def get_kpi_counts(self, deadline_cutoff: str = "2026-07-31") -> Dict[str, int]:
+        """Get KPI counts summed across every practice.
+
+        Args:
+            deadline_cutoff: The deadline cutoff date (YYYY-MM-DD)
+
+        Returns:
+            Dictionary with the same keys as DatabaseManager.get_kpi_counts
+        """
+        summary = self.get_practice_summary(deadline_cutoff)
+        return {key: int(summary[key].sum())
+                for key in ('outstanding', 'due_by_cutoff', 'started', 'ready', 'sent', 'missing')}
+
+    def search_companies(self, search_term: str) -> pd.DataFrame:
+        """Search companies by name or number across every practice.
+
+        Args:
+            search_term: The search term
+
+        Returns:
+            DataFrame of matching companies with a Practice column, ordered by deadline
+        """
+        pattern = like_pattern(search_term)
+        results = self._query_shards(f"""
+            SELECT * FROM {{schema}}.company_details
+            WHERE Company_Name LIKE ? {LIKE_ESCAPE} OR Company_Number LIKE ? {LIKE_ESCAPE}
+        """, (pattern, pattern))
+        if results.empty:
+            return results
+        return results.sort_values('Filing_Deadline', kind='stable', ignore_index=True)
+
+
+def get_shard_router(shard_dir: str = DEFAULT_SHARD_DIR, read_replica: bool = False) -> ShardRouter:
+    """Get the shared router for a shard directory.
+
+    Args:
+        shard_dir: Directory holding the practice shards
+        read_replica: Passed to the router when it is first created
+
+    Returns:
+        The ShardRouter for that directory
+    """
+    key = str(Path(shard_dir).resolve())
+    with _routers_lock:
+        router = _routers.get(key)
+        if router is None:
+            router = ShardRouter(shard_dir, read_replica=read_replica)
+            _routers[key] = router
+        return router
+
+
+def get_database(practice_id: Optional[str] = None, shard_dir: Optional[str] = None) -> DatabaseManager:
+    """Get the DatabaseManager for the configured practice.
+
+    Without a practice id (argument or PRACTICE_ID environment variable) this
+    is the single client_data.db used by one-practice deployments. Either
+    way the manager is shared by every caller in the process, so its read
+    cache and replica are too. Setting READ_REPLICA=1 serves reads from an
+    in-memory replica.
+
+    Args:
+        practice_id: Practice to open (defaults to PRACTICE_ID)
+        shard_dir: Shard directory (defaults to SHARD_DIR, then "practices")
+
+    Returns:
+        DatabaseManager for the practice's shard, or the default database
+    """
+    practice_id = practice_id or os.getenv("PRACTICE_ID")
+    read_replica = os.getenv("READ_REPLICA", "").lower() in ("1", "true", "yes")
+    if not practice_id:
+        key = str(Path(DEFAULT_DB_PATH).resolve())
+        with _databases_lock:
+            db = _databases.get(key)
+            if db is None:
+                db = DatabaseManager(DEFAULT_DB_PATH, read_replica=read_replica)
+                _databases[key] = db
+            return db
+    router = get_shard_router(shard_dir or os.getenv("SHARD_DIR", DEFAULT_SHARD_DIR), read_replica=read_replica)
+    return router.get_manager(practice_id)
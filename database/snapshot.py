@@ -0,0 +1,160 @@
+"""
+Arrow snapshot of the companies table for Company Accounts Dashboard.
+The stored columns are written to an Arrow IPC file and read back
+memory-mapped, so every session in the process shares one copy of the
+data in the OS page cache instead of each query reading it from SQLite.
+Exports stream the whole list from it in any sort order. Requires the
+optional pyarrow package.
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import pandas as pd
+
+from .schema import STORED_COMPANY_SELECT, decode_companies_frame
+
+# Rows fetched from SQLite per record batch while the snapshot is written
+SNAPSHOT_BATCH_SIZE = 10000
+
+# Sort key standing in for a missing deadline, below any real day number
+MISSING_SORT_KEY = -2 ** 31
+
+
+def snapshot_available() -> bool:
+    """Check whether pyarrow, which snapshots need, is installed."""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _snapshot_schema():
+    import pyarrow as pa
+
+    # The stored values as they are, so chunks decode exactly like SQL results
+    return pa.schema([
+        ('Company_Number', pa.string()),
+        ('Company_Name', pa.string()),
+        ('Filing_Deadline', pa.int32()),
+        ('Internal_Status', pa.int8()),
+        ('Accounts_Filed_CH', pa.int8()),
+        ('Last_Updated', pa.string()),
+    ])
+
+
+class CompanySnapshot:
+    """Memory-mapped Arrow IPC copy of the companies table.
+
+    The snapshot is keyed on PRAGMA data_version (see
+    DatabaseManager.get_data_version), which moves on every committed write
+    from any process, Last_Updated-only ones included. read() rebuilds it
+    when the version has moved on; the new file is swapped in with
+    os.replace, so tables already handed out keep mapping the file they
+    were opened from. data_version is only comparable within one process,
+    so each process keeps its snapshot in a private temporary directory.
+    """
+
+    def __init__(self, db):
+        """Initialize the snapshot.
+
+        Args:
+            db: DatabaseManager to snapshot
+        """
+        self.db = db
+        self._dir = tempfile.TemporaryDirectory(prefix="bytedashboard-snapshot-")
+        self.path = Path(self._dir.name) / "companies.arrow"
+        self._lock = threading.Lock()
+        self._table = None
+        self._data_version = None
+        self.rebuilds = 0
+
+    def _write(self):
+        """Stream the companies table into a new snapshot file."""
+        import pyarrow as pa
+
+        schema = _snapshot_schema()
+        partial = self.path.with_name(f"{self.path.name}.partial")
+        conn = sqlite3.connect(self.db.db_path)
+        try:
+            with conn, pa.OSFile(str(partial), 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+                # One read transaction, so the snapshot is a consistent view
+                conn.execute("BEGIN")
+                cursor = conn.execute(STORED_COMPANY_SELECT)
+                while True:
+                    rows = cursor.fetchmany(SNAPSHOT_BATCH_SIZE)
+                    if not rows:
+                        break
+                    columns = [list(column) for column in zip(*rows)]
+                    writer.write_batch(pa.record_batch(
+                        [pa.array(column, field.type) for column, field in zip(columns, schema)], schema=schema
+                    ))
+            os.replace(partial, self.path)
+        finally:
+            conn.close()
+            partial.unlink(missing_ok=True)
+        self.rebuilds += 1
+
+    def read(self):
+        """Get the stored companies columns, rebuilding the snapshot if it is stale.
+
+        Returns:
+            pyarrow.Table backed by the memory-mapped file (treat as
+            read-only), in table order, with day numbers and status codes
+            as stored
+        """
+        import pyarrow as pa
+
+        # Taken before the rebuild, so a write landing during it only costs another rebuild
+        data_version = self.db.get_data_version()
+        with self._lock:
+            if self._table is None or data_version != self._data_version:
+                self._write()
+                # The table's buffers point into the mapping and keep it alive
+                self._table = pa.ipc.open_file(pa.memory_map(str(self.path), 'r')).read_all()
+                self._data_version = data_version
+            return self._table
+
+    def iter_chunks(self, chunk_size: int, sort_by: str = 'Filing_Deadline', ascending: bool = True,
+                    company_numbers: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+        """Stream the snapshot in list order, as DatabaseManager.iter_companies_chunks does from SQL.
+
+        Sorts like the list's ORDER BY: names compared ignoring ASCII case
+        (COLLATE NOCASE), statuses by code, missing deadlines first when
+        ascending, and ties broken by company number in the same direction.
+
+        Args:
+            chunk_size: Companies per chunk
+            sort_by: 'Filing_Deadline', 'Company_Name' or 'Internal_Status'
+            ascending: Sort direction
+            company_numbers: Only include these companies (a search's matches)
+
+        Yields:
+            Typed DataFrames (see decode_companies_frame)
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        table = self.read()
+        if company_numbers is not None:
+            table = table.filter(pc.is_in(table['Company_Number'], value_set=pa.array(company_numbers, pa.string())))
+
+        if sort_by == 'Company_Name':
+            key = pc.ascii_lower(table['Company_Name'])
+        elif sort_by == 'Filing_Deadline':
+            # SQLite sorts NULL below every value
+            key = pc.fill_null(table['Filing_Deadline'], pa.scalar(MISSING_SORT_KEY, pa.int32()))
+        else:
+            key = table[sort_by]
+        order = 'ascending' if ascending else 'descending'
+        indices = pc.sort_indices(
+            pa.table({'key': key, 'number': table['Company_Number']}),
+            sort_keys=[('key', order), ('number', order)]
+        )
+        # No matches still yields one empty chunk, as read_sql_query does, so writers emit their header
+        for start in range(0, max(len(indices), 1), chunk_size):
+            yield decode_companies_frame(table.take(indices[start:start + chunk_size]).to_pandas())
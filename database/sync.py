@@ -0,0 +1,217 @@
+"""
+Cross-session sync coordination for Company Accounts Dashboard.
+The time of the last Companies House sync, the lease on the next one and
+its outcome live in the sync_state table, so every browser and TV showing
+the dashboard shares them. Whichever session finds a sync due first takes
+the lease and runs it; the others just read the recorded result.
+"""
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_SYNC_NAME = 'filing_deadlines'
+
+_TIMESTAMP_FIELDS = ('Lease_Expires', 'Last_Started', 'Last_Finished')
+
+
+def _from_utc(value: Optional[str]) -> Optional[datetime]:
+    """Convert a SQLite UTC timestamp to a naive local datetime."""
+    if value is None:
+        return None
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+
+class SyncCoordinator:
+    """Database-backed lease making sure one session at a time runs a sync.
+
+    A lease is taken with a single conditional UPDATE, so at most one
+    connection (in any process) can win it. A lease that is never released,
+    e.g. because the holder's process died, simply expires.
+    """
+
+    def __init__(self, db, name: str = DEFAULT_SYNC_NAME, interval: timedelta = timedelta(hours=1),
+                 retry_interval: timedelta = timedelta(minutes=10),
+                 lease_duration: timedelta = timedelta(hours=1)):
+        """Initialize the coordinator.
+
+        Args:
+            db: DatabaseManager whose database holds the sync_state table
+            name: Sync being coordinated; one row of sync_state
+            interval: Time between successful syncs
+            retry_interval: Time before retrying a failed sync
+            lease_duration: Time after which an unreleased lease is taken over
+        """
+        self.db = db
+        self.name = name
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.lease_duration = lease_duration
+
+    def get_state(self) -> Optional[Dict[str, Any]]:
+        """Get the recorded state of the sync.
+
+        Returns:
+            Dictionary with the sync_state columns (timestamps as local
+            datetimes) plus Next_Due, or None if it has never been attempted
+        """
+        conn = self.db.get_connection()
+        try:
+            row = conn.execute("SELECT * FROM sync_state WHERE Name = ?", (self.name,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+
+        state = dict(row)
+        for field in _TIMESTAMP_FIELDS:
+            state[field] = _from_utc(state[field])
+        if state['Last_Finished'] is None:
+            state['Next_Due'] = None
+        else:
+            wait = self.interval if state['Last_Status'] == 'success' else self.retry_interval
+            state['Next_Due'] = state['Last_Finished'] + wait
+        return state
+
+    def is_due(self, state: Optional[Dict[str, Any]] = None) -> bool:
+        """Check, without writing, whether the sync is due and its lease is free.
+
+        Cheap enough to call on every refresh; only a True answer is worth
+        following with try_acquire(), which opens a write transaction.
+
+        Args:
+            state: Result of get_state(), if the caller already has it
+
+        Returns:
+            True if the sync is due and nobody holds a live lease
+        """
+        state = self.get_state() if state is None else state
+        if state is None:
+            return True
+        now = datetime.now()
+        if state['Lease_Owner'] is not None and state['Lease_Expires'] > now:
+            return False
+        return state['Next_Due'] is None or state['Next_Due'] <= now
+
+    def try_acquire(self) -> Optional[str]:
+        """Take the lease if the sync is due and nobody else holds it.
+
+        Returns:
+            Lease token to pass to complete() or fail(), or None if the
+            sync is not due or another session is running it
+        """
+        token = uuid.uuid4().hex
+        conn = self.db.get_connection()
+        try:
+            with conn:
+                conn.execute("INSERT OR IGNORE INTO sync_state (Name) VALUES (?)", (self.name,))
+                acquired = conn.execute("""
+                    UPDATE sync_state
+                    SET Lease_Owner = ?,
+                        Lease_Expires = datetime('now', ?),
+                        Last_Started = datetime('now')
+                    WHERE Name = ?
+                      AND (Lease_Owner IS NULL OR Lease_Expires <= datetime('now'))
+                      AND (Last_Finished IS NULL
+                           OR (Last_Status = 'success' AND Last_Finished <= datetime('now', ?))
+                           OR (Last_Status = 'failed' AND Last_Finished <= datetime('now', ?)))
+                """, (
+                    token,
+                    f"+{int(self.lease_duration.total_seconds())} seconds",
+                    self.name,
+                    f"-{int(self.interval.total_seconds())} seconds",
+                    f"-{int(self.retry_interval.total_seconds())} seconds",
+                )).rowcount
+        finally:
+            conn.close()
+        return token if acquired else None
+
+    def _release(self, token: str, status: str, error: Optional[str],
+                 checked: Optional[int], updated: Optional[int]) -> bool:
+        conn = self.db.get_connection()
+        try:
+            with conn:
+                released = conn.execute("""
+                    UPDATE sync_state
+                    SET Lease_Owner = NULL, Lease_Expires = NULL,
+                        Last_Finished = datetime('now'), Last_Status = ?, Last_Error = ?,
+                        Companies_Checked = ?, Companies_Updated = ?
+                    WHERE Name = ? AND Lease_Owner = ?
+                """, (status, error, checked, updated, self.name, token)).rowcount
+        finally:
+            conn.close()
+        return bool(released)
+
+    def complete(self, token: str, checked: int, updated: int) -> bool:
+        """Record a successful sync and release the lease.
+
+        Returns:
+            False if the lease had expired and been taken over meanwhile
+        """
+        return self._release(token, 'success', None, checked, updated)
+
+    def fail(self, token: str, error: str) -> bool:
+        """Record a failed sync and release the lease.
+
+        Returns:
+            False if the lease had expired and been taken over meanwhile
+        """
+        return self._release(token, 'failed', error, None, None)
+
+    def run_if_due(self, sync: Callable[[], Tuple[int, int]]) -> bool:
+        """Run the sync if it is due and this session wins the lease.
+
+        Args:
+            sync: Performs the sync and returns (companies checked, companies updated)
+
+        Returns:
+            True if this call ran the sync
+
+        Raises:
+            Exception: Whatever sync raised, after the failure is recorded
+        """
+        # Skip the write transaction entirely while the sync is not due
+        if not self.is_due():
+            return False
+        token = self.try_acquire()
+        if token is None:
+            return False
+
+        print(f"[INFO] Running {self.name} sync")
+        try:
+            checked, updated = sync()
+        except Exception as e:
+            self.fail(token, f"{type(e).__name__}: {e}")
+            raise
+        self.complete(token, checked, updated)
+        print(f"[INFO] {self.name} sync checked {checked} companies, updated {updated}")
+        return True
+
+
+def sync_filing_deadlines(db, api, company_numbers: Optional[List[str]] = None,
+                          progress_callback: Optional[Callable[[int, int], None]] = None,
+                          cancel_event: Optional[threading.Event] = None) -> Tuple[int, int]:
+    """Refresh filing deadlines from Companies House.
+
+    Deadlines fetched before a cancellation are still saved.
+
+    Args:
+        db: DatabaseManager to update
+        api: CompaniesHouseAPI client
+        company_numbers: Companies to refresh (defaults to all)
+        progress_callback: Passed to bulk_get_filing_deadlines
+        cancel_event: Passed to bulk_get_filing_deadlines
+
+    Returns:
+        Tuple of (companies checked, companies whose deadline changed)
+    """
+    # Malformed numbers are quarantined instead of costing a request every sync
+    company_numbers = db.get_sync_company_numbers(company_numbers)
+    if not company_numbers:
+        return 0, 0
+    results = api.bulk_get_filing_deadlines(company_numbers, progress_callback=progress_callback,
+                                            cancel_event=cancel_event)
+    updated = db.update_filing_deadlines_bulk(
+        {company_number: deadline for company_number, deadline in results.items() if deadline}
+    )
+    return len(results), updated
@@ -0,0 +1,122 @@
+"""
+Client file watcher for Company Accounts Dashboard.
+Polls an import file and runs an incremental import when it changes.
+"""
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+# One watcher per (database, file) pair, shared by every page and session
+_watchers: Dict[tuple, 'ImportWatcher'] = {}
+_watchers_lock = threading.Lock()
+
+
+class ImportWatcher:
+    """Background thread that re-imports a client file when it changes.
+
+    Only the file's modification time and size are checked on each poll;
+    incremental_import then compares content hashes, so touching the file
+    without editing it costs a hash and nothing else.
+    """
+
+    def __init__(self, db, file_path: str, interval: float = 30.0,
+                 on_import: Optional[Callable[[Dict], None]] = None,
+                 use_api_for_deadlines: bool = False):
+        """Initialize the watcher.
+
+        Args:
+            db: DatabaseManager to import into
+            file_path: Client file to watch
+            interval: Seconds between polls
+            on_import: Optional callback receiving each import report
+            use_api_for_deadlines: Passed through to incremental_import
+        """
+        self.db = db
+        self.file_path = file_path
+        self.interval = interval
+        self.on_import = on_import
+        self.use_api_for_deadlines = use_api_for_deadlines
+        self.last_report = None
+        self._last_signature = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def _signature(self) -> Optional[tuple]:
+        """Get the file's (mtime, size), or None if it does not exist."""
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def check(self) -> Optional[Dict]:
+        """Import the file if it changed since the last check.
+
+        Returns:
+            The import report, or None if the file was not re-imported
+        """
+        signature = self._signature()
+        if signature is None or signature == self._last_signature:
+            return None
+
+        try:
+            report = self.db.incremental_import(
+                self.file_path, use_api_for_deadlines=self.use_api_for_deadlines
+            )
+        except Exception as e:
+            # Keep the old signature so a half-written file is retried on the next poll
+            print(f"Error importing {self.file_path}: {e}")
+            return None
+
+        self._last_signature = signature
+        self.last_report = report
+        if not report['unchanged']:
+            print(f"Re-imported {self.file_path}: {report['added']} added, "
+                  f"{report['updated']} updated, {report['removed']} not in file")
+        if self.on_import:
+            self.on_import(report)
+        return report
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.check()
+            self._stop_event.wait(self.interval)
+
+    def start(self):
+        """Start polling in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"import-watcher:{self.file_path}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval)
+
+
+def start_import_watcher(db, file_path: str = "clients.xlsx", interval: float = 30.0,
+                         use_api_for_deadlines: bool = False) -> ImportWatcher:
+    """Start (or return the already running) watcher for a database and file.
+
+    Args:
+        db: DatabaseManager to import into
+        file_path: Client file to watch
+        interval: Seconds between polls
+        use_api_for_deadlines: Passed through to incremental_import
+
+    Returns:
+        The running ImportWatcher
+    """
+    key = (str(Path(db.db_path).resolve()), str(Path(file_path).resolve()))
+    with _watchers_lock:
+        watcher = _watchers.get(key)
+        if watcher is None:
+            watcher = ImportWatcher(db, file_path, interval=interval,
+                                    use_api_for_deadlines=use_api_for_deadlines)
+            _watchers[key] = watcher
+        watcher.start()
+        return watcher
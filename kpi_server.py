@@ -0,0 +1,249 @@
+"""
+Read-only JSON endpoint for Company Accounts Dashboard.
+Serves the KPI counts, database stats and a paginated company list to
+office TVs and intranet widgets without loading the Streamlit app.
+
+Every response carries an ETag built from the database's data version,
+and a request whose If-None-Match still matches gets an empty 304 Not
+Modified, so clients polling an unchanged database cost one PRAGMA read.
+
+Endpoints:
+    GET /kpis?cutoff=YYYY-MM-DD
+    GET /stats
+    GET /companies?page=0&page_size=50&sort_by=Filing_Deadline&order=asc&search=...
+    GET /changes?since=VERSION
+
+/companies includes the change version its rows reflect; passing it to
+/changes returns only the companies changed since, or 410 Gone once the
+change log no longer reaches back that far and the list must be refetched.
+
+Usage:
+    python kpi_server.py [port]
+
+Environment variables:
+    KPI_SERVER_HOST   Interface to listen on (default 127.0.0.1)
+    KPI_SERVER_PORT   Port to listen on (default 8502)
+    KPI_API_TOKEN     If set, clients must send "Authorization: Bearer <token>"
+    PRACTICE_ID, SHARD_DIR, READ_REPLICA as for the Streamlit app
+"""
+import hmac
+import json
+import os
+import sys
+import uuid
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+from dotenv import load_dotenv
+
+from database import get_database
+
+DEFAULT_PORT = 8502
+MAX_PAGE_SIZE = 500
+
+# Changes on every start, so ETags from a previous run never match
+SERVER_INSTANCE = uuid.uuid4().hex[:8]
+
+
+def companies_to_records(rows) -> list:
+    """Convert a typed company frame to JSON-ready dicts."""
+    return [
+        {
+            'Company_Number': row.Company_Number,
+            'Company_Name': row.Company_Name,
+            'Filing_Deadline': None if pd.isna(row.Filing_Deadline) else row.Filing_Deadline.strftime('%Y-%m-%d'),
+            'Internal_Status': row.Internal_Status,
+            'Accounts_Filed_CH': bool(row.Accounts_Filed_CH),
+        }
+        for row in rows.itertuples(index=False)
+    ]
+
+
+def changes_to_records(changes) -> list:
+    """Convert typed get_changes_since rows to JSON-ready dicts.
+
+    Deleted companies only carry their number.
+    """
+    deleted = changes['Operation'] == 'delete'
+    live = iter(companies_to_records(changes[~deleted]))
+    return [
+        {'Company_Number': str(number), 'Operation': 'delete', 'Version': int(version)} if gone
+        else {**next(live), 'Operation': operation, 'Version': int(version)}
+        for number, operation, version, gone in zip(
+            changes['Company_Number'], changes['Operation'], changes['Version'], deleted
+        )
+    ]
+
+
+class GoneError(Exception):
+    """The requested data is no longer available; the client must start over."""
+
+
+class KPIRequestHandler(BaseHTTPRequestHandler):
+    """Handles GET requests for the read-only endpoints."""
+
+    server_version = "ByteDashboardKPI/1.0"
+    db = None
+    api_token: Optional[str] = None
+
+    def _query(self) -> Dict[str, str]:
+        return {key: values[-1] for key, values in parse_qs(urlparse(self.path).query).items()}
+
+    def _send_json(self, status: HTTPStatus, payload: Any, etag: Optional[str] = None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+            # Clients may keep the response but must revalidate before reusing it
+            self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        if not self.api_token:
+            return True
+        header = self.headers.get('Authorization', '')
+        return hmac.compare_digest(header, f"Bearer {self.api_token}")
+
+    def _not_modified(self, etag: str) -> bool:
+        """Check If-None-Match against the current ETag."""
+        header = self.headers.get('If-None-Match')
+        if not header:
+            return False
+        candidates = [tag.strip() for tag in header.split(',')]
+        return '*' in candidates or etag in candidates
+
+    def do_GET(self):
+        if not self._authorized():
+            self._send_json(HTTPStatus.UNAUTHORIZED, {'error': 'Missing or invalid API token'})
+            return
+
+        routes = {
+            '/kpis': self._kpis,
+            '/stats': self._stats,
+            '/companies': self._companies,
+            '/changes': self._changes,
+        }
+        handler = routes.get(urlparse(self.path).path.rstrip('/') or '/')
+        if handler is None:
+            self._send_json(HTTPStatus.NOT_FOUND, {'error': 'Not found', 'endpoints': sorted(routes)})
+            return
+
+        # Taken before the query, so a write landing mid-request only costs the client a refetch
+        etag = f'W/"{SERVER_INSTANCE}-{self.db.get_read_version()}"'
+        if self._not_modified(etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            return
+
+        try:
+            payload = handler(self._query())
+        except ValueError as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+            return
+        except GoneError as e:
+            self._send_json(HTTPStatus.GONE, {'error': str(e)})
+            return
+        except Exception as e:
+            print(f"[ERROR] {self.path}: {e}")
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': 'Internal server error'})
+            return
+        self._send_json(HTTPStatus.OK, payload, etag)
+
+    def _kpis(self, query: Dict[str, str]) -> Dict[str, Any]:
+        return self.db.get_kpi_counts(query.get('cutoff', "2026-07-31"))
+
+    def _stats(self, query: Dict[str, str]) -> Dict[str, Any]:
+        return self.db.get_database_stats()
+
+    def _companies(self, query: Dict[str, str]) -> Dict[str, Any]:
+        try:
+            page = int(query.get('page', 0))
+            page_size = int(query.get('page_size', 50))
+        except ValueError:
+            raise ValueError("page and page_size must be integers")
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+        order = query.get('order', 'asc')
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+
+        # Read before the page, so changes landing in between are replayed rather than missed
+        version = self.db.get_current_version()
+        result = self.db.get_companies_page(
+            page, page_size,
+            sort_by=query.get('sort_by', 'Filing_Deadline'),
+            ascending=order == 'asc',
+            search_term=query.get('search') or None
+        )
+        return {
+            'companies': companies_to_records(result['rows']),
+            'total': result['total'],
+            'page': result['page'],
+            'pages': result['pages'],
+            'page_size': result['page_size'],
+            'version': version
+        }
+
+    def _changes(self, query: Dict[str, str]) -> Dict[str, Any]:
+        try:
+            since = int(query['since'])
+        except (KeyError, ValueError):
+            raise ValueError("since must be the integer version from /companies or /changes")
+        if since < 0:
+            raise ValueError("since must not be negative")
+
+        changes = self.db.get_changes_since(since, typed=True)
+        if changes is None:
+            raise GoneError(f"Changes since version {since} are no longer available; refetch /companies")
+        return {
+            'changes': changes_to_records(changes),
+            'version': int(changes['Version'].max()) if not changes.empty else since
+        }
+
+    def log_message(self, format, *args):
+        # Polling clients would flood the console with one line per request
+        pass
+
+
+def create_server(db, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                  api_token: Optional[str] = None) -> ThreadingHTTPServer:
+    """Create the HTTP server without starting it.
+
+    Args:
+        db: DatabaseManager to serve
+        host: Interface to listen on
+        port: Port to listen on (0 picks a free port)
+        api_token: Bearer token clients must send, or None for no check
+
+    Returns:
+        Server ready for serve_forever()
+    """
+    handler = type('BoundKPIRequestHandler', (KPIRequestHandler,), {'db': db, 'api_token': api_token})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    load_dotenv()
+    host = os.getenv("KPI_SERVER_HOST", "127.0.0.1")
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else int(os.getenv("KPI_SERVER_PORT", DEFAULT_PORT))
+
+    server = create_server(get_database(), host, port, os.getenv("KPI_API_TOKEN") or None)
+    print(f"[INFO] Serving KPIs on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
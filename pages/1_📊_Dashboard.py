@@ -3,12 +3,12 @@ Dashboard Page - TV View
 Large indicators showing key performance metrics for company accounts filing.
 """
 import streamlit as st
+import streamlit.components.v1 as components
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
+from datetime import timedelta
 import os
-import time
 
 # Load environment variables from .env file
 load_dotenv()
@@ -16,8 +16,8 @@ load_dotenv()
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from database import DatabaseManager
-from api import CompaniesHouseAPI
+from database import SyncCoordinator, get_database, sync_filing_deadlines
+from api import CompaniesHouseAPI, get_job_manager
 from auth import check_password
 
 # Check authentication
@@ -187,161 +187,160 @@ st.markdown("""
         background-color: #d4edda;
         color: #155724;
     }
+    </style>
+""", unsafe_allow_html=True)
+
+# Initialize database
+@st.cache_resource
+def get_db():
+    """Get database manager instance."""
+    return get_database()
 
-    /* Time display */
+db = get_db()
+
+# KPI cards and the sync footer refresh on their own every this many seconds
+KPI_REFRESH_SECONDS = int(os.getenv("DASHBOARD_REFRESH_SECONDS", "60"))
+SYNC_INTERVAL = timedelta(hours=1)
+
+# Clock drawn and ticked by the browser, so it never needs a rerun
+CLOCK_HTML = """
+<style>
+    body { margin: 0; font-family: "Source Sans Pro", sans-serif; }
     .time-display {
         text-align: center;
-        color: #1a237e !important;
+        color: #1a237e;
         font-size: 72px;
         font-weight: 700;
         margin-top: 30px;
         text-shadow: 2px 2px 4px rgba(0,0,0,0.1);
     }
-
     .date-display {
         text-align: center;
-        color: #666 !important;
+        color: #666;
         font-size: 28px;
-        margin-bottom: 50px;
         font-weight: 300;
     }
-    </style>
-""", unsafe_allow_html=True)
+</style>
+<div class="time-display" id="time"></div>
+<div class="date-display" id="date"></div>
+<script>
+    const days = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"];
+    const months = ["January", "February", "March", "April", "May", "June", "July",
+                    "August", "September", "October", "November", "December"];
+    const pad = (n) => String(n).padStart(2, "0");
+
+    function tick() {
+        const now = new Date();
+        document.getElementById("time").textContent = pad(now.getHours()) + ":" + pad(now.getMinutes());
+        document.getElementById("date").textContent =
+            days[now.getDay()] + ", " + pad(now.getDate()) + " " + months[now.getMonth()] + " " + now.getFullYear();
+    }
+    tick();
+    setInterval(tick, 1000);
+</script>
+"""
 
-# Initialize database
+# Shared by every session; the sync_state table decides which one runs each sync
 @st.cache_resource
-def get_db():
-    """Get database manager instance."""
-    return DatabaseManager()
+def get_sync_coordinator():
+    """Get the coordinator for the hourly deadline sync."""
+    return SyncCoordinator(db, interval=SYNC_INTERVAL)
 
-db = get_db()
-
-# Auto-update filing deadlines every hour
-if 'last_update_time' not in st.session_state:
-    st.session_state.last_update_time = None
-
-now = datetime.now()
+coordinator = get_sync_coordinator()
 
-# Check if we need to update (first run or 1 hour has passed)
-api_key = os.getenv("COMPANIES_HOUSE_API_KEY")
-if api_key:
-    should_update = False
 
-    if st.session_state.last_update_time is None:
-        should_update = True
-    elif (now - st.session_state.last_update_time) >= timedelta(hours=1):
-        should_update = True
+def sync_deadlines_if_due(sync_state) -> bool:
+    """Start the hourly deadline sync in the background if it is due.
 
-    if should_update:
-        try:
-            api = CompaniesHouseAPI()
-            all_companies = db.get_all_companies()
+    Decides from the panel's one sync_state read, so a refresh where
+    nothing is due costs no further queries. The sweep runs on the shared
+    job manager, so this fragment never waits for it; the sync_state lease
+    still makes sure one session in one process runs it.
 
-            if not all_companies.empty:
-                company_numbers = all_companies['Company_Number'].tolist()
+    Returns:
+        True if a sync was handed to the job manager
+    """
+    if not os.getenv("COMPANIES_HOUSE_API_KEY") or not coordinator.is_due(sync_state):
+        return False
 
-                # Update deadlines in background
-                results = api.bulk_get_filing_deadlines(company_numbers)
-                updated_count = 0
+    def run(progress, cancel_event):
+        api = CompaniesHouseAPI()
+        return coordinator.run_if_due(
+            lambda: sync_filing_deadlines(db, api, progress_callback=progress, cancel_event=cancel_event)
+        )
 
-                for company_number, deadline in results.items():
-                    if deadline:
-                        db.update_filing_deadline(company_number, deadline)
-                        updated_count += 1
+    # Failures are recorded in sync_state and shown in the footer; the job manager logs them
+    get_job_manager().submit(f"deadline-sync:{db.db_path}", "Hourly filing deadline sync", run)
+    return True
 
-                st.session_state.last_update_time = now
 
-        except Exception as e:
-            # Silently fail - don't disrupt the dashboard
-            pass
+def metric_card(color: str, icon: str, value: int, label: str):
+    """Render one large KPI card."""
+    st.markdown(f"""
+        <div class="big-metric-card card-{color}">
+            <div class="metric-icon">{icon}</div>
+            <div class="metric-value">{value}</div>
+            <div class="metric-label">{label}</div>
+        </div>
+    """, unsafe_allow_html=True)
 
-# Header with time
-st.markdown(f'<div class="time-display">{now.strftime("%H:%M")}</div>', unsafe_allow_html=True)
-st.markdown(f'<div class="date-display">{now.strftime("%A, %d %B %Y")}</div>', unsafe_allow_html=True)
 
-# Title
-st.markdown('<div class="dashboard-title">📊 Operation Lock In</div>', unsafe_allow_html=True)
-st.markdown('<div class="dashboard-subtitle">Tracker of Progress</div>', unsafe_allow_html=True)
+@st.fragment(run_every=KPI_REFRESH_SECONDS)
+def kpi_panel():
+    """KPI cards and sync footer; each refresh reruns only this function."""
+    # Read once per refresh, for both the due check and the footer
+    sync_state = coordinator.get_state()
+    sync_started = sync_deadlines_if_due(sync_state)
 
-# Get KPI data
-all_df = db.get_all_companies()
+    # Counted in SQL and cached until the data changes
+    kpis = db.get_kpi_counts("2026-07-31")
 
-# Calculate metrics
-deadline_count = all_df[all_df['Filing_Deadline'] <= '2026-07-31'].shape[0]
+    # Add spacing
+    st.markdown("<br><br>", unsafe_allow_html=True)
 
-if not all_df.empty:
-    status_counts = all_df['Internal_Status'].value_counts()
-    started_count = status_counts.get('Started', 0)
-    sent_count = status_counts.get('Sent to Client', 0)
-    missing_count = status_counts.get('Missing Information', 0)
-else:
-    started_count = 0
-    sent_count = 0
-    missing_count = 0
+    # Create 4 big metric cards
+    col1, col2, col3, col4 = st.columns(4, gap="large")
 
-# Add spacing
-st.markdown("<br><br>", unsafe_allow_html=True)
+    with col1:
+        metric_card("purple", "📅", kpis['due_by_cutoff'], "Deadline ≤ 31/07/26")
 
-# Create 4 big metric cards
-col1, col2, col3, col4 = st.columns(4, gap="large")
+    with col2:
+        metric_card("yellow", "🔨", kpis['started'], "Started")
 
-with col1:
-    st.markdown(f"""
-        <div class="big-metric-card card-purple">
-            <div class="metric-icon">📅</div>
-            <div class="metric-value">{deadline_count}</div>
-            <div class="metric-label">Deadline ≤ 31/07/26</div>
-        </div>
-    """, unsafe_allow_html=True)
+    with col3:
+        metric_card("blue", "📤", kpis['sent'], "Sent to Client")
 
-with col2:
-    st.markdown(f"""
-        <div class="big-metric-card card-yellow">
-            <div class="metric-icon">🔨</div>
-            <div class="metric-value">{started_count}</div>
-            <div class="metric-label">Started</div>
-        </div>
-    """, unsafe_allow_html=True)
+    with col4:
+        metric_card("red", "⚠️", kpis['missing'], "Missing Information")
 
-with col3:
+    # Footer with the outcome of the last sync, whichever session ran it
+    st.markdown("<br><br>", unsafe_allow_html=True)
+    if sync_started or (sync_state and sync_state['Lease_Owner']):
+        footer = "📡 API sync in progress..."
+    elif sync_state and sync_state['Last_Finished']:
+        last_update_str = sync_state['Last_Finished'].strftime("%H:%M on %d/%m/%Y")
+        next_sync_str = sync_state['Next_Due'].strftime("%H:%M")
+        if sync_state['Last_Status'] == 'success':
+            footer = f"📡 Last API sync: {last_update_str} | Next sync: {next_sync_str}"
+        else:
+            footer = f"⚠️ API sync failed at {last_update_str} | Retrying at {next_sync_str}"
+    else:
+        footer = "📡 Automatic hourly sync enabled"
     st.markdown(f"""
-        <div class="big-metric-card card-blue">
-            <div class="metric-icon">📤</div>
-            <div class="metric-value">{sent_count}</div>
-            <div class="metric-label">Sent to Client</div>
+        <div style="text-align: center; color: #999; font-size: 14px; margin-top: 40px;">
+            {footer}
         </div>
     """, unsafe_allow_html=True)
 
-with col4:
-    st.markdown(f"""
-        <div class="big-metric-card card-red">
-            <div class="metric-icon">⚠️</div>
-            <div class="metric-value">{missing_count}</div>
-            <div class="metric-label">Missing Information</div>
-        </div>
-    """, unsafe_allow_html=True)
 
-# Footer with last update time
-st.markdown("<br><br>", unsafe_allow_html=True)
-if st.session_state.last_update_time:
-    last_update_str = st.session_state.last_update_time.strftime("%H:%M on %d/%m/%Y")
-    st.markdown(f"""
-        <div style="text-align: center; color: #999; font-size: 14px; margin-top: 40px;">
-            📡 Last API sync: {last_update_str} | Next sync: {(st.session_state.last_update_time + timedelta(hours=1)).strftime("%H:%M")}
-        </div>
-    """, unsafe_allow_html=True)
+# Header with time; st.iframe replaces components.html in newer Streamlit releases
+if hasattr(st, "iframe"):
+    st.iframe(CLOCK_HTML, height=210)
 else:
-    st.markdown("""
-        <div style="text-align: center; color: #999; font-size: 14px; margin-top: 40px;">
-            📡 Automatic hourly sync enabled
-        </div>
-    """, unsafe_allow_html=True)
+    components.html(CLOCK_HTML, height=210)
 
-# Auto-refresh page every 5 minutes to check for updates
-st.markdown("""
-    <script>
-        setTimeout(function() {
-            window.location.reload();
-        }, 300000); // 5 minutes in milliseconds
-    </script>
-""", unsafe_allow_html=True)
+# Title
+st.markdown('<div class="dashboard-title">📊 Operation Lock In</div>', unsafe_allow_html=True)
+st.markdown('<div class="dashboard-subtitle">Tracker of Progress</div>', unsafe_allow_html=True)
+
+kpi_panel()
@@ -1,9 +1,11 @@
 """
 Client Management Page
-Searchable, sortable, and editable table for managing company accounts.
+Searchable, sortable, paginated and editable list for managing company accounts.
 """
 import streamlit as st
 import pandas as pd
+import hashlib
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -15,9 +17,20 @@ load_dotenv()
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from database import DatabaseManager
-from api import CompaniesHouseAPI
+from database import (
+    EXPORT_FORMATS,
+    STATUSES,
+    ExportCache,
+    available_export_formats,
+    get_database,
+    start_import_watcher,
+    sync_filing_deadlines,
+)
+from api import CompaniesHouseAPI, get_job_manager
+from api.jobs import FINAL_STATES
 from auth import check_password
+from presentation import build_export_frame, build_presentation_frame, build_status_stylesheet, capture_today
+from st_keyup import st_keyup
 
 # Check authentication
 if not check_password():
@@ -196,249 +209,438 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Row colours, shared by every row through its status class
+st.markdown(build_status_stylesheet(), unsafe_allow_html=True)
+
 # Initialize database
 @st.cache_resource
 def get_db():
-    return DatabaseManager()
+    return get_database()
 
 db = get_db()
 
+# Finished exports, shared by every session
+@st.cache_resource
+def get_export_cache():
+    return ExportCache(build_export_frame)
+
+# Optionally re-import clients.xlsx whenever it changes on disk
+if os.getenv("AUTO_IMPORT_CLIENTS", "").lower() in ("1", "true", "yes"):
+    start_import_watcher(db, "clients.xlsx", use_api_for_deadlines=bool(os.getenv("COMPANIES_HOUSE_API_KEY")))
+
 # Status options
-STATUS_OPTIONS = [
-    'Not Started',
-    'Started',
-    'Sent to Client',
-    'Missing Information',
-    'Ready to Submit'
-]
+STATUS_OPTIONS = STATUSES
 
 # Title
 st.title("📋 Client Management")
 
-# Top metrics
+# One "today" for the metrics, the list and the export of this run
+today = capture_today()
+
+# Top metrics, counted in SQL
+counts = db.get_deadline_counts("2026-07-31", today.strftime('%Y-%m-%d'))
+
 col_stat1, col_stat2, col_stat3 = st.columns(3)
-all_df = db.get_all_companies()
 
 with col_stat1:
-    st.metric("Total Companies", len(all_df))
+    st.metric("Total Companies", counts['total'])
 
 with col_stat2:
-    deadline_count = all_df[all_df['Filing_Deadline'] <= '2026-07-31'].shape[0]
-    st.metric("Deadline ≤ 31/07/2026", deadline_count)
+    st.metric("Deadline ≤ 31/07/2026", counts['due_by_cutoff'])
 
 with col_stat3:
-    overdue_count = all_df[
-        (all_df['Filing_Deadline'] < datetime.now().strftime("%Y-%m-%d"))
-    ].shape[0]
-    st.metric("⚠️ Overdue", overdue_count)
+    st.metric("⚠️ Overdue", counts['overdue'])
 
 st.markdown("---")
 
+SORT_COLUMNS = ["Filing_Deadline", "Company_Name", "Internal_Status"]
+PAGE_SIZES = [25, 50, 100, 250]
+SEARCH_DEBOUNCE_MS = 300
+JOB_POLL_SECONDS = 1
+LETTERS = [chr(code) for code in range(ord('A'), ord('Z') + 1)]
+
+if 'list_page' not in st.session_state:
+    st.session_state.list_page = 0
+
+
+def jump_to(value, sort_by, widget_key):
+    """Sort ascending on a column and show the page holding the first row at or after value."""
+    st.session_state.sort_by = sort_by
+    st.session_state.sort_order = "Ascending"
+    position = db.get_company_position(value, sort_by, st.session_state.get("search_box"))
+    st.session_state.list_page = position // st.session_state.page_size
+    st.session_state.list_query = (st.session_state.get("search_box") or None, sort_by, True, st.session_state.page_size)
+    st.session_state[widget_key] = None
+
+
+def jump_to_letter():
+    if st.session_state.jump_letter:
+        jump_to(st.session_state.jump_letter, 'Company_Name', 'jump_letter')
+
+
+def jump_to_month():
+    if st.session_state.jump_month:
+        jump_to(f"{st.session_state.jump_month}-01", 'Filing_Deadline', 'jump_month')
+
+
+def change_page(step):
+    st.session_state.list_page = max(0, st.session_state.list_page + step)
+
+
+def start_deadline_refresh():
+    """Refresh the listed companies' deadlines from Companies House in the background."""
+    try:
+        api = CompaniesHouseAPI()
+    except ValueError as e:
+        st.session_state.job_error = f"❌ {e}"
+        return
+
+    company_numbers = db.get_company_numbers(st.session_state.get("search_box") or None)
+    # The same companies refreshed from any session share one job
+    digest = hashlib.sha1("\n".join(sorted(company_numbers)).encode()).hexdigest()
+    job = get_job_manager().submit(
+        f"deadlines:{db.db_path}:{digest}",
+        f"Refreshing deadlines for {len(company_numbers)} companies",
+        lambda progress, cancel: sync_filing_deadlines(db, api, company_numbers, progress, cancel)
+    )
+    st.session_state.deadline_job_id = job.id
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def deadline_job_panel():
+    """Progress of the running deadline refresh; polls until the job finishes."""
+    manager = get_job_manager()
+    job = manager.get(st.session_state.deadline_job_id)
+    state = job.snapshot() if job else None
+
+    if state and state['status'] not in FINAL_STATES:
+        col_progress, col_cancel = st.columns([5, 1.5], vertical_alignment="center")
+        with col_progress:
+            fraction = state['done'] / state['total'] if state['total'] else 0.0
+            st.progress(fraction, text=f"{state['description']}: {state['done']}/{state['total']}")
+        with col_cancel:
+            st.button("✖ Cancel", width='stretch', on_click=manager.cancel, args=(job.id,),
+                      disabled=job.cancel_event.is_set())
+        return
+
+    del st.session_state.deadline_job_id
+    if state is None:
+        pass
+    elif state['status'] == 'failed':
+        st.session_state.job_error = f"❌ Deadline refresh failed: {state['error']}"
+    else:
+        checked, updated = state['result'] or (0, 0)
+        prefix = "Cancelled after checking" if state['status'] == 'cancelled' else "Checked"
+        st.session_state.bulk_message = f"✅ {prefix} {checked} companies, updated {updated} deadlines"
+    # Rerun the whole page so the list and metrics show the new deadlines
+    st.rerun()
+
+
+deadline_job_active = st.session_state.get('deadline_job_id') is not None
+
 # Search and filter controls - all aligned
 col_search, col_sort, col_order, col_api = st.columns([3, 1.5, 1, 1.5])
 
 with col_search:
-    search_term = st.text_input(
+    # Search as you type, rerunning once typing pauses
+    search_term = st_keyup(
         "Search",
         placeholder="Company name or number...",
-        key="search_box"
+        key="search_box",
+        debounce=SEARCH_DEBOUNCE_MS
     )
 
 with col_sort:
     sort_by = st.selectbox(
         "Sort By",
-        options=["Filing_Deadline", "Company_Name", "Internal_Status"],
-        index=0
+        options=SORT_COLUMNS,
+        key="sort_by"
     )
 
 with col_order:
     sort_order = st.selectbox(
         "Order",
         options=["Ascending", "Descending"],
-        index=0
+        key="sort_order"
     )
 
 with col_api:
-    if st.button("🔄 Sync API", width='stretch', help="Update from Companies House"):
-        try:
-            api = CompaniesHouseAPI()
-            api_df = db.search_companies(search_term) if search_term else db.get_all_companies()
-            company_numbers = api_df['Company_Number'].tolist()
+    st.button("🔄 Sync API", width='stretch', help="Update from Companies House",
+              on_click=start_deadline_refresh, disabled=deadline_job_active)
 
-            with st.spinner(f"Updating {len(company_numbers)} companies..."):
-                results = api.bulk_get_filing_deadlines(company_numbers)
-                updated_count = sum(1 for d in results.values() if d)
+col_size, col_letter, col_month = st.columns([1.5, 1.5, 1.5])
 
-                for company_number, deadline in results.items():
-                    if deadline:
-                        db.update_filing_deadline(company_number, deadline)
+with col_size:
+    page_size = st.selectbox("Per page", options=PAGE_SIZES, index=1, key="page_size")
 
-                st.success(f"✅ Updated {updated_count}")
-                st.rerun()
+with col_letter:
+    st.selectbox("Jump to letter", options=LETTERS, index=None, key="jump_letter",
+                 placeholder="A–Z", on_change=jump_to_letter)
 
-        except ValueError as e:
-            st.error(f"❌ {e}")
-        except Exception as e:
-            st.error(f"❌ {e}")
+with col_month:
+    st.selectbox("Jump to deadline month", options=db.get_deadline_months(), index=None, key="jump_month",
+                 format_func=lambda month: pd.Timestamp(f"{month}-01").strftime('%b %Y'),
+                 placeholder="Month...", on_change=jump_to_month)
 
-# Get and sort data
-if search_term:
-    df = db.search_companies(search_term)
-else:
-    df = db.get_all_companies()
+if deadline_job_active:
+    deadline_job_panel()
+if 'job_error' in st.session_state:
+    st.error(st.session_state.pop('job_error'))
 
+# A new search, sort or page size starts again from the first page
 ascending = sort_order == "Ascending"
-if not df.empty:
-    df = df.sort_values(by=sort_by, ascending=ascending)
+list_query = (search_term or None, sort_by, ascending, page_size)
+if st.session_state.get('list_query') != list_query:
+    st.session_state.list_query = list_query
+    st.session_state.list_page = 0
+
+# Only the current page is read and rendered; sorting and filtering run in SQL
+page = db.get_companies_page(st.session_state.list_page, page_size, sort_by, ascending, search_term)
+st.session_state.list_page = page['page']
+df = build_presentation_frame(page['rows'], today)
 
 st.markdown("---")
 
 # Company list with headers
-st.subheader(f"📊 Companies ({len(df)})")
+col_title, col_view = st.columns([4, 1.5], vertical_alignment="bottom")
+with col_title:
+    st.subheader(f"📊 Companies ({page['total']})")
+with col_view:
+    view_mode = st.radio("View", ["Grid", "Cards"], horizontal=True, key="view_mode",
+                         label_visibility="collapsed")
+
+if 'grid_generation' not in st.session_state:
+    st.session_state.grid_generation = 0
+
+
+def grid_changes():
+    """Status edits made in the grid since the last save, keyed by company number."""
+    edits = st.session_state.get(f"company_grid_{st.session_state.grid_generation}", {}).get("edited_rows", {})
+    numbers = st.session_state.get("grid_numbers", [])
+    return {
+        numbers[int(row)]: change['Internal_Status']
+        for row, change in edits.items()
+        if 'Internal_Status' in change and int(row) < len(numbers)
+    }
+
+
+def reset_grid():
+    """Start a fresh grid, dropping its pending edits."""
+    st.session_state.grid_generation += 1
+
+
+def save_grid_changes():
+    """Commit every pending grid edit in one transaction."""
+    updated = db.update_statuses_bulk(grid_changes())
+    reset_grid()
+    st.session_state.bulk_message = f"✅ Saved {updated} status changes"
+
+
+def apply_bulk_status():
+    """Apply the chosen status to every selected company in one commit."""
+    selected = st.session_state.bulk_selection
+    status = st.session_state.bulk_status
+    updated = db.update_statuses_bulk({number: status for number in selected})
+    # Drop the row selectboxes' old values so they show the new status
+    for number in selected:
+        st.session_state.pop(f"status_{number}", None)
+    st.session_state.bulk_selection = []
+    st.session_state.bulk_message = f"✅ Set {updated} companies to {status}"
+
+
+# Page navigation; paused while grid edits are waiting to be saved
+first_row = page['page'] * page_size
+col_prev, col_position, col_next = st.columns([1, 4, 1], vertical_alignment="center")
+with col_prev:
+    st.button("◀ Previous", width='stretch', on_click=change_page, args=(-1,),
+              disabled=page['page'] == 0 or bool(grid_changes()))
+with col_position:
+    st.caption(
+        f"Page {page['page'] + 1} of {page['pages']} · "
+        f"companies {min(first_row + 1, page['total'])}–{first_row + len(df)} of {page['total']}"
+    )
+with col_next:
+    st.button("Next ▶", width='stretch', on_click=change_page, args=(1,),
+              disabled=page['page'] >= page['pages'] - 1 or bool(grid_changes()))
+
+if 'bulk_message' in st.session_state:
+    st.success(st.session_state.pop('bulk_message'))
 
 if df.empty:
     st.warning("No companies found.")
 else:
-    # Column headers
-    h1, h2, h3, h4 = st.columns([3, 1.5, 1.3, 2.5])
-
-    with h1:
-        st.markdown('<div class="column-header">Company</div>', unsafe_allow_html=True)
-    with h2:
-        st.markdown('<div class="column-header">Deadline</div>', unsafe_allow_html=True)
-    with h3:
-        st.markdown('<div class="column-header">Days Left</div>', unsafe_allow_html=True)
-    with h4:
-        st.markdown('<div class="column-header">Status</div>', unsafe_allow_html=True)
-
-    # Company rows
-    for idx, row in df.iterrows():
-        # Determine status colors
-        status = row['Internal_Status']
-        status_colors = {
-            'Not Started': ('#f5f5f5', '#9e9e9e'),
-            'Started': ('#fff9e6', '#f6b93b'),
-            'Sent to Client': ('#e3f2fd', '#4a90e2'),
-            'Missing Information': ('#ffebee', '#e74c3c'),
-            'Ready to Submit': ('#e8f5e9', '#4caf50')
-        }
-        bg_color, border_color = status_colors.get(status, ('#f5f5f5', '#9e9e9e'))
-
-        col1, col2, col3, col4 = st.columns([3, 1.5, 1.3, 2.5])
-
-        # Add custom CSS to style this specific row
-        st.markdown(f"""
-            <style>
-            div[data-testid="column"]:has(span.company-id-{row['Company_Number']}) {{
-                background-color: {bg_color} !important;
-            }}
-            div[data-testid="stHorizontalBlock"]:has(span.company-id-{row['Company_Number']}) {{
-                background-color: {bg_color} !important;
-                border-left: 4px solid {border_color} !important;
-                padding: 8px !important;
-                margin: 4px 0 !important;
-                border-radius: 6px !important;
-            }}
-            </style>
-        """, unsafe_allow_html=True)
-
-        is_overdue = row['Filing_Deadline'] < datetime.now().strftime("%Y-%m-%d")
-        deadline = pd.to_datetime(row['Filing_Deadline']).strftime('%d/%m/%Y')
-
-        with col1:
-            st.markdown(
-                f'<span class="company-id-{row["Company_Number"]} company-name-text">{row["Company_Name"]}</span>'
-                f'<span class="company-number-text">#{row["Company_Number"]}</span>',
-                unsafe_allow_html=True
-            )
-
-        with col2:
-            if is_overdue:
-                st.markdown(f"<span class='overdue-text'>🔴 {deadline}</span>", unsafe_allow_html=True)
+    # Bulk status change for several companies at once
+    company_names = dict(zip(df['Company_Number'], df['Company_Name']))
+    # Keep only selections still in the list after a new search
+    if st.session_state.get("bulk_selection"):
+        st.session_state.bulk_selection = [n for n in st.session_state.bulk_selection if n in company_names]
+    col_select, col_bulk_status, col_apply = st.columns([4, 2, 1.5], vertical_alignment="bottom")
+
+    with col_select:
+        st.multiselect(
+            "Select companies",
+            options=list(company_names),
+            format_func=lambda number: f"{company_names.get(number, '')} (#{number})",
+            key="bulk_selection",
+            placeholder="Choose companies to update..."
+        )
+
+    with col_bulk_status:
+        st.selectbox("New status", options=STATUS_OPTIONS, key="bulk_status")
+
+    with col_apply:
+        st.button(
+            "✔️ Apply Status",
+            width='stretch',
+            on_click=apply_bulk_status,
+            disabled=not st.session_state.get("bulk_selection")
+        )
+
+    if view_mode == "Grid":
+        # One virtualized grid; only the visible rows are drawn in the browser.
+        # Edits are tracked by row position, so the rows stay frozen until they are saved.
+        if st.session_state.get('grid_frame') is not None and grid_changes():
+            grid_df = st.session_state.grid_frame
+        else:
+            grid_df = pd.DataFrame({
+                'Company_Name': df['Company_Name'],
+                'Company_Number': df['Company_Number'],
+                'Filing_Deadline': df['Filing_Deadline'],
+                'Days_Left': df['Days_Left'],
+                'Internal_Status': df['Internal_Status'],
+                'Accounts_Filed_CH': df['Accounts_Filed_CH'],
+            }).reset_index(drop=True)
+            st.session_state.grid_frame = grid_df
+        st.session_state.grid_numbers = grid_df['Company_Number'].tolist()
+
+        st.data_editor(
+            grid_df,
+            key=f"company_grid_{st.session_state.grid_generation}",
+            hide_index=True,
+            width='stretch',
+            height=min(600, 38 + 35 * len(grid_df)),
+            disabled=['Company_Name', 'Company_Number', 'Filing_Deadline', 'Days_Left', 'Accounts_Filed_CH'],
+            column_config={
+                'Company_Name': st.column_config.TextColumn("Company", width="large"),
+                'Company_Number': st.column_config.TextColumn("Number"),
+                'Filing_Deadline': st.column_config.DateColumn("Deadline", format="DD/MM/YYYY"),
+                'Days_Left': st.column_config.NumberColumn("Days Left", format="%d d"),
+                'Internal_Status': st.column_config.SelectboxColumn("Status", options=STATUS_OPTIONS, required=True),
+                'Accounts_Filed_CH': st.column_config.CheckboxColumn("Filed at CH"),
+            }
+        )
+
+        pending = grid_changes()
+        col_pending, col_save, col_discard = st.columns([4, 1.5, 1.5], vertical_alignment="center")
+        with col_pending:
+            if pending:
+                st.caption(f"{len(pending)} unsaved status changes. The list is paused until you save or discard them.")
             else:
-                st.markdown(f"<span style='color: #262730;'>{deadline}</span>", unsafe_allow_html=True)
-
-        with col3:
-            days_until = (pd.to_datetime(row['Filing_Deadline']) - datetime.now()).days
-            if days_until < 0:
-                st.markdown(f"<span style='font-size: 12px; color: #666;'>{abs(days_until)}d overdue</span>", unsafe_allow_html=True)
-            elif days_until < 30:
-                st.markdown(f"<span style='font-size: 12px; color: #666;'>⚠️ {days_until}d</span>", unsafe_allow_html=True)
-            else:
-                st.markdown(f"<span style='font-size: 12px; color: #666;'>{days_until}d</span>", unsafe_allow_html=True)
-
-        with col4:
-            current_status = row['Internal_Status']
-            current_index = STATUS_OPTIONS.index(current_status) if current_status in STATUS_OPTIONS else 0
-
-            new_status = st.selectbox(
-                "Status",
-                options=STATUS_OPTIONS,
-                index=current_index,
-                key=f"status_{row['Company_Number']}",
-                label_visibility="collapsed"
-            )
-
-            if new_status != current_status:
-                db.update_internal_status(row['Company_Number'], new_status)
-                st.rerun()
+                st.caption("Edit statuses in the grid, then save them together.")
+        with col_save:
+            st.button("💾 Save Changes", width='stretch', type="primary",
+                      on_click=save_grid_changes, disabled=not pending)
+        with col_discard:
+            st.button("↩️ Discard", width='stretch', on_click=reset_grid, disabled=not pending)
+    else:
+        # Column headers
+        h1, h2, h3, h4 = st.columns([3, 1.5, 1.3, 2.5])
+
+        with h1:
+            st.markdown('<div class="column-header">Company</div>', unsafe_allow_html=True)
+        with h2:
+            st.markdown('<div class="column-header">Deadline</div>', unsafe_allow_html=True)
+        with h3:
+            st.markdown('<div class="column-header">Days Left</div>', unsafe_allow_html=True)
+        with h4:
+            st.markdown('<div class="column-header">Status</div>', unsafe_allow_html=True)
+
+        # Company rows; display values come precomputed from the presentation frame
+        for row in df.itertuples(index=False):
+            col1, col2, col3, col4 = st.columns([3, 1.5, 1.3, 2.5])
+
+            with col1:
+                st.markdown(
+                    f'<span class="{row.Status_Class} company-name-text">{row.Company_Name}</span>'
+                    f'<span class="company-number-text">#{row.Company_Number}</span>',
+                    unsafe_allow_html=True
+                )
+
+            with col2:
+                if row.Is_Overdue:
+                    st.markdown(f"<span class='overdue-text'>🔴 {row.Deadline_Display}</span>", unsafe_allow_html=True)
+                else:
+                    st.markdown(f"<span style='color: #262730;'>{row.Deadline_Display}</span>", unsafe_allow_html=True)
+
+            with col3:
+                st.markdown(f"<span style='font-size: 12px; color: #666;'>{row.Days_Left_Display}</span>", unsafe_allow_html=True)
+
+            with col4:
+                current_status = row.Internal_Status
+                current_index = STATUS_OPTIONS.index(current_status) if current_status in STATUS_OPTIONS else 0
+
+                new_status = st.selectbox(
+                    "Status",
+                    options=STATUS_OPTIONS,
+                    index=current_index,
+                    key=f"status_{row.Company_Number}",
+                    label_visibility="collapsed"
+                )
+
+                if new_status != current_status:
+                    db.update_internal_status(row.Company_Number, new_status)
+                    st.rerun()
+
+# Company numbers kept away from the API
+quarantine_df = db.get_quarantine()
+if not quarantine_df.empty:
+    with st.expander(f"⚠️ {len(quarantine_df)} quarantined company numbers"):
+        st.caption("These numbers are not valid Companies House numbers and are skipped during API syncs.")
+        st.dataframe(quarantine_df, width='stretch', hide_index=True)
 
 # Bulk operations
 st.markdown("---")
 col_bulk1, col_bulk2, col_bulk3 = st.columns(3)
 
 with col_bulk1:
-    if st.button("📥 Export Excel", width='stretch'):
-        try:
-            export_df = df.copy()
-            export_df['Filing_Deadline'] = pd.to_datetime(export_df['Filing_Deadline']).dt.strftime('%Y-%m-%d')
-            export_df = export_df[['Company_Name', 'Company_Number', 'Filing_Deadline', 'Internal_Status']]
-
-            excel_filename = f"export_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
-            export_df.to_excel(excel_filename, index=False)
-            st.success(f"✅ {excel_filename}")
-        except Exception as e:
-            st.error(f"❌ {e}")
+    with st.popover("📥 Export", width='stretch'):
+        export_format = st.radio("Format", available_export_formats(), horizontal=True, key="export_format")
+        extension, mime, _ = EXPORT_FORMATS[export_format]
+        st.caption(f"{page['total']:,} companies, in the list's current order and search")
+        # Generated only when clicked, and reused until the data changes
+        st.download_button(
+            f"Download {export_format}",
+            data=get_export_cache().export_loader(db, export_format, sort_by, ascending, search_term, today),
+            file_name=f"export_{datetime.now().strftime('%Y%m%d_%H%M')}.{extension}",
+            mime=mime,
+            on_click='ignore',
+            width='stretch'
+        )
 
 with col_bulk2:
-    if st.button("📅 Refresh Deadlines", width='stretch'):
-        try:
-            api = CompaniesHouseAPI()
-            refresh_df = db.search_companies(search_term) if search_term else db.get_all_companies()
-            company_numbers = refresh_df['Company_Number'].tolist()
-
-            with st.spinner(f"Fetching {len(company_numbers)}..."):
-                results = api.bulk_get_filing_deadlines(company_numbers)
-                updated_count = sum(1 for d in results.values() if d)
-
-                for company_number, deadline in results.items():
-                    if deadline:
-                        db.update_filing_deadline(company_number, deadline)
-
-                st.success(f"✅ Updated {updated_count}")
-                st.rerun()
-
-        except ValueError as e:
-            st.error(f"❌ {e}")
-        except Exception as e:
-            st.error(f"❌ {e}")
+    st.button("📅 Refresh Deadlines", width='stretch', on_click=start_deadline_refresh,
+              disabled=deadline_job_active)
 
 with col_bulk3:
-    if st.button("📤 Re-Import", width='stretch'):
+    if st.button("📤 Re-Import", width='stretch', help="Import new and changed companies from clients.xlsx"):
         try:
-            import os
             use_api = bool(os.getenv("COMPANIES_HOUSE_API_KEY"))
 
-            if use_api:
-                with st.spinner("Importing..."):
-                    count = db.import_from_excel("clients.xlsx", use_api_for_deadlines=True)
-            else:
-                count = db.import_from_excel("clients.xlsx", use_api_for_deadlines=False)
+            with st.spinner("Importing..."):
+                report = db.incremental_import("clients.xlsx", use_api_for_deadlines=use_api)
+
+            if report['invalid']:
+                st.warning(f"⚠️ {report['invalid']} invalid rows skipped")
 
-            if count > 0:
-                st.success(f"✅ Imported {count}")
+            if report['unchanged']:
+                st.info("ℹ️ clients.xlsx unchanged since last import")
+            elif report['added'] or report['updated']:
+                st.success(f"✅ {report['added']} added, {report['updated']} updated")
                 st.rerun()
             else:
-                st.info("ℹ️ No new companies")
+                st.info("ℹ️ No new or changed companies")
+
+            if report['removed']:
+                st.caption(f"{report['removed']} companies in the database are not in clients.xlsx")
         except Exception as e:
             st.error(f"❌ {e}")
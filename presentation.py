@@ -0,0 +1,150 @@
+"""
+Presentation helpers for Company Accounts Dashboard.
+Derives the display columns of a company list (days left, overdue flag,
+formatted deadline and status class) for every row at once, measured
+against a single captured "today", so the list, the metrics and the export
+of one page render always agree with each other. Status colours live in
+one shared stylesheet keyed by status class.
+"""
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Deadlines closer than this are flagged in the list
+DEADLINE_WARNING_DAYS = 30
+
+# Shown for companies whose deadline the next sync has yet to fill in
+NO_DEADLINE_TEXT = 'Not yet known'
+
+# Background and border colour for each internal status
+STATUS_STYLES: Dict[str, Tuple[str, str]] = {
+    'Not Started': ('#f5f5f5', '#9e9e9e'),
+    'Started': ('#fff9e6', '#f6b93b'),
+    'Sent to Client': ('#e3f2fd', '#4a90e2'),
+    'Missing Information': ('#ffebee', '#e74c3c'),
+    'Ready to Submit': ('#e8f5e9', '#4caf50')
+}
+DEFAULT_STATUS = 'Not Started'
+
+
+def status_class(label: str) -> str:
+    """CSS class for a status label, e.g. 'status-sent-to-client'."""
+    return 'status-' + '-'.join(label.lower().split())
+
+
+def build_status_stylesheet() -> str:
+    """Build the <style> block colouring company rows by status class.
+
+    Emitted once per page; each row then only carries its status class,
+    so the rules do not grow with the number of rows.
+    """
+    rules = []
+    for label, (background, border) in STATUS_STYLES.items():
+        css_class = status_class(label)
+        rules.append(f"""
+div[data-testid="column"]:has(span.{css_class}) {{
+    background-color: {background} !important;
+}}
+div[data-testid="stHorizontalBlock"]:has(span.{css_class}) {{
+    background-color: {background} !important;
+    border-left: 4px solid {border} !important;
+    padding: 8px !important;
+    margin: 4px 0 !important;
+    border-radius: 6px !important;
+}}""")
+    return f"<style>{''.join(rules)}\n</style>"
+
+
+def _days_left_text(days: pd.Index) -> np.ndarray:
+    """Label day counts as overdue, close or plain."""
+    text = pd.Index(np.abs(days)).astype(str) + 'd'
+    return np.select(
+        [days < 0, days < DEADLINE_WARNING_DAYS],
+        [text + ' overdue', '⚠️ ' + text],
+        default=text
+    )
+
+
+def _format_distinct(values: pd.Series, formatter) -> pd.Series:
+    """Format each distinct value once and spread the results over the rows.
+
+    Deadlines repeat heavily (a few hundred distinct dates across a whole
+    client list), so this is far cheaper than formatting row by row.
+    """
+    codes, uniques = pd.factorize(values)
+    if len(uniques) == 0:
+        return pd.Series(pd.NA, index=values.index, dtype=object)
+    formatted = np.asarray(formatter(uniques), dtype=object)
+    # Missing values get code -1; point them at a trailing NA
+    formatted = np.append(formatted, pd.NA)
+    return pd.Series(formatted[codes], index=values.index)
+
+
+def capture_today(now: Optional[datetime] = None) -> pd.Timestamp:
+    """Get the date a render measures deadlines against.
+
+    Args:
+        now: Current time (defaults to datetime.now())
+
+    Returns:
+        Midnight at the start of that day
+    """
+    return pd.Timestamp(now or datetime.now()).normalize()
+
+
+def build_presentation_frame(companies: pd.DataFrame, today: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """Add the display columns to a typed company frame.
+
+    Args:
+        companies: Companies with a datetime Filing_Deadline and an
+                   Internal_Status column (see get_all_companies(typed=True))
+        today: Date from capture_today(); captured here if omitted
+
+    Returns:
+        Copy of companies with Days_Left (nullable Int64), Is_Overdue,
+        Deadline_Display, Days_Left_Display and Status_Class columns
+    """
+    today = capture_today() if today is None else today
+    frame = companies.copy()
+
+    # Companies without a deadline yet have NA days left and are never overdue
+    days_left = (frame['Filing_Deadline'] - today).dt.days.astype('Int64')
+    frame['Days_Left'] = days_left
+    frame['Is_Overdue'] = (days_left < 0).fillna(False).astype(bool)
+    frame['Deadline_Display'] = _format_distinct(
+        frame['Filing_Deadline'], lambda values: values.strftime('%d/%m/%Y')
+    ).fillna(NO_DEADLINE_TEXT)
+    frame['Days_Left_Display'] = _format_distinct(days_left, _days_left_text).fillna('—')
+
+    # Mapping a categorical status only looks up each category once
+    classes = {label: status_class(label) for label in STATUS_STYLES}
+    frame['Status_Class'] = (
+        frame['Internal_Status'].map(classes).astype(object).fillna(status_class(DEFAULT_STATUS))
+    )
+    return frame
+
+
+def build_export_frame(companies: pd.DataFrame, today: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """Select and format the columns written to an Excel export.
+
+    Args:
+        companies: Typed company frame, as for build_presentation_frame
+        today: Date from capture_today(); captured here if omitted
+
+    Returns:
+        Frame with Company_Name, Company_Number, Filing_Deadline (YYYY-MM-DD,
+        NA if unknown), Internal_Status, Days_Left and Overdue columns
+    """
+    frame = build_presentation_frame(companies, today)
+    return pd.DataFrame({
+        'Company_Name': frame['Company_Name'],
+        'Company_Number': frame['Company_Number'],
+        'Filing_Deadline': _format_distinct(
+            frame['Filing_Deadline'], lambda values: values.strftime('%Y-%m-%d')
+        ).astype('string'),
+        'Internal_Status': frame['Internal_Status'],
+        'Days_Left': frame['Days_Left'],
+        'Overdue': frame['Is_Overdue'],
+    })
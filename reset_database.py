@@ -1,6 +1,8 @@
 """
 Reset Database Utility
 Clears all data from the database and optionally re-imports from Excel.
+Schema changes do not need a reset; they are applied by the migrations in
+database/migrations.py when the application starts.
 """
 import os
 from pathlib import Path
@@ -30,9 +32,14 @@ def reset_database(reimport_excel=True):
         except:
             print("       (Unable to read current database)")
 
-        # Delete the database file
+        # Delete the database file and its WAL files, which would otherwise be replayed into the new one,
+        # plus the Arrow snapshot older versions kept next to it
         try:
             os.remove(db_path)
+            for suffix in ("-wal", "-shm", ".arrow"):
+                sidecar = Path(f"{db_path}{suffix}")
+                if sidecar.exists():
+                    os.remove(sidecar)
             print(f"[SUCCESS] Deleted database file")
         except Exception as e:
             print(f"[ERROR] Failed to delete database: {e}")
@@ -56,8 +63,10 @@ def reset_database(reimport_excel=True):
 
         print(f"\n[INFO] Importing data from {excel_file}...")
         try:
-            count = db.import_from_excel(str(excel_file))
-            print(f"[SUCCESS] Imported {count} companies from Excel")
+            report = db.import_from_excel(str(excel_file))
+            print(f"[SUCCESS] Imported {report['inserted']} companies from Excel")
+            if report['invalid']:
+                print(f"[WARNING] Skipped {report['invalid']} invalid rows")
 
             # Show summary
             stats = db.get_database_stats()
@@ -0,0 +1,123 @@
+"""
+Test the paginated company list: sorting, search filtering and paging
+
+Run with: python test_company_list.py (or pytest test_company_list.py)
+"""
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from database import DatabaseManager, STATUSES
+from database import db_manager
+
+NAMES = ['alpha', 'Alpha', 'beta', 'BETA', 'Gamma', 'delta', '100% Ltd', 'under_score', 'Zulu']
+
+
+def _create_list_db(tmp) -> DatabaseManager:
+    db = DatabaseManager(str(Path(tmp) / "list.db"))
+    conn = sqlite3.connect(db.db_path)
+    conn.executemany(
+        "INSERT INTO companies (Company_Number, Company_Name, Filing_Deadline, Internal_Status) VALUES (?, ?, ?, ?)",
+        [
+            # Every seventh company has no deadline yet
+            (f"{(i * 37) % 1000:08d}", f"{NAMES[i % len(NAMES)]} {i % 4}", None if i % 7 == 0 else 20500 + i % 11, i % 5)
+            for i in range(120)
+        ]
+    )
+    conn.commit()
+    conn.close()
+    return db
+
+
+def _expected_numbers(db, sort_by, ascending, search_term=None):
+    """The list order worked out in Python: NULLs lowest, names ignoring case, ties by number."""
+    companies = db.get_all_companies()
+    if search_term:
+        companies = companies[companies['Company_Number'].isin(db.search_company_numbers(search_term))]
+
+    def sort_key(row):
+        value = None if pd.isna(row[sort_by]) else row[sort_by]
+        if value is None:
+            return (False, '', row['Company_Number'])
+        if sort_by == 'Company_Name':
+            value = value.lower()
+        elif sort_by == 'Internal_Status':
+            value = STATUSES.index(value)
+        return (True, value, row['Company_Number'])
+
+    rows = sorted(companies.to_dict('records'), key=sort_key, reverse=not ascending)
+    return [row['Company_Number'] for row in rows]
+
+
+def _paged_numbers(db, sort_by, ascending, search_term=None, page_size=7):
+    first = db.get_companies_page(0, page_size, sort_by, ascending, search_term)
+    numbers = []
+    for page in range(first['pages']):
+        result = db.get_companies_page(page, page_size, sort_by, ascending, search_term)
+        assert len(result['rows']) <= page_size
+        numbers.extend(result['rows']['Company_Number'])
+    assert len(numbers) == first['total']
+    return numbers
+
+
+def test_pages_follow_sort_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _create_list_db(tmp)
+        for sort_by in ['Filing_Deadline', 'Company_Name', 'Internal_Status']:
+            for ascending in [True, False]:
+                assert _paged_numbers(db, sort_by, ascending) == _expected_numbers(db, sort_by, ascending)
+
+
+def test_search_filters_pages():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _create_list_db(tmp)
+        for search_term in ['alpha', 'BETA 1', '100%', 'under_', '0000', 'no such company']:
+            expected = _expected_numbers(db, 'Company_Name', True, search_term)
+            assert _paged_numbers(db, 'Company_Name', True, search_term) == expected
+        assert db.get_companies_page(0, 7, search_term='no such company')['pages'] == 1
+
+
+def test_long_match_lists_filter_with_like():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _create_list_db(tmp)
+        limit = db_manager.SEARCH_IN_LIST_LIMIT
+        # Few enough matches to force the LIKE re-filter instead of the primary key lookup
+        db_manager.SEARCH_IN_LIST_LIMIT = 3
+        try:
+            for search_term in ['alpha', '100%', 'under_', '0000']:
+                expected = _expected_numbers(db, 'Filing_Deadline', False, search_term)
+                assert _paged_numbers(db, 'Filing_Deadline', False, search_term) == expected
+        finally:
+            db_manager.SEARCH_IN_LIST_LIMIT = limit
+
+
+def test_pages_see_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _create_list_db(tmp)
+        first = db.get_companies_page(0, 5, 'Internal_Status', False)
+        number = first['rows']['Company_Number'].iloc[0]
+        assert db.update_internal_status(number, 'Not Started')
+        assert db.get_companies_page(0, 5, 'Internal_Status', False)['rows']['Company_Number'].iloc[0] != number
+
+
+def test_company_position():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _create_list_db(tmp)
+        names = [name.lower() for name in db.get_all_companies()['Company_Name']]
+        assert db.get_company_position('G', 'Company_Name') == sum(name < 'g' for name in names)
+
+        # Companies without a deadline come before every month
+        deadlines = list(db.get_all_companies()['Filing_Deadline'])
+        position = db.get_company_position('2026-02-20', 'Filing_Deadline')
+        assert position == sum(pd.isna(deadline) or deadline < '2026-02-20' for deadline in deadlines)
+
+
+if __name__ == "__main__":
+    print("Testing the paginated company list...")
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"[OK] {name}")
+    print("\n[SUCCESS] All company list tests passed!")
@@ -29,8 +29,8 @@ db = DatabaseManager()
 
 # Test import
 try:
-    count = db.import_from_excel(test_file)
-    print(f"[SUCCESS] Imported {count} companies successfully!")
+    report = db.import_from_excel(test_file)
+    print(f"[SUCCESS] Imported {report['inserted']} companies successfully!")
 
     # Verify the data was imported correctly
     all_companies = db.get_all_companies()
@@ -0,0 +1,94 @@
+"""
+Test re-importing a changed client file with incremental_import
+
+Run with: python test_incremental_import.py (or pytest test_incremental_import.py)
+"""
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from database import DatabaseManager
+
+CLIENTS = pd.DataFrame({
+    'Company_Name': ['Alpha Ltd', 'Beta Ltd', 'Gamma Ltd'],
+    'Company_Number': ['00000001', '00000002', '00000003'],
+    'Filing_Deadline': ['2026-01-31', '2026-02-28', '2026-03-31'],
+})
+
+
+def _write_clients(path, clients):
+    clients.to_excel(path, index=False)
+
+
+def test_added_updated_and_unchanged():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / "clients.db"))
+        clients_file = str(Path(tmp) / "clients.xlsx")
+        _write_clients(clients_file, CLIENTS)
+
+        report = db.incremental_import(clients_file)
+        assert (report['added'], report['updated'], report['removed']) == (3, 0, 0)
+
+        # Same content: skipped on the file hash alone
+        assert db.incremental_import(clients_file)['unchanged'] is True
+
+        db.update_internal_status('00000002', 'Started')
+        changed = CLIENTS.copy()
+        changed.loc[1, 'Company_Name'] = 'Beta Renamed Ltd'
+        changed.loc[0, 'Filing_Deadline'] = '2026-05-31'
+        changed.loc[3] = ['Delta Ltd', '4', '2026-04-30']   # numeric cell, normalized to 00000004
+        _write_clients(clients_file, changed)
+
+        report = db.incremental_import(clients_file)
+        assert report['unchanged'] is False
+        assert (report['added'], report['updated'], report['removed']) == (1, 2, 0)
+
+        assert db.get_company('00000001')['Filing_Deadline'] == '2026-05-31'
+        beta = db.get_company('00000002')
+        assert beta['Company_Name'] == 'Beta Renamed Ltd'
+        # Internal statuses are never touched by an import
+        assert beta['Internal_Status'] == 'Started'
+        assert db.get_company('00000004')['Company_Name'] == 'Delta Ltd'
+
+
+def test_remove_missing_keeps_invalid_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / "clients.db"))
+        clients_file = str(Path(tmp) / "clients.xlsx")
+        _write_clients(clients_file, CLIENTS)
+        db.incremental_import(clients_file)
+
+        # Alpha leaves the file; Beta's row loses its deadline but is still listed
+        changed = CLIENTS.drop(index=0)
+        changed.loc[1, 'Filing_Deadline'] = None
+        _write_clients(clients_file, changed)
+
+        report = db.incremental_import(clients_file, remove_missing=True)
+        assert report['removed'] == 1
+        assert report['invalid'] == 1
+        assert db.get_company('00000001') is None
+        assert db.get_company('00000002')['Filing_Deadline'] == '2026-02-28'
+        assert db.get_database_stats()['total_companies'] == 2
+
+
+def test_empty_file_removes_nothing():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(str(Path(tmp) / "clients.db"))
+        clients_file = str(Path(tmp) / "clients.xlsx")
+        _write_clients(clients_file, CLIENTS)
+        db.incremental_import(clients_file)
+
+        _write_clients(clients_file, CLIENTS.iloc[:0])
+        report = db.incremental_import(clients_file, remove_missing=True)
+        assert report['removed'] == 0
+        assert db.get_database_stats()['total_companies'] == 3
+
+
+if __name__ == "__main__":
+    print("Testing incremental import...")
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"[OK] {name}")
+    print("\n[SUCCESS] All incremental import tests passed!")
@@ -0,0 +1,203 @@
+"""
+Test the schema migrations on fresh, legacy and partly migrated databases
+
+Run with: python test_migrations.py (or pytest test_migrations.py)
+"""
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from database import DatabaseManager
+from database.migrations import MIGRATIONS, get_schema_version, run_migrations
+from database.schema import COMPANIES_COLUMNS_SQL, COMPANY_SELECT, create_change_triggers
+
+LATEST_VERSION = max(migration.version for migration in MIGRATIONS)
+
+LEGACY_COMPANIES_SQL = """
+    CREATE TABLE companies (
+        Company_Number TEXT PRIMARY KEY,
+        Company_Name TEXT NOT NULL,
+        Filing_Deadline DATE NOT NULL,
+        Internal_Status TEXT DEFAULT 'Not Started',
+        Accounts_Filed_CH BOOLEAN DEFAULT 0,
+        Last_Updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def _create_legacy_db(db_path, rows):
+    """Create a database as it was before migrations, with text deadlines and statuses."""
+    conn = sqlite3.connect(db_path)
+    conn.execute(LEGACY_COMPANIES_SQL)
+    conn.executemany(
+        "INSERT INTO companies (Company_Number, Company_Name, Filing_Deadline, Internal_Status, Accounts_Filed_CH) "
+        "VALUES (?, ?, ?, ?, ?)",
+        rows
+    )
+    conn.commit()
+    conn.close()
+
+
+def _schema_objects(db_path):
+    conn = sqlite3.connect(db_path)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'")}
+    conn.close()
+    return names
+
+
+def test_fresh_database():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "fresh.db")
+        db = DatabaseManager(db_path)
+
+        assert db.get_schema_version() == LATEST_VERSION
+        assert {
+            'companies', 'statuses', 'company_details', 'company_changes', 'company_quarantine',
+            'import_history', 'sync_state', 'schema_migrations',
+            'idx_companies_deadline', 'idx_companies_name', 'idx_companies_status',
+            'companies_log_insert', 'companies_log_update', 'companies_log_delete',
+        } <= _schema_objects(db_path)
+
+        # Opening it again applies nothing
+        conn = sqlite3.connect(db_path)
+        assert run_migrations(conn) == []
+        conn.close()
+
+
+def test_legacy_conversion():
+    rows = [
+        ('00000001', 'Alpha Ltd', '2026-03-31', 'Started', 1),
+        ('00000002', 'Beta Ltd', '2026-02-30', ' ready to SUBMIT ', 0),   # not a real date
+        ('00000003', 'Gamma Ltd', 'unknown', None, 0),
+        ('00000004', 'Delta Ltd', '2026-01-05 00:00:00', 'missing information', 0),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "legacy.db")
+        _create_legacy_db(db_path, rows)
+        db = DatabaseManager(db_path)
+
+        assert db.get_schema_version() == LATEST_VERSION
+        assert db.get_database_stats()['total_companies'] == 4
+
+        alpha = db.get_company('00000001')
+        assert alpha['Filing_Deadline'] == '2026-03-31'
+        assert alpha['Internal_Status'] == 'Started'
+        assert alpha['Accounts_Filed_CH'] == 1
+
+        # Unusable deadlines are kept as NULL; statuses match ignoring case and spaces
+        beta = db.get_company('00000002')
+        assert beta['Filing_Deadline'] is None
+        assert beta['Internal_Status'] == 'Ready to Submit'
+        assert db.get_company('00000003')['Internal_Status'] == 'Not Started'
+        assert db.get_company('00000004')['Filing_Deadline'] == '2026-01-05'
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT typeof(Filing_Deadline) FROM companies WHERE Company_Number = '00000001'").fetchone()[0] == 'integer'
+        conn.close()
+
+
+def test_unknown_status_aborts():
+    rows = [
+        ('00000001', 'Alpha Ltd', '2026-03-31', 'Started', 0),
+        ('00000002', 'Beta Ltd', '2026-03-31', 'On Hold', 0),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "legacy.db")
+        _create_legacy_db(db_path, rows)
+
+        try:
+            DatabaseManager(db_path)
+        except sqlite3.IntegrityError as e:
+            assert "'On Hold' (1 companies)" in str(e)
+        else:
+            raise AssertionError("An unknown status should stop the conversion")
+
+        # The legacy table is left exactly as it was
+        conn = sqlite3.connect(db_path)
+        assert get_schema_version(conn) == 1
+        assert conn.execute("SELECT COUNT(*), typeof(Filing_Deadline) FROM companies").fetchone() == (2, 'text')
+        conn.close()
+
+
+def test_optional_deadline_rebuild():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "typed.db")
+        DatabaseManager(db_path)
+
+        # Rebuild the table as migration 2 used to create it, with a required deadline
+        required = COMPANIES_COLUMNS_SQL.replace(
+            "Filing_Deadline INTEGER CHECK (Filing_Deadline IS NULL OR typeof(Filing_Deadline) = 'integer')",
+            "Filing_Deadline INTEGER NOT NULL CHECK (typeof(Filing_Deadline) = 'integer')"
+        )
+        conn = sqlite3.connect(db_path)
+        conn.executescript(f"""
+            DROP VIEW company_details;
+            DROP TABLE companies;
+            CREATE TABLE companies ({required});
+            CREATE VIEW company_details AS {COMPANY_SELECT};
+        """)
+        create_change_triggers(conn)
+        conn.executemany(
+            "INSERT INTO companies (Company_Number, Company_Name, Filing_Deadline, Internal_Status) VALUES (?, ?, ?, ?)",
+            [(f"{i:08d}", f"Company {i}", 20500 + i, i % 5) for i in range(100)]
+        )
+        conn.execute("DELETE FROM schema_migrations WHERE Version >= 6")
+        conn.execute("PRAGMA user_version = 5")
+        conn.commit()
+        conn.close()
+
+        db = DatabaseManager(db_path)
+        assert db.get_schema_version() == LATEST_VERSION
+        assert db.get_database_stats()['total_companies'] == 100
+        assert {'idx_companies_deadline', 'idx_companies_name', 'idx_companies_status',
+                'companies_log_update', 'company_details'} <= _schema_objects(db_path)
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE companies SET Filing_Deadline = NULL WHERE Company_Number = '00000001'")
+        conn.commit()
+        conn.close()
+        assert db.get_company('00000001')['Filing_Deadline'] is None
+
+
+def test_company_number_normalization():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "numbers.db")
+        DatabaseManager(db_path)
+
+        conn = sqlite3.connect(db_path)
+        conn.executemany(
+            "INSERT INTO companies (Company_Number, Company_Name, Filing_Deadline, Internal_Status, Accounts_Filed_CH) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                ('1234567', 'Old Alpha', 20600, 4, 1),   # imported before normalization
+                ('SC1234', 'Old Scottish', 20700, 1, 0),
+                ('01234567', 'Alpha Ltd', 20650, 0, 0),  # added again by a later import
+                ('BAD', 'Malformed', 20500, 0, 0),
+            ]
+        )
+        conn.execute("DELETE FROM schema_migrations WHERE Version >= 7")
+        conn.execute("PRAGMA user_version = 6")
+        conn.commit()
+        conn.close()
+
+        db = DatabaseManager(db_path)
+        assert db.get_database_stats()['total_companies'] == 3
+
+        # The duplicate is merged, keeping the status worked on under the old number
+        alpha = db.get_company('01234567')
+        assert alpha['Company_Name'] == 'Alpha Ltd'
+        assert alpha['Internal_Status'] == 'Ready to Submit'
+        assert alpha['Accounts_Filed_CH'] == 1
+        assert db.get_company('1234567') is None
+
+        assert db.get_company('SC001234')['Internal_Status'] == 'Started'
+        assert db.get_company('BAD') is not None
+
+
+if __name__ == "__main__":
+    print("Testing schema migrations...")
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"[OK] {name}")
+    print("\n[SUCCESS] All migration tests passed!")